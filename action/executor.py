@@ -646,8 +646,14 @@ async def execute_code_variants(
     inputs: dict | None = None,
     step_id: str | None = None,
     iteration: str | None = None,
+    race: bool = False,
 ) -> dict:
-    """Execute multiple code variants sequentially until one succeeds."""
+    """Execute multiple code variants sequentially until one succeeds.
+
+    With ``race=True`` the variants run concurrently (at most
+    ``RACE_MAX_CONCURRENT`` at a time); the first successful one wins and
+    the rest are cancelled.
+    """
     start_time = time.perf_counter()
 
     # Sort variants by key name; callers often use CODE_1, CODE_2, etc.
@@ -656,48 +662,116 @@ async def execute_code_variants(
 
     all_errors: list[str] = []
 
+    if race and len(sorted_variants) > 1:
+        result = await _race_code_variants(
+            sorted_variants, multi_mcp, session_id, inputs, step_id, iteration, all_errors
+        )
+        return result if result is not None else _all_variants_failed(all_errors, start_time)
+
     for variant_name, code in sorted_variants:
         log_step(f"⚡ Trying {variant_name}", symbol="🔬")
+        result = await _run_code_variant(variant_name, code, multi_mcp, session_id, inputs, step_id, iteration)
+        if _record_variant_result(variant_name, result, all_errors):
+            return result
 
-        # Extra safety: sanitize unicode-like escapes once at variant level too
-        code = re.sub(r"\\([uUxX])", r"\\\\\1", code)
+    return _all_variants_failed(all_errors, start_time)
 
-        result = await execute_python_code_variant(code, multi_mcp, session_id, inputs)
 
-        try:
-            logger_code_block(
-                logger,
-                f"⚡ Executor results for session {session_id} step {step_id}, iteration {iteration} - variant {variant_name}",
-                code,
-                result,
-            )
-        except Exception:
-            pass
+async def _run_code_variant(
+    variant_name: str,
+    code: str,
+    multi_mcp,
+    session_id: str,
+    inputs: dict | None,
+    step_id: str | None,
+    iteration: str | None,
+) -> dict:
+    """Execute one variant and log its code and result"""
+    # Extra safety: sanitize unicode-like escapes once at variant level too
+    code = re.sub(r"\\([uUxX])", r"\\\\\1", code)
+
+    result = await execute_python_code_variant(code, multi_mcp, session_id, inputs)
+
+    try:
+        logger_code_block(
+            logger,
+            f"⚡ Executor results for session {session_id} step {step_id}, iteration {iteration} - variant {variant_name}",
+            code,
+            result,
+        )
+    except Exception:
+        pass
+    return result
 
-        if result.get("status") == "success":
-            result["successful_variant"] = variant_name
-            result["total_variants_tried"] = len(all_errors) + 1
-            result["all_errors"] = all_errors
-            log_step(f"✅ {variant_name} succeeded!", symbol="🎉")
-            return result
 
-        # Failed, try next
-        error_msg = f"{variant_name}: {result.get('error')}"
-        all_errors.append(error_msg)
-        log_step(f"❌ {variant_name} failed: {result.get('error')}", symbol="🚨")
+def _record_variant_result(variant_name: str, result: dict, all_errors: list[str]) -> bool:
+    """True (with the success fields filled in) if the variant succeeded; otherwise record its error"""
+    if result.get("status") == "success":
+        result["successful_variant"] = variant_name
+        result["total_variants_tried"] = len(all_errors) + 1
+        result["all_errors"] = all_errors
+        log_step(f"✅ {variant_name} succeeded!", symbol="🎉")
+        return True
 
-    log_step(f"💀 All {len(sorted_variants)} variants failed", symbol="❌")
+    all_errors.append(f"{variant_name}: {result.get('error')}")
+    log_step(f"❌ {variant_name} failed: {result.get('error')}", symbol="🚨")
+    return False
+
+
+def _all_variants_failed(all_errors: list[str], start_time: float) -> dict:
+    log_step(f"💀 All {len(all_errors)} variants failed", symbol="❌")
     return {
         "status": "failed",
         "result": {},
         "created_files": [],
         "execution_time": time.perf_counter() - start_time,
         "error": f"All code variants failed. Errors: {'; '.join(all_errors)}",
-        "failed_variants": len(sorted_variants),
+        "failed_variants": len(all_errors),
         "all_errors": all_errors
     }
 
 
+# Upper bound on variants executing at once when racing
+RACE_MAX_CONCURRENT = 2
+
+
+async def _race_code_variants(
+    sorted_variants: list,
+    multi_mcp,
+    session_id: str,
+    inputs: dict | None,
+    step_id: str | None,
+    iteration: str | None,
+    all_errors: list[str],
+) -> dict | None:
+    """Run variants concurrently; return the first success or None if all fail.
+
+    Errors of failed variants are appended to ``all_errors``.
+    """
+    sem = asyncio.Semaphore(RACE_MAX_CONCURRENT)
+
+    async def _run(variant_name: str, code: str):
+        async with sem:
+            log_step(f"⚡ Racing {variant_name}", symbol="🔬")
+            return variant_name, await _run_code_variant(
+                variant_name, code, multi_mcp, session_id, inputs, step_id, iteration
+            )
+
+    tasks = [asyncio.create_task(_run(name, code)) for name, code in sorted_variants]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            variant_name, result = await next_done
+            if _record_variant_result(variant_name, result, all_errors):
+                return result
+    finally:
+        # Cancel the losers (and anything still waiting on the semaphore)
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return None
+
+
 async def process_ast_updates(ast_updates: dict, session_id: str) -> dict:
     """Process AST-based file updates"""
     results = {
@@ -799,8 +873,13 @@ async def run_user_code(
     multi_mcp,
     session_id: str = "default_session",
     inputs: dict | None = None,
+    race: bool = False,
 ) -> dict:
-    """Main execution: handle direct files, Python code variants, and AST updates."""
+    """Main execution: handle direct files, Python code variants, and AST updates.
+
+    ``race`` runs the code variants concurrently and keeps the first success
+    instead of trying them one after another.
+    """
     start_time = time.perf_counter()
 
     results: Dict[str, Any] = {
@@ -832,7 +911,7 @@ async def run_user_code(
         if output_data.get("code_variants"):
             log_step("🐍 Phase 2: Python code execution", symbol="⚙️")
             code_results = await execute_code_variants(
-                output_data["code_variants"], multi_mcp, session_id, inputs
+                output_data["code_variants"], multi_mcp, session_id, inputs, race=race
             )
             results["code_results"] = code_results
             results["operations"].append("python_code")
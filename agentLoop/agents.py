@@ -1,5 +1,6 @@
 import yaml
 import json
+import orjson
 from pathlib import Path
 from typing import Optional, List
 from agentLoop.model_manager import ModelManager
@@ -11,6 +12,15 @@ from config.log_config import get_logger, logger_step, logger_json_block, logger
 
 logger = get_logger(__name__)
 
+
+def _dumps_indented(value) -> str:
+    """Pretty JSON for prompt context; orjson is several times faster than json.dumps on large step outputs"""
+    try:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    except TypeError:
+        return json.dumps(value, indent=2)
+
+
 class AgentRunner:
     def __init__(self, multi_mcp, api_key=None):
         self.multi_mcp = multi_mcp
@@ -21,6 +31,16 @@ class AgentRunner:
         with open(config_path, "r", encoding="utf-8") as f:
             self.agent_configs = yaml.safe_load(f)["agents"]
 
+        # One ModelManager per model so the provider client (and its HTTP connection pool) is reused
+        self._model_managers = {}
+
+    def _get_model_manager(self, model_name):
+        """Return a cached ModelManager for model_name, creating it on first use"""
+        manager = self._model_managers.get(model_name)
+        if manager is None:
+            manager = self._model_managers[model_name] = ModelManager(model_name, api_key=self.api_key)
+        return manager
+
     def _analyze_file_strategy(self, uploaded_files):
         """Analyze files to determine best upload strategy"""
         total_size = 0
@@ -196,7 +216,7 @@ class AgentRunner:
                 
                 # Initialize model manager for Files API uploads
                 ## TODO: Create this for different API key clients
-                model_manager = ModelManager(agent_config.get("model", "gemini-2.0-flash"), api_key=self.api_key)
+                model_manager = self._get_model_manager(agent_config.get("model", "gemini-2.0-flash"))
                 
                 # Process files based on strategy
                 for file_path in all_files:
@@ -215,7 +235,7 @@ class AgentRunner:
             else:
                 # Initialize model manager for text-only requests
                 ## TODO: Create this for different API key clients
-                model_manager = ModelManager(agent_config.get("model", "gemini-2.0-flash"), api_key=self.api_key)
+                model_manager = self._get_model_manager(agent_config.get("model", "gemini-2.0-flash"))
 
             # Load system prompt
             prompt_file_path = agent_config.get('prompt_file')
@@ -289,7 +309,7 @@ class AgentRunner:
                     prompt_parts.append("\n--- Context from Previous Steps ---")
                     for input_key, input_value in value.items():
                         if isinstance(input_value, (dict, list)):
-                            prompt_parts.append(f"{input_key}: {json.dumps(input_value, indent=2)}")
+                            prompt_parts.append(f"{input_key}: {_dumps_indented(input_value)}")
                         else:
                             prompt_parts.append(f"{input_key}: {input_value}")
                 elif key not in ['files', 'image']:  # Only exclude file-related data
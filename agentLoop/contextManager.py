@@ -51,18 +51,80 @@ class ExecutionContextManager:
         
         self.plan_graph.graph['validation_results'] = validation_results
         self.debug_mode = debug_mode
+        self._init_runtime_state()
+
+    @classmethod
+    def from_graph(cls, plan_graph: nx.DiGraph, debug_mode: bool = False):
+        """Context around an already built (e.g. loaded) graph, skipping __init__'s build and validation"""
+        context = cls.__new__(cls)
+        context.plan_graph = plan_graph
+        context.debug_mode = debug_mode
+        context._init_runtime_state()
+        return context
+
+    def _init_runtime_state(self):
+        """Scheduling/display state derived from the graph; set by __init__ and from_graph"""
+        self.display_dirty = True  # visualizer needs a redraw
+        self.output_chain_version = 0  # bumped on every output_chain write in mark_done
+        self._ready_index = None  # see _build_ready_index; None until first needed
+        self._status_index = None  # see nodes_by_status; None until first needed
+        # Set whenever a step finishes (completed or failed) so the scheduler can wake up
+        self.step_completed = asyncio.Event()
 
     def get_ready_steps(self):
         """Return steps ready to run"""
-        try:
-            topo_order = list(nx.topological_sort(self.plan_graph))
-            return [node for node in topo_order 
-                    if node != "ROOT" and 
-                    self.plan_graph.nodes[node]['status'] == 'pending' and
-                    all(self.plan_graph.nodes[pred]['status'] == 'completed' 
-                       for pred in self.plan_graph.predecessors(node))]
-        except nx.NetworkXError:
-            return []
+        index = self._ready_index
+        if index is None:
+            try:
+                index = self._build_ready_index()
+            except nx.NetworkXError:
+                return []
+        node_attrs = self.plan_graph._node
+        return [node for node in index['ready'] if node_attrs[node]['status'] == 'pending']
+
+    def _build_ready_index(self):
+        """Count unfinished predecessors per node and seed the ready set in topological order"""
+        # Read NetworkX's backing dicts directly; NodeView/predecessors() add a wrapper per access
+        node_attrs = self.plan_graph._node
+        pred = self.plan_graph._pred
+        remaining = {}
+        ready = {}  # dict as an insertion-ordered set
+        for node in nx.topological_sort(self.plan_graph):
+            if node == "ROOT":
+                continue
+            count = sum(1 for p in pred[node] if node_attrs[p].get('status') != 'completed')
+            remaining[node] = count
+            if count == 0 and node_attrs[node].get('status') == 'pending':
+                ready[node] = None
+        self._ready_index = {"remaining": remaining, "ready": ready}
+        return self._ready_index
+
+    def reset_ready_steps(self):
+        """Drop the ready-set so it is rebuilt from the graph (call after adding nodes/edges)"""
+        self._ready_index = None
+
+    def nodes_by_status(self):
+        """Return {status: [node_id, ...]} for all non-ROOT nodes without scanning the graph each call"""
+        index = self._status_index
+        if index is None:
+            index = {}
+            for node_id, data in self.plan_graph._node.items():
+                if node_id != "ROOT":
+                    index.setdefault(data.get('status', 'pending'), {})[node_id] = None
+            self._status_index = index
+        return {status: list(members) for status, members in index.items() if members}
+
+    def reset_status_index(self):
+        """Drop the status index (call after adding nodes or writing node status directly)"""
+        self._status_index = None
+
+    def _move_status(self, step_id, old_status, new_status):
+        """Keep the status index in step with a status change made by the mark_* methods"""
+        index = self._status_index
+        if index is None:
+            return
+        index.get(old_status, {}).pop(step_id, None)
+        index.setdefault(new_status, {})[step_id] = None
 
     def get_inputs(self, reads):
         """SIMPLE: Just pass previous outputs - NO COMPLEX EXTRACTION!"""
@@ -79,8 +141,13 @@ class ExecutionContextManager:
 
     def mark_running(self, step_id):
         """Mark step as running"""
+        self._move_status(step_id, self.plan_graph.nodes[step_id].get('status'), 'running')
         self.plan_graph.nodes[step_id]['status'] = 'running'
         self.plan_graph.nodes[step_id]['start_time'] = datetime.utcnow().isoformat()
+        self.display_dirty = True
+        index = self._ready_index
+        if index is not None:
+            index['ready'].pop(step_id, None)
         self._auto_save()
 
     def _has_executable_code(self, output):
@@ -156,9 +223,12 @@ class ExecutionContextManager:
         
         # SIMPLE: Store the output directly in chain
         self.plan_graph.graph['output_chain'][step_id] = final_output
+        self.output_chain_version += 1
         
         # Update node status
         node_data = self.plan_graph.nodes[step_id]
+        was_completed = node_data.get('status') == 'completed'
+        self._move_status(step_id, node_data.get('status'), 'completed')
         node_data.update({
             'status': 'completed',
             'output': final_output,
@@ -173,6 +243,17 @@ class ExecutionContextManager:
             start = datetime.fromisoformat(node_data['start_time'])
             end = datetime.fromisoformat(node_data['end_time'])
             node_data['execution_time'] = (end - start).total_seconds()
+
+        # Successors waiting only on this step become ready
+        index = self._ready_index
+        if index is not None and not was_completed:
+            remaining = index['remaining']
+            node_attrs = self.plan_graph._node
+            for succ in self.plan_graph._succ[step_id]:
+                if succ in remaining:
+                    remaining[succ] -= 1
+                    if remaining[succ] == 0 and node_attrs[succ].get('status') == 'pending':
+                        index['ready'][succ] = None
         
         # 🔍 DEBUG: Check for empty output and trigger breakpoint
         if isinstance(final_output, dict):
@@ -192,11 +273,17 @@ class ExecutionContextManager:
                 print(f"   Starting PDB debugger...")
 
         log_step(f"✅ {step_id} completed - output stored in chain", symbol="📦")
+        self.display_dirty = True
         self._auto_save()
+        self.step_completed.set()
 
     def mark_failed(self, step_id, error=None):
         """Mark step as failed"""
         node_data = self.plan_graph.nodes[step_id]
+        index = self._ready_index
+        if index is not None:
+            index['ready'].pop(step_id, None)
+        self._move_status(step_id, node_data.get('status'), 'failed')
         node_data.update({
             'status': 'failed',
             'end_time': datetime.utcnow().isoformat(),
@@ -209,9 +296,11 @@ class ExecutionContextManager:
             node_data['execution_time'] = (end - start).total_seconds()
             
         log_error(f"❌ {step_id} failed: {error}")
+        self.display_dirty = True
         # Update overall graph status if all done or ensure not stuck in 'running'
         self._refresh_overall_status()
         self._auto_save()
+        self.step_completed.set()
 
     def _refresh_overall_status(self):
         """Recompute aggregate graph status for convenience (not required for execution)."""
@@ -238,28 +327,28 @@ class ExecutionContextManager:
 
     def all_done(self):
         """Check if execution is complete"""
-        return all(self.plan_graph.nodes[node_id]['status'] in ['completed', 'failed']
-                  for node_id in self.plan_graph.nodes if node_id != "ROOT")
+        return all(data['status'] in ('completed', 'failed')
+                  for node_id, data in self.plan_graph._node.items() if node_id != "ROOT")
 
     def get_execution_summary(self):
         """Get execution summary"""
-        completed = sum(1 for node_id in self.plan_graph.nodes 
-                       if node_id != "ROOT" and 
-                       self.plan_graph.nodes[node_id].get('status') == 'completed')
-        failed = sum(1 for node_id in self.plan_graph.nodes 
-                    if node_id != "ROOT" and 
-                    self.plan_graph.nodes[node_id].get('status') == 'failed')
         total = len(self.plan_graph.nodes) - 1
         
-        # Calculate costs and tokens
-        total_cost = sum(self.plan_graph.nodes[node_id].get('cost', 0.0) 
-                        for node_id in self.plan_graph.nodes if node_id != "ROOT")
-        
-        total_input_tokens = sum(self.plan_graph.nodes[node_id].get('input_tokens', 0) 
-                               for node_id in self.plan_graph.nodes if node_id != "ROOT")
-        
-        total_output_tokens = sum(self.plan_graph.nodes[node_id].get('output_tokens', 0) 
-                                for node_id in self.plan_graph.nodes if node_id != "ROOT")
+        # Counts, costs and tokens in one pass over the non-ROOT node dicts
+        completed = failed = 0
+        total_cost = 0.0
+        total_input_tokens = total_output_tokens = 0
+        for node_id, data in self.plan_graph._node.items():
+            if node_id == "ROOT":
+                continue
+            status = data.get('status')
+            if status == 'completed':
+                completed += 1
+            elif status == 'failed':
+                failed += 1
+            total_cost += data.get('cost', 0.0)
+            total_input_tokens += data.get('input_tokens', 0)
+            total_output_tokens += data.get('output_tokens', 0)
         
         return {
             "session_id": self.plan_graph.graph['session_id'],
@@ -320,8 +409,4 @@ class ExecutionContextManager:
     @classmethod
     def load_session(cls, session_file: Path, debug_mode: bool = False):
         """Load session from disk"""
-        plan_graph = SessionSerializer.load_session(session_file)
-        context = cls.__new__(cls)
-        context.plan_graph = plan_graph
-        context.debug_mode = debug_mode
-        return context
+        return cls.from_graph(SessionSerializer.load_session(session_file), debug_mode=debug_mode)
@@ -2,12 +2,21 @@
 
 import networkx as nx
 import asyncio
+import copy
+import hashlib
+import itertools
+import json
+import orjson
+import sys
+import time
+from collections import OrderedDict
 from agentLoop.contextManager import ExecutionContextManager
 from typing import Optional
 from agentLoop.agents import AgentRunner
-from utils.utils import log_step, log_error
+from utils.utils import log_step, log_error, install_uvloop
 from agentLoop.visualizer import ExecutionVisualizer
 from rich.console import Console
+from rich.live import Live
 from pathlib import Path
 from action.executor import run_user_code
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
@@ -15,6 +24,9 @@ from config.log_config import get_logger, logger_step, logger_json_block, logger
 
 logger = get_logger(__name__)
 
+# Installed at import time so both main.py and the API server's background loop pick it up
+install_uvloop()
+
 
 def _build_output_meta(output):
     try:
@@ -76,6 +88,68 @@ def _json_safe(obj, _depth: int = 0, _max_depth: int = 6):
         return str(obj)
 
 
+def _merge_code_output(agent_output, code_output):
+    """Agent's inner 'output' dict with the code execution results folded in.
+
+    _json_safe already builds a new dict, so that copy is the merge target; neither argument is modified.
+    """
+    merged = _json_safe(agent_output.get("output") or {})
+    if code_output:
+        merged.update(_json_safe(code_output))
+    return merged
+
+
+def _files_cache_key(paths):
+    """Cheap identity for a set of uploaded files: (path, mtime, size) per file, in upload order"""
+    key = []
+    for f in paths:
+        try:
+            st = Path(f).stat()
+            key.append((str(f), st.st_mtime_ns, st.st_size))
+        except OSError:
+            key.append((str(f), None, None))
+    return tuple(key)
+
+
+def _agent_cache_key(agent_type, agent_input):
+    """Stable digest of everything a first-iteration agent call sees except its step id.
+
+    The input carries the session context and original query, so entries never cross sessions.
+    """
+    payload = {k: v for k, v in agent_input.items() if k != "step_id"}
+    try:
+        input_blob = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    except TypeError:
+        # orjson rejects e.g. >64-bit ints; fall back to the stdlib encoder
+        input_blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{agent_type}|".encode("utf-8"))
+    h.update(input_blob)
+    return h.hexdigest()
+
+
+# Entry limits for AgentLoop4's memo caches (least recently used entries are dropped first)
+AGENT_CACHE_MAXSIZE = 128
+FILE_CACHE_MAXSIZE = 32
+PLANNER_SESSION_CACHE_MAXSIZE = 16
+
+
+def _lru_get(cache: OrderedDict, key):
+    """cache[key] (marked most recently used), or None"""
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _lru_put(cache: OrderedDict, key, value, maxsize: int):
+    """Store value under key, evicting the least recently used entries beyond maxsize"""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > maxsize:
+        cache.popitem(last=False)
+
+
 class AgentLoop4:
     def __init__(self, multi_mcp, strategy="conservative", api_key=None):
         self.multi_mcp = multi_mcp
@@ -88,6 +162,15 @@ class AgentLoop4:
         # on_step_end(step_id, status, duration_ms, error, output_meta, progress)
         self.on_step_start = None
         self.on_step_end = None
+        # LRU caches, bounded by the *_MAXSIZE constants above
+        # First-iteration agent results keyed by a digest of the agent input; reused across turns of a session
+        self._agent_cache = OrderedDict()
+        # DistillerAgent file profiles keyed by (path, mtime, size) of the uploaded files
+        self._file_profile_cache = OrderedDict()
+        # Planner summaries of finished nodes, per session_id -> {node_id: summary}
+        self._planner_node_cache = OrderedDict()
+        # DistillerAgent profiling instruction keyed by the uploaded file paths
+        self._grounded_instruction_cache = OrderedDict()
 
     async def _show_timer_animation(self, duration=30, message="Waiting before calling Gemini"):
         """Show an animated timer for the specified duration"""
@@ -122,14 +205,24 @@ class AgentLoop4:
         # Phase 1: (Re)Profile only newly provided files (simple approach)
         # Phase 1: File Profiling (if files exist)
         file_profiles = {}
-        if uploaded_files:
-            file_list_text = "\n".join([f"- File {i+1}: {Path(f).name} (full path: {f})" for i, f in enumerate(uploaded_files)])
-            grounded_instruction = f"""Profile and summarize each file's structure, columns, content type.
+        files_key = _files_cache_key(uploaded_files) if uploaded_files else None
+        cached_profiles = _lru_get(self._file_profile_cache, files_key) if files_key is not None else None
+        if cached_profiles is not None:
+            log_step(f"♻️ Reusing file profiles for {len(uploaded_files)} unchanged file(s)", symbol="📦")
+            file_profiles = copy.deepcopy(cached_profiles)
+        elif uploaded_files:
+            # Keyed in upload order: the "File N" numbering depends on it
+            paths_key = tuple(uploaded_files)
+            grounded_instruction = _lru_get(self._grounded_instruction_cache, paths_key)
+            if grounded_instruction is None:
+                file_list_text = "\n".join(f"- File {i+1}: {Path(f).name} (full path: {f})" for i, f in enumerate(uploaded_files))
+                grounded_instruction = f"""Profile and summarize each file's structure, columns, content type.
 
             IMPORTANT: Use these EXACT file names in your response:
             {file_list_text}
 
             Profile each file separately and return details."""
+                _lru_put(self._grounded_instruction_cache, paths_key, grounded_instruction, FILE_CACHE_MAXSIZE)
 
             file_result = await self.agent_runner.run_agent(
                 "DistillerAgent",
@@ -144,6 +237,7 @@ class AgentLoop4:
             )
             if file_result["success"]:
                 file_profiles = file_result["output"]
+                _lru_put(self._file_profile_cache, files_key, copy.deepcopy(file_profiles), FILE_CACHE_MAXSIZE)
 
         # Phase 2: Planning (initial vs mid_session)
         # Determine active profile (persist in context.graph)
@@ -164,20 +258,37 @@ class AgentLoop4:
 
         if is_continuation and context is not None:
             # Provide existing plan graph + used IDs + recent queries for context
-            existing_nodes = [n for n in context.plan_graph.nodes if n != "ROOT"]
-            planner_input["existing_plan_graph"] = {
-                "nodes": [
-                    {
+            node_attrs = context.plan_graph._node  # raw dicts: one lookup per node instead of six NodeView hits
+            existing_nodes = [n for n in node_attrs if n != "ROOT"]
+            # The planner is stateless so it always gets every node, but summaries of nodes that
+            # finished in earlier turns cannot change and are reused instead of rebuilt
+            session_key = context.plan_graph.graph.get('session_id')
+            summaries = _lru_get(self._planner_node_cache, session_key)
+            if summaries is None:
+                summaries = {}
+                _lru_put(self._planner_node_cache, session_key, summaries, PLANNER_SESSION_CACHE_MAXSIZE)
+            node_summaries = []
+            for n in existing_nodes:
+                a = node_attrs[n]
+                entry = summaries.get(n)
+                if entry is None or entry["status"] != a.get("status"):
+                    entry = {
                         "id": n,
-                        "agent": context.plan_graph.nodes[n].get("agent"),
-                        "description": context.plan_graph.nodes[n].get("description"),
-                        "reads": context.plan_graph.nodes[n].get("reads", []),
-                        "writes": context.plan_graph.nodes[n].get("writes", []),
-                        "status": context.plan_graph.nodes[n].get("status")
-                    } for n in existing_nodes
-                ],
+                        "agent": a.get("agent"),
+                        "description": a.get("description"),
+                        "reads": a.get("reads", []),
+                        "writes": a.get("writes", []),
+                        "status": a.get("status")
+                    }
+                    if entry["status"] in ("completed", "failed"):
+                        summaries[n] = entry
+                node_summaries.append(entry)
+            planner_input["existing_plan_graph"] = {
+                "nodes": node_summaries,
                 "edges": [
-                    {"source": u, "target": v} for u, v in context.plan_graph.edges() if u != "ROOT" or v != "ROOT"
+                    {"source": u, "target": v}
+                    for u, nbrs in context.plan_graph._succ.items() for v in nbrs
+                    if u != "ROOT" or v != "ROOT"
                 ]
             }
             planner_input["used_step_ids"] = existing_nodes
@@ -231,21 +342,26 @@ class AgentLoop4:
         """Append nodes/edges from a new plan_graph into existing session graph.
         Ensures unique IDs and preserves existing node statuses.
         """
-        existing_ids = set(context.plan_graph.nodes())
-        # Determine next numeric index for fallback
+        nodes_view = context.plan_graph.nodes
+        existing_ids = set(nodes_view)
+        # Determine next numeric index for fallback (generator body only runs on the first collision)
         def next_id_generator():
             # Extract numeric parts like T001
             max_num = 0
             for nid in existing_ids:
-                try:
-                    if nid.startswith('T'):
-                        num = int(''.join(ch for ch in nid[1:] if ch.isdigit()))
-                        max_num = max(max_num, num)
-                except Exception:
+                if not isinstance(nid, str) or not nid.startswith('T'):
                     continue
-            while True:
-                max_num += 1
-                yield f"T{max_num:03d}"
+                try:
+                    num = int(nid[1:])
+                except ValueError:
+                    digits = ''.join(ch for ch in nid[1:] if ch.isdigit())
+                    if not digits:
+                        continue
+                    num = int(digits)
+                if num > max_num:
+                    max_num = num
+            for num in itertools.count(max_num + 1):
+                yield f"T{num:03d}"
         id_gen = next_id_generator()
 
         id_map = {}
@@ -274,101 +390,162 @@ class AgentLoop4:
             src = id_map.get(edge.get("source"), edge.get("source"))
             tgt = id_map.get(edge.get("target"), edge.get("target"))
             # Only add if both in graph
-            if src in context.plan_graph.nodes and tgt in context.plan_graph.nodes:
+            if src in nodes_view and tgt in nodes_view:
                 context.plan_graph.add_edge(src, tgt)
         # Update graph original_query to most recent query for prompt context
         context.plan_graph.graph['original_query'] = query
         log_step(f"🔗 Appended {len(new_plan_graph.get('nodes', []))} new nodes (turn {self._conversation_turn})", symbol="➕")
 
     async def _execute_dag(self, context: ExecutionContextManager):
-        """Execute DAG with simple output chaining"""
+        """Execute DAG with simple output chaining.
+
+        Steps run in a bounded worker pool: as soon as one step finishes its slot is handed
+        to the next ready step instead of waiting for a whole batch to complete.
+        """
         visualizer = ExecutionVisualizer(context)
         console = Console()
         
         MAX_CONCURRENT_AGENTS = 1
-        max_iterations = 20
+        STEP_TIMEOUT = 90  # watchdog: seconds before a running step is auto-failed
+        max_iterations = 20  # upper bound on dispatched steps per run
         iteration = 0
 
-        while not context.all_done() and iteration < max_iterations:
-            iteration += 1
-            console.print(visualizer.get_layout())
+        node_attrs = context.plan_graph._node  # raw node-attribute dict, avoids NodeView indirection
+        context.reset_ready_steps()  # graph may have grown since the last run (_append_new_plan)
+        context.reset_status_index()
+        sem = asyncio.Semaphore(MAX_CONCURRENT_AGENTS)
+        in_flight = {}  # asyncio.Task -> step_id
+        started = {}  # step_id -> (asyncio.Task, monotonic start) for steps still running
+        timed_out = set()  # step_ids the watchdog failed and cancelled
 
-            # Watchdog: auto-fail steps running too long
-            stuck = context.get_running_over(90)
-            if stuck:
-                for s in stuck:
-                    if context.plan_graph.nodes[s]['status'] == 'running':
-                        context.mark_failed(s, error='watchdog_timeout')
-            
-            ready_steps = context.get_ready_steps()
-            if not ready_steps:
-                if any(context.plan_graph.nodes[n]['status'] == 'failed' 
-                    for n in context.plan_graph.nodes):
-                    break
-                await asyncio.sleep(0.3)
-                continue
+        def _on_task_done(task):
+            sem.release()
+            context.step_completed.set()
 
-            # Rate limiting
-            batch_size = min(len(ready_steps), MAX_CONCURRENT_AGENTS)
-            current_batch = ready_steps[:batch_size]
-            
-            print(f"🚀 Executing batch: {current_batch}")
-
-            # Mark running
-            for step_id in current_batch:
-                context.mark_running(step_id)
-                if self.on_step_start:
-                    try:
-                        sd = context.get_step_data(step_id)
-                        self.on_step_start(step_id, sd.get('agent'), sd.get('reads', []), sd.get('writes', []), self._conversation_turn)
-                    except Exception:
-                        pass
-            
-            # Execute batch
-            tasks = [self._execute_step(step_id, context) for step_id in current_batch]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Process results - SIMPLE!
-            for step_id, result in zip(current_batch, results):
-                if isinstance(result, Exception):
-                    context.mark_failed(step_id, str(result))
-                    continue
-                if not isinstance(result, dict):
-                    context.mark_failed(step_id, f"Unexpected result type: {type(result)}")
-                    continue
-                if result.get("success"):
-                    start_iso = context.plan_graph.nodes[step_id].get('start_time')
-                    await context.mark_done(step_id, result.get("output"))
-                    if self.on_step_end:
-                        try:
-                            node_data = context.plan_graph.nodes[step_id]
-                            dur = node_data.get('execution_time', 0.0) * 1000.0
-                            progress = context.get_execution_summary()
-                            self.on_step_end(step_id, 'completed', dur, None, _build_output_meta(node_data.get('output')), progress)
-                        except Exception:
-                            pass
-                else:
-                    err = result.get("error")
-                    context.mark_failed(step_id, err)
-                    if self.on_step_end:
+        # Redraw only when a step changed state; Live throttles terminal refreshes
+        with Live(visualizer.get_layout(), console=console, refresh_per_second=4, screen=False) as live:
+            try:
+                # No per-tick all_done()/failed scan: the loop ends once nothing is running and nothing is ready
+                while True:
+                    context.step_completed.clear()
+                    if getattr(context, 'display_dirty', True):
+                        live.update(visualizer.get_layout())
+                        context.display_dirty = False
+
+                    # Watchdog: auto-fail steps running too long (only scans steps we dispatched)
+                    now = time.monotonic()
+                    for s in [sid for sid, (_, t0) in started.items() if now - t0 >= STEP_TIMEOUT]:
+                        task, _ = started.pop(s)
+                        if node_attrs[s]['status'] == 'running':
+                            context.mark_failed(s, error='watchdog_timeout')
+                            timed_out.add(s)
+                            task.cancel()
+
+                    # Fill free slots with ready steps
+                    for step_id in context.get_ready_steps():
+                        if sem.locked() or iteration >= max_iterations:
+                            break
+                        await sem.acquire()
+                        iteration += 1
+                        print(f"🚀 Executing step: {step_id}")
+
+                        context.mark_running(step_id)
+                        if self.on_step_start:
+                            try:
+                                sd = context.get_step_data(step_id)
+                                self.on_step_start(step_id, sd.get('agent'), sd.get('reads', []), sd.get('writes', []), self._conversation_turn)
+                            except Exception:
+                                pass
+
+                        task = asyncio.create_task(self._execute_step(step_id, context), name=step_id)
+                        task.add_done_callback(_on_task_done)
+                        in_flight[task] = step_id
+                        started[step_id] = (task, time.monotonic())
+
+                    if not in_flight:
+                        # Nothing running and nothing launchable: all done, blocked by a failure, or out of iterations
+                        break
+
+                    # Wake as soon as any in-flight step finishes, or when the oldest one hits the watchdog deadline
+                    if not any(task.done() for task in in_flight):
+                        timeout = None
+                        if started:
+                            oldest = min(t0 for _, t0 in started.values())
+                            timeout = max(0.0, oldest + STEP_TIMEOUT - time.monotonic())
                         try:
-                            node_data = context.plan_graph.nodes[step_id]
-                            dur_ms = node_data.get('execution_time', 0.0) * 1000.0
-                            progress = context.get_execution_summary()
-                            self.on_step_end(step_id, 'failed', dur_ms, err, None, progress)
-                        except Exception:
+                            await asyncio.wait_for(context.step_completed.wait(), timeout=timeout)
+                        except asyncio.TimeoutError:
                             pass
 
-            if len(ready_steps) > batch_size:
-                await asyncio.sleep(5)
+                    # Process results - SIMPLE!
+                    for task in [t for t in in_flight if t.done()]:
+                        step_id = in_flight.pop(task)
+                        started.pop(step_id, None)
+                        if step_id in timed_out:
+                            continue  # already marked failed by the watchdog
+                        if task.cancelled():
+                            # Cancelled from elsewhere (e.g. a CancelledError escaping the step): fail it, don't leave it 'running'
+                            await self._record_step_result(step_id, asyncio.CancelledError(f"Step {step_id} was cancelled"), context)
+                            continue
+                        error = task.exception()
+                        await self._record_step_result(step_id, error if error is not None else task.result(), context)
+            finally:
+                for task in in_flight:
+                    task.cancel()
+                live.update(visualizer.get_layout())  # final state
+
+    async def _record_step_result(self, step_id, result, context: ExecutionContextManager):
+        """Mark a finished step completed/failed and notify instrumentation callbacks"""
+        if isinstance(result, BaseException):
+            context.mark_failed(step_id, str(result))
+            return
+        if not isinstance(result, dict):
+            context.mark_failed(step_id, f"Unexpected result type: {type(result)}")
+            return
+        if result.get("success"):
+            await context.mark_done(step_id, result.get("output"))
+            if self.on_step_end:
+                try:
+                    node_data = context.plan_graph.nodes[step_id]
+                    dur = node_data.get('execution_time', 0.0) * 1000.0
+                    progress = context.get_execution_summary()
+                    self.on_step_end(step_id, 'completed', dur, None, _build_output_meta(node_data.get('output')), progress)
+                except Exception:
+                    pass
+        else:
+            err = result.get("error")
+            context.mark_failed(step_id, err)
+            if self.on_step_end:
+                try:
+                    node_data = context.plan_graph.nodes[step_id]
+                    dur_ms = node_data.get('execution_time', 0.0) * 1000.0
+                    progress = context.get_execution_summary()
+                    self.on_step_end(step_id, 'failed', dur_ms, err, None, progress)
+                except Exception:
+                    pass
 
     async def _execute_step(self, step_id, context: ExecutionContextManager):
         """SIMPLE: Execute step with direct output passing and code execution"""
         step_data = context.get_step_data(step_id)
         agent_type = step_data["agent"]
+        reads = step_data.get("reads", [])
+        writes = step_data.get("writes", [])
+
+        # Session metadata is fixed for the duration of the step
+        g = context.plan_graph.graph
+        original_query = g['original_query']
+        session_id = g['session_id']
+        file_manifest = g['file_manifest']
+        exec_session_id = session_id or "default_session"
+
+        # Racing runs every variant, so it is opt-in for side-effect-free ones
+        race_variants = bool(
+            step_data.get("race_code_variants")
+            or self.agent_runner.agent_configs.get(agent_type, {}).get("race_code_variants")
+        )
         
         # SIMPLE: Get raw outputs from previous steps
-        inputs = context.get_inputs(step_data.get("reads", []))
+        inputs = context.get_inputs(reads)
         inputs = _json_safe(inputs)
         
         # Build agent input
@@ -376,21 +553,29 @@ class AgentLoop4:
             return {
                 "step_id": step_id,
                 "agent_prompt": instruction or step_data.get("agent_prompt", step_data["description"]),
-                "reads": step_data.get("reads", []),
-                "writes": step_data.get("writes", []),
+                "reads": reads,
+                "writes": writes,
                 "inputs": inputs,  # Direct output passing!
-                "original_query": context.plan_graph.graph['original_query'],
+                "original_query": original_query,
                 "session_context": {
-                    "session_id": context.plan_graph.graph['session_id'],
-                    "file_manifest": context.plan_graph.graph['file_manifest']
+                    "session_id": session_id,
+                    "file_manifest": file_manifest
                 },
                 **({"previous_output": _json_safe(previous_output)} if previous_output else {}),
             }
 
-        # Execute first iteration
+        # Execute first iteration (reuse an identical earlier call unless the step opts out)
         agent_input = build_agent_input()
-        # await self._show_timer_animation(30, f"🤖 {agent_type} Waiting before calling Gemini")
-        result = await self.agent_runner.run_agent(agent_type, agent_input, step_id=step_id, iteration=1)
+        cache_key = None if step_data.get("no_cache") else _agent_cache_key(agent_type, agent_input)
+        cached_result = _lru_get(self._agent_cache, cache_key) if cache_key is not None else None
+        if cached_result is not None:
+            log_step(f"♻️ {step_id}: reusing cached {agent_type} result", symbol="📦")
+            result = copy.deepcopy(cached_result)
+        else:
+            # await self._show_timer_animation(30, f"🤖 {agent_type} Waiting before calling Gemini")
+            result = await self.agent_runner.run_agent(agent_type, agent_input, step_id=step_id, iteration=1)
+            if cache_key is not None and result.get("success"):
+                _lru_put(self._agent_cache, cache_key, copy.deepcopy(result), AGENT_CACHE_MAXSIZE)
         
         # NEW: Handle code execution if agent returned code variants
         if result["success"] and "code" in result["output"]:
@@ -404,13 +589,15 @@ class AgentLoop4:
 
             logger_json_block(logger, executor_input, "Executor Input for Code Execution")
 
-            # Execute code variants sequentially until one succeeds
+            # Execute code variants sequentially until one succeeds, or race
+            # them when the step/agent declares its variants side-effect-free
             try:
                 execution_result = await run_user_code(
                     executor_input, 
                     self.multi_mcp, 
-                    context.plan_graph.graph['session_id'] or "default_session",
-                    inputs  # Pass inputs to code execution
+                    exec_session_id,
+                    inputs,  # Pass inputs to code execution
+                    race=race_variants,
                 )
                 
                 # Handle execution results
@@ -419,10 +606,7 @@ class AgentLoop4:
                     code_output = execution_result.get("code_results", {}).get("result", {})
                     
                     # Combine agent output with code execution results
-                    combined_output = _json_safe({
-                        **(result["output"].get("output", {}) or {}),
-                        **(code_output or {}),
-                    })
+                    combined_output = _merge_code_output(result["output"], code_output)
                     
                     # Update result with combined output
                     result["output"] = combined_output
@@ -430,10 +614,7 @@ class AgentLoop4:
                     log_step(f"⚠️ {step_id}: Code execution partial failure", symbol="⚠️")
                     code_output = execution_result.get("code_results", {}).get("result", {})
                     if code_output:
-                        combined_output = _json_safe({
-                            **(result["output"].get("output", {}) or {}),
-                            **(code_output or {}),
-                        })
+                        combined_output = _merge_code_output(result["output"], code_output)
                         result["output"] = combined_output
                     else:
                         result["success"] = False
@@ -473,16 +654,14 @@ class AgentLoop4:
                     execution_result = await run_user_code(
                         executor_input,
                         self.multi_mcp,
-                        context.plan_graph.graph['session_id'] or "default_session",
-                        inputs
+                        exec_session_id,
+                        inputs,
+                        race=race_variants,
                     )
                     
                     if execution_result["status"] == "success":
                         code_output = execution_result.get("code_results", {}).get("result", {})
-                        combined_output = _json_safe({
-                            **(second_result["output"].get("output", {}) or {}),
-                            **(code_output or {}),
-                        })
+                        combined_output = _merge_code_output(second_result["output"], code_output)
                         second_result["output"] = combined_output
                     else:
                         second_result["success"] = False
@@ -522,5 +701,8 @@ class AgentLoop4:
     async def _get_user_input(self, message):
         """Get query from user"""
         log_step(message, symbol="❓")
-        return input().strip()
+        # Read stdin on a worker thread so in-flight steps keep running while the user types
+        loop = asyncio.get_running_loop()
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        return line.strip()
 
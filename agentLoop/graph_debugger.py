@@ -4,19 +4,17 @@ Graph Debugger - Replay individual nodes for rapid development iteration
 
 import asyncio
 import json
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List
-from rich.console import Console
+from typing import Optional, Dict, Any, List, Set
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
-from rich.prompt import Prompt, Confirm
-from rich.syntax import Syntax
-from rich.columns import Columns
 import shlex
-import yaml
-import networkx as nx
+import orjson
+# yaml, rich.syntax/columns/prompt and mcp_servers are imported where used to keep startup fast
 
 
 # Add parent directory to path so we can import modules
@@ -33,20 +31,80 @@ except ImportError as e:
     print(f"❌ Cannot import agentLoop modules: {e}")
     HAS_AGENT_LOOP = False
 
-# Try to import MCP with correct paths
-try:
-    from mcp_servers.multiMCP import MultiMCP
-    HAS_MCP = True
-except ImportError as e:
-    print(f"⚠️  MCP modules not found: {e}")
-    HAS_MCP = False
-    
-    # Create mock classes for read-only functionality
-    class MockMCP:
-        async def initialize(self): pass
-        async def shutdown(self): pass
-    
-    MultiMCP = MockMCP
+# Create mock classes for read-only functionality
+class MockMCP:
+    async def initialize(self): pass
+    async def shutdown(self): pass
+
+_MCP_STATE: Dict[str, Any] = {}
+
+def _load_mcp():
+    """Return (has_mcp, MultiMCP class), importing MCP with correct paths on first call"""
+    if not _MCP_STATE:
+        try:
+            from mcp_servers.multiMCP import MultiMCP
+            _MCP_STATE.update(has_mcp=True, cls=MultiMCP)
+        except ImportError as e:
+            print(f"⚠️  MCP modules not found: {e}")
+            _MCP_STATE.update(has_mcp=False, cls=MockMCP)
+    return _MCP_STATE["has_mcp"], _MCP_STATE["cls"]
+
+def _load_config_with_json_sidecar(config_path: Path) -> dict:
+    """Load a YAML config, preferring a JSON copy next to it when that copy is newer.
+
+    The JSON sidecar is (re)written whenever the YAML has to be parsed.
+    """
+    json_path = config_path.with_suffix(".json")
+    try:
+        if json_path.stat().st_mtime_ns >= config_path.stat().st_mtime_ns:
+            with open(json_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass  # Missing or unreadable sidecar: fall back to the YAML
+
+    import yaml
+    try:
+        from yaml import CSafeLoader as SafeLoader  # libyaml-backed parser
+    except ImportError:
+        from yaml import SafeLoader
+
+    with open(config_path, "r") as f:
+        config = yaml.load(f, Loader=SafeLoader)
+
+    tmp_path = json_path.with_name(f"{json_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False)
+        os.replace(tmp_path, json_path)
+    except (OSError, TypeError, ValueError):
+        # Read-only checkout or YAML types JSON can't hold; the sidecar is only an optimization
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+    return config
+
+def _debug_json_bytes(data) -> bytes:
+    """Indented UTF-8 JSON (orjson, falling back to json for values it rejects)"""
+    try:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str)
+    except TypeError:
+        return json.dumps(data, indent=2, default=str, ensure_ascii=False).encode("utf-8")
+
+def _debug_json(data) -> str:
+    """Indented JSON text for Syntax panels"""
+    return _debug_json_bytes(data).decode("utf-8")
+
+def _write_debug_json(path, data) -> None:
+    """Write debug data as indented UTF-8 JSON; staged in a .tmp file and swapped in so readers never see a partial file"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb', buffering=1024 * 1024) as f:
+        f.write(_debug_json_bytes(data))
+    os.replace(tmp_path, path)
+
+# Parsed MCP server configs keyed by (path, mtime_ns); re-parsed only when the file changes
+_CONFIG_CACHE: Dict[tuple, list] = {}
 
 def load_server_configs():
     """Load MCP server configurations from YAML file"""
@@ -56,22 +114,52 @@ def load_server_configs():
             print(f"❌ MCP server config not found: {config_path}")
             return []
         
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
+        cache_key = (str(config_path.resolve()), config_path.stat().st_mtime_ns)
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        config = _load_config_with_json_sidecar(config_path)
         
-        return config.get("mcp_servers", [])
+        servers = config.get("mcp_servers", [])
+        _CONFIG_CACHE.clear()
+        _CONFIG_CACHE[cache_key] = servers
+        return list(servers)
     except Exception as e:
         print(f"❌ Error loading MCP config: {e}")
         return []
 
+# show_graph_status groups nodes in this order; any other status is listed afterwards
+_STATUS_ORDER = ('completed', 'running', 'failed', 'pending')
+
+# Rich markup for known statuses; anything else is shown dimmed
+_STATUS_DISPLAY = {
+    'completed': "[green]✅ completed[/green]",
+    'failed': "[red]❌ failed[/red]",
+    'pending': "[yellow]🔲 pending[/yellow]",
+}
+
 class GraphDebugger:
     def __init__(self, multi_mcp=None):
         self.multi_mcp = multi_mcp
         self.agent_runner = AgentRunner(multi_mcp) if multi_mcp else None
         self.console = Console()
         self.context: Optional[ExecutionContextManager] = None
-        self.read_only = not HAS_MCP
+        self.read_only = multi_mcp is None  # no MCP client (unavailable or failed to start): inspect only
         self.original_session_file = None  # 👈 Track original file
+        # show_graph_status rows per node_id; dropped for a node when it is replayed
+        self._status_rows: Dict[str, tuple] = {}
+        # get_inputs results keyed by (reads, context.output_chain_version)
+        self._inputs_cache: Dict[tuple, Dict[str, Any]] = {}
+        # analyze_graph results: "critical_path" -> (topology, info), "blocked" -> ((topology, statuses), blocked)
+        self._analysis_cache: Dict[str, tuple] = {}
+        # Flat predecessor index for blocked-node analysis; built on load_session (replays don't change topology)
+        self._pred: Optional[Dict[str, tuple]] = None
+        self._session_context: Optional[Dict[str, Any]] = None
+        # id(output) -> [output, json_text, Syntax or None]; holding the output keeps its id from being reused
+        self._render_cache: Dict[int, list] = {}
+        # Kept across analyze_graph calls so its DAG/ancestor caches carry over
+        self._validator: Optional[GraphValidator] = None
         
     async def load_session(self, session_path: str) -> bool:
         """Load a session from file"""
@@ -92,16 +180,27 @@ class GraphDebugger:
             
             # Create context with loaded graph
             from agentLoop.contextManager import ExecutionContextManager
-            self.context = ExecutionContextManager.__new__(ExecutionContextManager)
-            self.context.plan_graph = plan_graph
-            self.context.debug_mode = True
+            self.context = ExecutionContextManager.from_graph(plan_graph, debug_mode=True)
             self.context.log_messages = []
+            self._status_rows = {}
+            self._inputs_cache = {}
+            self._analysis_cache = {}
+            self._validator = None  # its topology caches belong to the previous session's graph
+            self._pred = GraphValidator.build_predecessor_index(plan_graph)
             
             # 🔧 CRITICAL FIX: Change session ID to avoid overwriting
             original_session_id = self.context.plan_graph.graph['session_id']
             debug_session_id = f"{original_session_id}_debug_{datetime.now().strftime('%H%M%S')}"
             self.context.plan_graph.graph['session_id'] = debug_session_id
             
+            # Session metadata handed to FormatterAgent replays; fixed for the lifetime of the session
+            graph_meta = self.context.plan_graph.graph
+            self._session_context = {
+                "session_id": graph_meta['session_id'],
+                "created_at": graph_meta.get('created_at'),
+                "file_manifest": graph_meta.get('file_manifest', [])
+            }
+            
             # Display session info using centralized method
             session_info = SessionSerializer.get_session_info(self.context.plan_graph)
             mode_info = " (READ-ONLY)" if self.read_only else ""
@@ -126,6 +225,33 @@ class GraphDebugger:
             self.console.print(traceback.format_exc())
             return False
     
+    def _get_inputs(self, reads) -> Dict[str, Any]:
+        """context.get_inputs, memoized until the next output_chain write"""
+        key = (tuple(reads), self.context.output_chain_version)
+        inputs = self._inputs_cache.get(key)
+        if inputs is None:
+            if len(self._inputs_cache) > 256:
+                self._inputs_cache.clear()
+            inputs = self._inputs_cache[key] = self.context.get_inputs(reads)
+        return dict(inputs)
+    
+    def _render_entry(self, output) -> list:
+        """Cache slot for an output object; replays store a new object, so stale entries are never hit"""
+        entry = self._render_cache.get(id(output))
+        if entry is None or entry[0] is not output:
+            if len(self._render_cache) > 64:
+                self._render_cache.clear()
+            entry = self._render_cache[id(output)] = [output, _debug_json(output), None]
+        return entry
+    
+    def _output_syntax(self, output):
+        """Highlighted JSON for an output, tokenized once per output object"""
+        entry = self._render_entry(output)
+        if entry[2] is None:
+            from rich.syntax import Syntax
+            entry[2] = Syntax(entry[1], "json", theme="monokai", line_numbers=True)
+        return entry[2]
+    
     def show_graph_status(self):
         """Display current graph execution status"""
         if not self.context:
@@ -140,50 +266,53 @@ class GraphDebugger:
         table.add_column("Writes")
         table.add_column("Description")
         
-        for node_id in self.context.plan_graph.nodes:
-            if node_id == "ROOT":
-                continue
+        nodes = self.context.plan_graph.nodes
+        status_rows = self._status_rows
+        # Group rows by status via the context's status index instead of filtering every node
+        by_status = self.context.nodes_by_status()
+        ordered_statuses = [s for s in _STATUS_ORDER if s in by_status]
+        ordered_statuses += [s for s in by_status if s not in _STATUS_ORDER]
+        for node_id in (n for status in ordered_statuses for n in by_status[status]):
+            row = status_rows.get(node_id)
+            if row is None:
+                node_get = nodes[node_id].get
+                status = node_get('status', 'unknown')
                 
-            node_data = self.context.plan_graph.nodes[node_id]
-            status = node_data.get('status', 'unknown')
-            
-            # Format status with colors
-            if status == 'completed':
-                status_display = "[green]✅ completed[/green]"
-            elif status == 'failed':
-                status_display = "[red]❌ failed[/red]"
-            elif status == 'pending':
-                status_display = "[yellow]🔲 pending[/yellow]"
-            else:
-                status_display = f"[dim]{status}[/dim]"
-            
-            table.add_row(
-                node_id,
-                node_data.get('agent', 'Unknown'),
-                status_display,
-                str(node_data.get('reads', [])),
-                str(node_data.get('writes', [])),
-                node_data.get('description', '')[:50] + "..." if len(node_data.get('description', '')) > 50 else node_data.get('description', '')
-            )
+                # Format status with colors
+                status_display = _STATUS_DISPLAY.get(status) or f"[dim]{status}[/dim]"
+                
+                description = node_get('description', '')
+                row = status_rows[node_id] = (
+                    node_id,
+                    node_get('agent', 'Unknown'),
+                    status_display,
+                    str(node_get('reads', [])),
+                    str(node_get('writes', [])),
+                    description[:50] + "..." if len(description) > 50 else description
+                )
+            table.add_row(*row)
         
         self.console.print(table)
     
     def show_node_details(self, node_id: str):
         """Show detailed information about a specific node"""
-        if not self.context or node_id not in self.context.plan_graph.nodes:
+        node_data = self.context.plan_graph.nodes.get(node_id) if self.context else None
+        if node_data is None:
             self.console.print(f"❌ Node {node_id} not found")
             return
             
-        node_data = self.context.plan_graph.nodes[node_id]
         reads = node_data.get('reads', [])
         writes = node_data.get('writes', [])
         
         # Check available inputs
-        available_inputs = self.context.get_inputs(reads)
+        available_inputs = self._get_inputs(reads)
         missing_inputs = [r for r in reads if r not in available_inputs]
         
+        # Collect everything and print it as one Group (one render/flush instead of one per section)
+        renderables = []
+        
         # Basic node info
-        self.console.print(Panel(
+        renderables.append(Panel(
             f"🤖 Agent: {node_data.get('agent', 'Unknown')}\n"
             f"📝 Description: {node_data.get('description', 'No description')}\n"
             f"📥 Reads: {reads}\n"
@@ -196,17 +325,19 @@ class GraphDebugger:
         ))
         
         # Show current output if exists
-        if node_data.get('output'):
-            self.console.print("\n💾 Current Output:")
-            output_json = json.dumps(node_data['output'], indent=2)
-            self.console.print(Syntax(output_json, "json", theme="monokai", line_numbers=True))
+        output = node_data.get('output')
+        if output:
+            renderables.append("\n💾 Current Output:")
+            renderables.append(self._output_syntax(output))
         
         # Show output_chain keys for debugging  
         output_chain_keys = list(self.context.plan_graph.graph.get('output_chain', {}).keys())
-        self.console.print(f"\n🔗 All output_chain keys: {output_chain_keys}")
+        renderables.append(f"\n🔗 All output_chain keys: {output_chain_keys}")
+        
+        self.console.print(Group(*renderables))
     
-    def _save_debug_data(self, node_id: str, inputs: Dict, outputs: List[Dict]):
-        """Save exact input/output to temp.json for detailed analysis"""
+    def _save_debug_data(self, node_id: str, inputs: Dict, outputs: List[Dict], file_name: str = "temp.json"):
+        """Save exact input/output to memory/<file_name> (temp.json by default) for detailed analysis"""
         debug_data = {
             "timestamp": datetime.now().isoformat(),
             "node_id": node_id,
@@ -220,35 +351,40 @@ class GraphDebugger:
         # Save to memory/temp.json
         memory_dir = Path("memory")
         memory_dir.mkdir(exist_ok=True)
-        temp_file = memory_dir / "temp.json"
+        temp_file = memory_dir / file_name
         
         try:
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(debug_data, f, indent=2, default=str, ensure_ascii=False)
+            _write_debug_json(temp_file, debug_data)
             self.console.print(f"💾 Debug data saved to [cyan]{temp_file}[/cyan]")
         except Exception as e:
             self.console.print(f"❌ Failed to save debug data: {e}")
     
-    async def replay_node(self, node_id: str, show_comparison: bool = True) -> Dict[str, Any]:
-        """Replay a specific node with existing inputs"""
+    async def replay_node(self, node_id: str, show_comparison: bool = True,
+                          debug_file: str = "temp.json") -> Dict[str, Any]:
+        """Replay a specific node with existing inputs (exact input/output saved to memory/<debug_file>)"""
         if self.read_only:
             self.console.print("❌ Node replay not available in read-only mode")
             return {}
             
-        if not self.context or node_id not in self.context.plan_graph.nodes:
+        node_data = self.context.plan_graph.nodes.get(node_id) if self.context else None
+        if node_data is None:
             self.console.print(f"❌ Node {node_id} not found")
             return {}
-            
-        node_data = self.context.plan_graph.nodes[node_id]
+        
+        # Resolve the node's fields once; they are reused for every agent call below
+        agent = node_data["agent"]
+        reads = node_data.get("reads", [])
+        writes = node_data.get("writes", [])
+        agent_prompt = node_data.get("agent_prompt", node_data["description"])
         
         # Store old output for comparison
         old_output = node_data.get('output')
         
         # Get inputs from existing output_chain
-        inputs = self.context.get_inputs(node_data.get("reads", []))
+        inputs = self._get_inputs(reads)
         
         self.console.print(Panel(
-            f"🔄 Re-running {node_id} ({node_data.get('agent', 'Unknown')})\n"
+            f"🔄 Re-running {node_id} ({agent})\n"
             f"📥 Using inputs: {list(inputs.keys())}",
             title="🚀 Node Replay",
             border_style="yellow"
@@ -257,50 +393,48 @@ class GraphDebugger:
         # Reset node status
         node_data['status'] = 'pending'
         node_data['output'] = None
+        self._status_rows.pop(node_id, None)
+        self.context.reset_status_index()
         
         # 🔧 SPECIAL HANDLING FOR FORMATTERAGENT - Send ALL output_chain data
-        if node_data["agent"] == "FormatterAgent":
-            # Send ALL gathered information to FormatterAgent
-            all_outputs = self.context.plan_graph.graph['output_chain'].copy()
+        if agent == "FormatterAgent":
+            # Send ALL gathered information to FormatterAgent. No copy: run_agent only reads it (into the
+            # prompt, before its first await), and replay_nodes never runs a FormatterAgent next to other replays
+            all_outputs = self.context.plan_graph.graph['output_chain']
             
             agent_input = {
                 "step_id": node_id,
-                "agent_prompt": node_data.get("agent_prompt", node_data["description"]),
-                "reads": node_data.get("reads", []),
-                "writes": node_data.get("writes", []),
+                "agent_prompt": agent_prompt,
+                "reads": reads,
+                "writes": writes,
                 "inputs": inputs,  # Specific inputs planner requested
                 "all_outputs": all_outputs,  # ✅ ALL gathered information from output_chain
                 "original_query": self.context.plan_graph.graph['original_query'],
-                "session_context": {
-                    "session_id": self.context.plan_graph.graph['session_id'],
-                    "created_at": self.context.plan_graph.graph['created_at'],
-                    "file_manifest": self.context.plan_graph.graph['file_manifest']
-                }
+                "session_context": self._session_context
             }
         else:
             # Regular agent input
             agent_input = {
                 "step_id": node_id,
-                "agent_prompt": node_data.get("agent_prompt", node_data["description"]),
-                "reads": node_data.get("reads", []),
-                "writes": node_data.get("writes", []),
+                "agent_prompt": agent_prompt,
+                "reads": reads,
+                "writes": writes,
                 "inputs": inputs
             }
         
         # Execute the node
         start_time = datetime.now()
         
-        result = await self.agent_runner.run_agent(node_data["agent"], agent_input)
+        result = await self.agent_runner.run_agent(agent, agent_input)
         
         execution_time = (datetime.now() - start_time).total_seconds()
+        self._status_rows.pop(node_id, None)
         
         # Update the graph with new results
         if result["success"]:
-            self.context.mark_done(node_id, result["output"])
+            await self.context.mark_done(node_id, result["output"])
             new_output = result["output"]
-            
-            # 💾 Save exact input/output to temp.json
-            self._save_debug_data(node_id, inputs, [result["output"]])
+            debug_outputs = [result["output"]]
             
             self.console.print(Panel(
                 f"✅ {node_id} completed successfully!\n"
@@ -316,44 +450,28 @@ class GraphDebugger:
                 self._show_output_comparison(node_id, old_output, new_output)
                 
             if result["output"].get("call_self"):
-                # Store first iteration
-                iterations = [{"iteration": 1, "output": result["output"]}]
-                
                 # Run second iteration
-                second_result = await self.agent_runner.run_agent(node_data["agent"], {
+                second_result = await self.agent_runner.run_agent(agent, {
                     "step_id": node_id,
                     "agent_prompt": result["output"].get("next_instruction", "Continue the task"),
-                    "reads": node_data.get("reads", []),
-                    "writes": node_data.get("writes", []),
+                    "reads": reads,
+                    "writes": writes,
                     "inputs": inputs,
                     "previous_output": result["output"],
                     "iteration_context": result["output"].get("iteration_context", {})
                 })
                 
                 if second_result["success"]:
-                    iterations.append({"iteration": 2, "output": second_result["output"]})
-                    final_output = second_result["output"]
-                else:
-                    iterations.append(None)
-                    final_output = result["output"]
-                
-                # Store both iterations
-                debug_data = {
-                    "timestamp": datetime.now().isoformat(),
-                    "node_id": node_id,
-                    "iterations": iterations,
-                    "final_output": final_output
-                }
-                
-                # Save to temp.json
-                with open("memory/temp.json", 'w', encoding='utf-8') as f:
-                    json.dump(debug_data, f, indent=2, default=str, ensure_ascii=False)
+                    debug_outputs.append(second_result["output"])
+            
+            # 💾 Save exact input/output to temp.json (both iterations when call_self ran)
+            self._save_debug_data(node_id, inputs, debug_outputs, debug_file)
             
             return new_output
         else:
             # 💾 Save inputs and error for debugging
             error_output = {"error": result["error"], "success": False}
-            self._save_debug_data(node_id, inputs, [error_output])
+            self._save_debug_data(node_id, inputs, [error_output], debug_file)
             
             self.console.print(Panel(
                 f"❌ {node_id} failed: {result['error']}\n"
@@ -363,28 +481,101 @@ class GraphDebugger:
             ))
             return {}
     
+    def _upstream(self, node_id: str) -> Set[str]:
+        """Every node `node_id` depends on, through graph edges or its reads"""
+        nodes = self.context.plan_graph.nodes
+        seen: Set[str] = set()
+        stack = [node_id]
+        while stack:
+            current = stack.pop()
+            parents = list(self._pred.get(current, ()))
+            if current in nodes:
+                parents.extend(nodes[current].get("reads", ()))
+            for parent in parents:
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        seen.discard(node_id)
+        return seen
+    
+    def _replay_conflicts(self, node_ids: List[str]) -> List[str]:
+        """Reasons `node_ids` cannot be replayed concurrently; empty if they are independent"""
+        nodes = self.context.plan_graph.nodes
+        batch = dict.fromkeys(node_ids)
+        conflicts = []
+        if len(batch) < len(node_ids):
+            conflicts.append("the same node is listed more than once")
+        for node_id in batch:
+            if node_id not in nodes:
+                continue  # replay_node reports unknown ids
+            if nodes[node_id].get("agent") == "FormatterAgent" and len(batch) > 1:
+                conflicts.append(f"{node_id} is a FormatterAgent and reads every node's output")
+            upstream = self._upstream(node_id)
+            conflicts.extend(f"{node_id} depends on {other}" for other in batch if other in upstream)
+        return conflicts
+    
+    async def replay_nodes(self, node_ids: List[str], concurrency: int = 4) -> Dict[str, Dict[str, Any]]:
+        """Replay several independent nodes concurrently (at most `concurrency` at a time).
+        
+        Nodes that depend on one another (or a FormatterAgent, which reads everything) are rejected:
+        replay them one at a time instead. Each node's debug data goes to memory/temp_<node_id>.json.
+        """
+        if self.context is not None and self._pred is not None:
+            conflicts = self._replay_conflicts(node_ids)
+            if conflicts:
+                self.console.print("❌ These nodes cannot be replayed together:\n  • " + "\n  • ".join(conflicts))
+                return {}
+        
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def _replay(node_id: str) -> Dict[str, Any]:
+            async with sem:
+                return await self.replay_node(node_id, debug_file=f"temp_{node_id}.json")
+        
+        results = await asyncio.gather(*(_replay(node_id) for node_id in node_ids), return_exceptions=True)
+        
+        replayed = {}
+        for node_id, result in zip(node_ids, results):
+            if isinstance(result, Exception):
+                self.console.print(f"❌ Replay of {node_id} raised: {result}")
+                result = {}
+            replayed[node_id] = result
+        return replayed
+    
     def _show_output_comparison(self, node_id: str, old_output: Dict, new_output: Dict):
-        """Show side-by-side comparison of old vs new output"""
+        """Show a unified diff of old vs new output (only changed lines are rendered)"""
+        import difflib
+        from rich.text import Text
+        
         self.console.print(f"\n🔍 Output Comparison for {node_id}:")
         
         # Convert to formatted JSON
-        old_json = json.dumps(old_output, indent=2)
-        new_json = json.dumps(new_output, indent=2)
-        
-        # Create side-by-side panels
-        old_panel = Panel(
-            Syntax(old_json, "json", theme="monokai", line_numbers=True),
-            title="📜 OLD OUTPUT",
-            border_style="red"
-        )
-        
-        new_panel = Panel(
-            Syntax(new_json, "json", theme="monokai", line_numbers=True),
-            title="🆕 NEW OUTPUT", 
-            border_style="green"
-        )
-        
-        self.console.print(Columns([old_panel, new_panel]))
+        old_json = self._render_entry(old_output)[1]
+        new_json = self._render_entry(new_output)[1]
+        
+        diff_text = Text()
+        for line in difflib.unified_diff(
+            old_json.splitlines(), new_json.splitlines(),
+            fromfile="OLD OUTPUT", tofile="NEW OUTPUT", lineterm=""
+        ):
+            if line.startswith(("+++", "---")):
+                style = "bold"
+            elif line.startswith("+"):
+                style = "green"
+            elif line.startswith("-"):
+                style = "red"
+            elif line.startswith("@@"):
+                style = "cyan"
+            else:
+                style = "dim"
+            diff_text.append(line + "\n", style=style)
+        
+        if not diff_text:
+            self.console.print("🟰 New output is identical to the old output")
+            return
+        
+        diff_text.rstrip()
+        self.console.print(Panel(diff_text, title="📜 OLD → 🆕 NEW", border_style="yellow"))
     
     def show_output_chain(self, filter_key: Optional[str] = None):
         """Show current output_chain (optionally filtered)"""
@@ -396,9 +587,10 @@ class GraphDebugger:
         
         if filter_key:
             if filter_key in output_chain:
+                from rich.syntax import Syntax
                 filtered_data = {filter_key: output_chain[filter_key]}
                 self.console.print(f"🎯 Filtered output_chain['{filter_key}']:")
-                self.console.print(Syntax(json.dumps(filtered_data, indent=2, default=str), "json", theme="monokai"))
+                self.console.print(Syntax(_debug_json(filtered_data), "json", theme="monokai"))
             else:
                 self.console.print(f"❌ Key '{filter_key}' not found in output_chain")
                 self.console.print(f"Available keys: {list(output_chain.keys())}")
@@ -431,32 +623,58 @@ class GraphDebugger:
             self.console.print("❌ No session loaded")
             return
             
-        validator = GraphValidator(self.console)
+        if self._validator is None:
+            self._validator = GraphValidator(self.console)
+        validator = self._validator
         
         # Re-validate current state
         self.console.print("🔍 **CURRENT GRAPH VALIDATION:**")
         validation_results = validator.validate_execution_graph(self.context.plan_graph, verbose=True)
         
+        # Critical path depends only on topology; blocked nodes also on node statuses
+        graph = self.context.plan_graph
+        topology = (tuple(graph.nodes), tuple(graph.edges))
+        statuses = tuple(data.get('status') for _, data in graph.nodes(data=True))
+        
+        # Critical path and blocked-node sections are collected and printed as one Group
+        lines = []
+        
         # Critical path analysis
-        self.console.print("\n📈 **CRITICAL PATH ANALYSIS:**")
-        critical_path_info = validator.analyze_critical_path(self.context.plan_graph)
+        lines.append("\n📈 **CRITICAL PATH ANALYSIS:**")
+        cached = self._analysis_cache.get("critical_path")
+        if cached is not None and cached[0] == topology:
+            critical_path_info = cached[1]
+        else:
+            critical_path_info = validator.analyze_critical_path(graph)
+            self._analysis_cache["critical_path"] = (topology, critical_path_info)
         
         if "error" in critical_path_info:
-            self.console.print(f"❌ {critical_path_info['error']}")
+            lines.append(f"❌ {critical_path_info['error']}")
         else:
-            self.console.print(f"🎯 Critical Path: {' → '.join(critical_path_info['critical_path'])}")
-            self.console.print(f"📏 Path Length: {critical_path_info['path_length']} steps")
-            self.console.print(f"⚡ Parallel Opportunities: {critical_path_info['parallel_opportunities']} nodes can run in parallel")
+            lines.append(f"🎯 Critical Path: {' → '.join(critical_path_info['critical_path'])}")
+            lines.append(f"📏 Path Length: {critical_path_info['path_length']} steps")
+            lines.append(f"⚡ Parallel Opportunities: {critical_path_info['parallel_opportunities']} nodes can run in parallel")
         
         # Blocked nodes analysis
-        self.console.print("\n🚫 **BLOCKED NODES ANALYSIS:**")
-        blocked_nodes = validator.find_blocked_nodes(self.context.plan_graph)
+        lines.append("\n🚫 **BLOCKED NODES ANALYSIS:**")
+        cached = self._analysis_cache.get("blocked")
+        if not self.context.nodes_by_status().get('failed'):
+            blocked_nodes = {}  # nothing failed, so nothing can be blocked
+        elif cached is not None and cached[0] == (topology, statuses):
+            blocked_nodes = cached[1]
+        else:
+            if self._pred is None:
+                self._pred = validator.build_predecessor_index(graph)
+            blocked_nodes = validator.find_blocked_nodes(graph, pred=self._pred)
+            self._analysis_cache["blocked"] = ((topology, statuses), blocked_nodes)
         
         if blocked_nodes:
             for node, failed_deps in blocked_nodes.items():
-                self.console.print(f"❌ {node} blocked by failed dependencies: {failed_deps}")
+                lines.append(f"❌ {node} blocked by failed dependencies: {failed_deps}")
         else:
-            self.console.print("✅ No nodes are blocked by failed dependencies")
+            lines.append("✅ No nodes are blocked by failed dependencies")
+        
+        self.console.print(Group(*lines))
 
 
 # CLI Interface for interactive debugging
@@ -475,6 +693,7 @@ class GraphDebuggerCLI:
             "  analyze                 - Analyze graph structure & dependencies\n"
             "  node <node_id>          - Show node details\n"
             "  replay <node_id>        - Replay a specific node (if MCP available)\n"
+            "  replay_many <id> <id>.. - Replay independent nodes concurrently\n"
             "  outputs [key]           - Show output_chain\n"
             "  save [path]             - Save current session\n"
             "  exit                    - Exit debugger",
@@ -482,9 +701,12 @@ class GraphDebuggerCLI:
             border_style="cyan"
         ))
         
+        from rich.prompt import Prompt
+        
         # Initialize MCP if available
         multi_mcp = None
-        if HAS_MCP:
+        has_mcp, MultiMCP = _load_mcp()
+        if has_mcp:
             try:
                 server_configs = load_server_configs()
                 multi_mcp = MultiMCP(server_configs)
@@ -537,6 +759,12 @@ class GraphDebuggerCLI:
                         continue
                     await self.debugger.replay_node(command[1])
                     
+                elif cmd == "replay_many":
+                    if len(command) < 2:
+                        self.console.print("❌ Usage: replay_many <node_id> [<node_id> ...]")
+                        continue
+                    await self.debugger.replay_nodes(command[1:])
+                    
                 elif cmd == "outputs":
                     filter_key = command[1] if len(command) > 1 else None
                     self.debugger.show_output_chain(filter_key)
@@ -553,7 +781,7 @@ class GraphDebuggerCLI:
             except Exception as e:
                 self.console.print(f"❌ Error: {e}")
         
-        if multi_mcp and HAS_MCP:
+        if multi_mcp and has_mcp:
             await multi_mcp.shutdown()
         self.console.print("👋 Goodbye!")
 
@@ -562,7 +790,8 @@ class GraphDebuggerCLI:
 async def replay_node_from_session(session_file: str, node_id: str):
     """Convenience function to replay a node from a session file"""
     multi_mcp = None
-    if HAS_MCP:
+    has_mcp, MultiMCP = _load_mcp()
+    if has_mcp:
         try:
             server_configs = load_server_configs()
             multi_mcp = MultiMCP(server_configs)
@@ -574,11 +803,11 @@ async def replay_node_from_session(session_file: str, node_id: str):
     
     if await debugger.load_session(session_file):
         result = await debugger.replay_node(node_id)
-        if multi_mcp and HAS_MCP:
+        if multi_mcp and has_mcp:
             await multi_mcp.shutdown()
         return result
     
-    if multi_mcp and HAS_MCP:
+    if multi_mcp and has_mcp:
         await multi_mcp.shutdown()
     return None
 
@@ -601,7 +830,7 @@ if __name__ == "__main__":
     if len(sys.argv) == 3:
         # Direct replay: python graph_debugger.py <session_file> <node_id>
         session_file, node_id = sys.argv[1], sys.argv[2]
-        if HAS_MCP:
+        if _load_mcp()[0]:
             asyncio.run(replay_node_from_session(session_file, node_id))
         else:
             print("⚠️  Running in read-only mode (MCP not available)")
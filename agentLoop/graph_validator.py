@@ -2,76 +2,135 @@
 NetworkX-based graph validation utilities
 """
 
+import weakref
 import networkx as nx
+from collections import defaultdict
+from itertools import islice
 from typing import List, Dict, Set, Optional, Tuple
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
+from rich.text import Text
+
+# Attributes every non-ROOT node must carry (sorted() of this gives the original warning order)
+_REQUIRED_ATTRS = frozenset(("agent", "description", "status"))
+
+# Cycle enumeration stops after this many cycles (see GraphValidator._find_cycles)
+MAX_REPORTED_CYCLES = 100
+
+# Only this many disconnected components are kept for display; the rest are just counted
+MAX_PREVIEW_COMPONENTS = 5
+
+# Graphs up to this many nodes keep ancestor sets as int bitmasks in find_blocked_nodes
+BITMASK_MAX_NODES = 256
+
+def _from_smallest(cycle: List) -> List:
+    """`cycle` rotated to start at its smallest node, so the same cycle always reads the same way"""
+    start = min(range(len(cycle)), key=lambda i: str(cycle[i]))
+    return cycle[start:] + cycle[:start]
 
 class GraphValidator:
     """Comprehensive graph validation using NetworkX features"""
     
     def __init__(self, console: Optional[Console] = None):
         self.console = console or Console()
+        # Topology caches hold only the most recent graph: (topology key, value) or None
+        # (is_dag, topological order or None); shared by validation and critical path
+        self._dag_cache: Optional[Tuple[Tuple, Tuple[bool, Optional[List]]]] = None
+        # {node: frozenset of ancestors}
+        self._ancestors: Optional[Tuple[Tuple, Dict[str, frozenset]]] = None
+        # (node order, {node: ancestor bitmask}) for small graphs
+        self._ancestor_bits: Optional[Tuple[Tuple, Tuple[List[str], Dict[str, int]]]] = None
+        # id(graph) -> state kept by validate_incremental between calls
+        self._incremental: Dict[int, Dict[str, any]] = {}
     
-    def validate_execution_graph(self, graph: nx.DiGraph, verbose: bool = True) -> Dict[str, any]:
-        """
-        Comprehensive validation of execution graph
+    @staticmethod
+    def _topology_key(graph: nx.DiGraph) -> Tuple:
+        """Node and edge tuples: equal exactly when two graphs have the same topology (and node order)"""
+        return (tuple(graph), tuple(graph.edges))
+    
+    def _dag_and_topo(self, graph: nx.DiGraph, key: Optional[Tuple] = None) -> Tuple[bool, Optional[List]]:
+        """DAG check and topological order from a single traversal, memoized for the latest topology"""
+        if key is None:
+            key = self._topology_key(graph)
+        if self._dag_cache is not None and self._dag_cache[0] == key:
+            return self._dag_cache[1]
+        try:
+            result = (True, list(nx.topological_sort(graph)))
+        except nx.NetworkXUnfeasible:
+            result = (False, None)
+        self._dag_cache = (key, result)
+        return result
+    
+    @staticmethod
+    def _find_cycles(graph: nx.DiGraph, length_bound: int = 8, max_cycles: int = MAX_REPORTED_CYCLES) -> List[List]:
+        """Enumerate cycles per cyclic strongly connected component, bounded in length and count.
         
-        Returns:
-            dict: Validation results with status and details
+        Plain simple_cycles on a dense cyclic region is exponential; this keeps a bad plan from stalling validation.
+        Every cyclic component (including a single node with a self-edge) yields at least one cycle until
+        max_cycles is reached: one whose cycles are all longer than length_bound reports a DFS cycle instead.
+        Each cycle starts at its smallest node.
         """
-        results = {
+        cycles = []
+        for scc in nx.strongly_connected_components(graph):
+            if len(scc) == 1:
+                node = next(iter(scc))
+                if graph.has_edge(node, node):
+                    cycles.append([node])
+            else:
+                sub = graph.subgraph(scc)
+                found = list(islice(nx.simple_cycles(sub, length_bound=length_bound), max_cycles - len(cycles)))
+                cycles.extend(_from_smallest(cycle) for cycle in found or [[edge[0] for edge in nx.find_cycle(sub)]])
+            if len(cycles) >= max_cycles:
+                break
+        return cycles
+    
+    @staticmethod
+    def _new_results() -> Dict[str, any]:
+        return {
             "is_valid": True,
             "is_dag": False,
             "cycles": [],
             "disconnected_components": [],
+            "disconnected_component_count": 0,
             "orphaned_nodes": [],
             "root_nodes": [],
             "leaf_nodes": [],
             "warnings": [],
             "errors": []
         }
+    
+    @staticmethod
+    def _fingerprint(graph: nx.DiGraph) -> Tuple:
+        """Cheap O(1) shape check from node/edge counts and ROOT degrees.
         
-        # 1. Basic DAG validation
-        try:
-            results["is_dag"] = nx.is_directed_acyclic_graph(graph)
-            if not results["is_dag"]:
-                results["is_valid"] = False
-                results["cycles"] = list(nx.simple_cycles(graph))
-                results["errors"].append(f"Graph contains {len(results['cycles'])} cycles")
-        except Exception as e:
-            results["is_valid"] = False
-            results["errors"].append(f"DAG validation failed: {e}")
+        ('fanout_from_root', n) when ROOT has no parents and is the only parent of every other node
+        (all n - 1 edges leave ROOT); ('general', n) otherwise.
+        """
+        n = graph.number_of_nodes()
+        if ("ROOT" in graph and graph.number_of_edges() == n - 1
+                and graph.in_degree("ROOT") == 0 and graph.out_degree("ROOT") == n - 1):
+            return ("fanout_from_root", n)
+        return ("general", n)
+    
+    def validate_execution_graph(self, graph: nx.DiGraph, verbose: bool = True,
+                                 enumerate_all_cycles: bool = False) -> Dict[str, any]:
+        """
+        Comprehensive validation of execution graph
         
-        # 2. Connectivity analysis
-        try:
-            # Check for disconnected components
-            if not nx.is_weakly_connected(graph):
-                weak_components = list(nx.weakly_connected_components(graph))
-                results["disconnected_components"] = [list(comp) for comp in weak_components]
-                results["warnings"].append(f"Graph has {len(weak_components)} disconnected components")
-            
-            # Find root nodes (no predecessors, except ROOT)
-            results["root_nodes"] = [n for n in graph.nodes() 
-                                   if graph.in_degree(n) == 0 and n != "ROOT"]
-            
-            # Find leaf nodes (no successors)
-            results["leaf_nodes"] = [n for n in graph.nodes() 
-                                   if graph.out_degree(n) == 0]
-            
-            # Find orphaned nodes (no connections)
-            results["orphaned_nodes"] = [n for n in graph.nodes() 
-                                       if graph.degree(n) == 0 and n != "ROOT"]
-            
-        except Exception as e:
-            results["warnings"].append(f"Connectivity analysis failed: {e}")
+        Args:
+            enumerate_all_cycles: List every (bounded) cycle instead of one representative
+        
+        Returns:
+            dict: Validation results with status and details
+        """
+        if not isinstance(graph, nx.DiGraph):
+            raise TypeError(f"Expected a networkx DiGraph, got {type(graph).__name__}")
+        
+        results = self._validate_structure(graph, enumerate_all_cycles)
         
         # 3. Execution-specific validations
-        try:
-            self._validate_execution_requirements(graph, results)
-        except Exception as e:
-            results["warnings"].append(f"Execution validation failed: {e}")
+        self._validate_execution_requirements(graph, results)
         
         # 4. Display results if verbose
         if verbose:
@@ -79,6 +138,73 @@ class GraphValidator:
         
         return results
     
+    def _validate_structure(self, graph: nx.DiGraph, enumerate_all_cycles: bool = False) -> Dict[str, any]:
+        """Topology-only part of validate_execution_graph: DAG/cycles, connectivity, roots and leaves"""
+        results = self._new_results()
+        
+        # Known shapes skip the checks that cannot fail for them
+        if self._fingerprint(graph)[0] == "fanout_from_root":
+            # Acyclic and connected by construction; every non-ROOT node is a leaf
+            # (ROOT is one only when it stands alone)
+            results["is_dag"] = True
+            results["leaf_nodes"] = [node_id for node_id in graph if node_id != "ROOT"] or ["ROOT"]
+            return results
+        
+        # 1. Basic DAG validation
+        results["is_dag"] = self._dag_and_topo(graph)[0]
+        if not results["is_dag"]:
+            results["is_valid"] = False
+            if enumerate_all_cycles:
+                results["cycles"] = self._find_cycles(graph)
+                capped = "+" if len(results["cycles"]) >= MAX_REPORTED_CYCLES else ""
+                results["errors"].append(f"Graph contains {len(results['cycles'])}{capped} cycles")
+            else:
+                # One representative cycle from a single DFS
+                edges = nx.find_cycle(graph, orientation="original")
+                results["cycles"] = [[edge[0] for edge in edges]]
+                results["errors"].append("Graph contains at least one cycle")
+        
+        # 2. Connectivity analysis
+        # Check for disconnected components; cheap degree/edge-count checks settle the common cases
+        n = graph.number_of_nodes()
+        if n <= 1:
+            is_connected = True
+        elif "ROOT" in graph and graph.out_degree("ROOT") == n - 1:
+            is_connected = True  # ROOT fans out to every other node
+        elif graph.number_of_edges() < n - 1:
+            is_connected = False  # too few edges to span all nodes
+        else:
+            is_connected = nx.is_weakly_connected(graph)
+        if not is_connected:
+            weak_count = 0
+            comps_preview = []
+            for comp in nx.weakly_connected_components(graph):
+                weak_count += 1
+                if len(comps_preview) < MAX_PREVIEW_COMPONENTS:
+                    comps_preview.append(sorted(comp, key=str))
+            results["disconnected_components"] = comps_preview
+            results["disconnected_component_count"] = weak_count
+            results["warnings"].append(f"Graph has {weak_count} disconnected components")
+        
+        # Classify root (no predecessors, except ROOT), leaf (no successors) and
+        # orphaned (no connections) nodes in a single pass over the degree views
+        in_deg = dict(graph.in_degree())
+        out_deg = dict(graph.out_degree())
+        roots, leaves, orphans = [], [], []
+        for n in graph.nodes():
+            i, o = in_deg[n], out_deg[n]
+            if i == 0 and n != "ROOT":
+                roots.append(n)
+                if o == 0:
+                    orphans.append(n)
+            if o == 0:
+                leaves.append(n)
+        results["root_nodes"] = roots
+        results["leaf_nodes"] = leaves
+        results["orphaned_nodes"] = orphans
+        
+        return results
+    
     def _validate_execution_requirements(self, graph: nx.DiGraph, results: Dict):
         """Validate execution-specific requirements"""
         
@@ -88,64 +214,109 @@ class GraphValidator:
             results["is_valid"] = False
         
         # Check that all non-ROOT nodes have required attributes
-        required_attrs = ["agent", "description", "status"]
-        for node_id in graph.nodes():
+        for node_id, node_data in graph.nodes(data=True):
             if node_id == "ROOT":
                 continue
                 
-            node_data = graph.nodes[node_id]
-            missing_attrs = [attr for attr in required_attrs if attr not in node_data]
-            if missing_attrs:
-                results["warnings"].append(f"Node {node_id} missing attributes: {missing_attrs}")
+            warning = self._missing_attrs_warning(node_id, node_data)
+            if warning:
+                results["warnings"].append(warning)
         
-        # Check for dependency cycles in reads/writes
+        # Check for dependency cycles in reads/writes (malformed reads/writes values raise TypeError)
         try:
             dependency_issues = self._check_dependency_cycles(graph)
-            if dependency_issues:
-                results["warnings"].extend(dependency_issues)
-        except Exception as e:
+        except (nx.NetworkXError, TypeError) as e:
             results["warnings"].append(f"Dependency analysis failed: {e}")
+        else:
+            results["warnings"].extend(dependency_issues)
+    
+    @staticmethod
+    def _missing_attrs_warning(node_id: str, node_data: Dict) -> Optional[str]:
+        if _REQUIRED_ATTRS.issubset(node_data):
+            return None
+        return f"Node {node_id} missing attributes: {sorted(_REQUIRED_ATTRS - node_data.keys())}"
     
     def _check_dependency_cycles(self, graph: nx.DiGraph) -> List[str]:
         """Check for logical dependency cycles in reads/writes"""
         issues = []
         
-        # Build dependency graph based on reads/writes
-        dep_graph = nx.DiGraph()
+        # Index producers by the key they write, then link each reader to the producers of its reads
+        writers: Dict[str, List[str]] = defaultdict(list)
+        node_reads: Dict[str, frozenset] = {}
         
-        for node_id in graph.nodes():
+        for node_id, node_data in graph.nodes(data=True):
             if node_id == "ROOT":
                 continue
-                
-            node_data = graph.nodes[node_id]
-            writes = set(node_data.get("writes", []))
-            reads = set(node_data.get("reads", []))
             
-            # Add node to dependency graph
-            dep_graph.add_node(node_id, writes=writes, reads=reads)
+            for key in set(node_data.get("writes", [])):
+                writers[key].append(node_id)
+            node_reads[node_id] = frozenset(node_data.get("reads", []))
         
-        # Add edges based on read/write dependencies
-        for node_id in dep_graph.nodes():
-            node_reads = dep_graph.nodes[node_id]["reads"]
-            
-            for other_node in dep_graph.nodes():
-                if other_node == node_id:
-                    continue
-                    
-                other_writes = dep_graph.nodes[other_node]["writes"]
-                
-                # If this node reads what another writes, create dependency
-                if node_reads & other_writes:  # Set intersection
-                    dep_graph.add_edge(other_node, node_id)
+        # Plain adjacency sets: writer -> readers
+        adj: Dict[str, Set[str]] = defaultdict(set)
+        for node_id, reads in node_reads.items():
+            for key in reads:
+                for writer in writers.get(key, ()):
+                    # If this node reads what another writes, create dependency
+                    if writer != node_id:
+                        adj[writer].add(node_id)
         
-        # Check for cycles in dependency graph
-        if not nx.is_directed_acyclic_graph(dep_graph):
-            cycles = list(nx.simple_cycles(dep_graph))
-            for cycle in cycles:
-                issues.append(f"Dependency cycle detected: {' → '.join(cycle + [cycle[0]])}")
+        # Check for cycles in dependency graph; only cyclic components get a (small) NetworkX graph
+        for scc in self._nontrivial_sccs(adj):
+            issues.extend(self._scc_cycle_issues(scc, adj))
         
         return issues
     
+    def _scc_cycle_issues(self, scc: Set[str], adj: Dict[str, Set[str]]) -> List[str]:
+        """Dependency-cycle warnings for one strongly connected component of the writer -> reader graph"""
+        # Built in sorted order so a capped enumeration picks the same cycles whatever order adj was built in
+        sub = nx.DiGraph((u, v) for u in sorted(scc, key=str) for v in sorted(adj[u], key=str) if v in scc)
+        return [f"Dependency cycle detected: {' → '.join(cycle + [cycle[0]])}" for cycle in self._find_cycles(sub)]
+    
+    @staticmethod
+    def _nontrivial_sccs(adj: Dict[str, Set[str]]) -> List[Set[str]]:
+        """Strongly connected components with more than one node (iterative Tarjan, no recursion limit)"""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        sccs = []
+        
+        for root in list(adj):
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(adj[root]))]
+            while work:
+                node, successors = work[-1]
+                for succ in successors:
+                    if succ not in index:
+                        index[succ] = low[succ] = len(index)
+                        stack.append(succ)
+                        on_stack.add(succ)
+                        work.append((succ, iter(adj.get(succ, ()))))
+                        break
+                    if succ in on_stack:
+                        low[node] = min(low[node], index[succ])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = set()
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.add(member)
+                            if member == node:
+                                break
+                        if len(component) > 1:
+                            sccs.append(component)
+        return sccs
+    
     def _display_validation_results(self, results: Dict):
         """Display validation results using Rich"""
         
@@ -153,74 +324,99 @@ class GraphValidator:
         status_color = "green" if results["is_valid"] else "red"
         status_text = "✅ VALID" if results["is_valid"] else "❌ INVALID"
         
-        self.console.print(Panel(
+        panel = Panel(
             f"🔍 Graph Validation Results\n\n"
             f"Status: [{status_color}]{status_text}[/{status_color}]\n"
             f"Is DAG: {'✅' if results['is_dag'] else '❌'}\n"
             f"Nodes: {len(results.get('root_nodes', []))} roots, {len(results.get('leaf_nodes', []))} leaves",
             title="📊 Validation Summary",
             border_style=status_color
-        ))
+        )
+        
+        # Nothing to list: just the summary
+        if not (results["errors"] or results["warnings"] or results["cycles"] or results["disconnected_components"]):
+            self.console.print(panel)
+            return
+        
+        # Everything else goes out in a single render
+        parts = [panel]
         
         # Errors
         if results["errors"]:
-            self.console.print("\n❌ **ERRORS:**")
-            for error in results["errors"]:
-                self.console.print(f"  • {error}")
+            parts.append(Text("\n❌ **ERRORS:**"))
+            parts.extend(Text(f"  • {error}") for error in results["errors"])
         
         # Warnings  
         if results["warnings"]:
-            self.console.print("\n⚠️  **WARNINGS:**")
-            for warning in results["warnings"]:
-                self.console.print(f"  • {warning}")
+            parts.append(Text("\n⚠️  **WARNINGS:**"))
+            parts.extend(Text(f"  • {warning}") for warning in results["warnings"])
         
         # Cycles
         if results["cycles"]:
-            self.console.print(f"\n🔄 **CYCLES DETECTED:**")
-            for i, cycle in enumerate(results["cycles"], 1):
-                cycle_str = " → ".join(cycle + [cycle[0]])
-                self.console.print(f"  {i}. {cycle_str}")
+            parts.append(Text("\n🔄 **CYCLES DETECTED:**"))
+            # One Text for all cycles, however many were found
+            parts.append(Text("\n").join(
+                Text(f"  {i}. {' → '.join(cycle + [cycle[0]])}")
+                for i, cycle in enumerate(results["cycles"], 1)
+            ))
         
         # Disconnected components
         if results["disconnected_components"]:
-            self.console.print(f"\n🔗 **DISCONNECTED COMPONENTS:**")
+            parts.append(Text("\n🔗 **DISCONNECTED COMPONENTS:**"))
             for i, component in enumerate(results["disconnected_components"], 1):
-                self.console.print(f"  {i}. {component}")
+                parts.append(Text(f"  {i}. {component}"))
+            hidden = results.get("disconnected_component_count", 0) - len(results["disconnected_components"])
+            if hidden > 0:
+                parts.append(Text(f"  … and {hidden} more"))
+        
+        self.console.print(Group(*parts))
 
     def analyze_critical_path(self, graph: nx.DiGraph) -> Dict[str, any]:
         """Analyze execution critical path using NetworkX algorithms"""
         
-        if not nx.is_directed_acyclic_graph(graph):
+        fingerprint = self._fingerprint(graph)
+        if fingerprint[0] == "fanout_from_root":
+            # Every node sits at depth 1; like the general path below, the path ends at the first
+            # of them in topological order (skipping only the distance pass)
+            n = fingerprint[1]
+            first = next((node for node in self._dag_and_topo(graph)[1] if node != "ROOT"), None)
+            return {
+                "critical_path": ["ROOT", first] if first is not None else ["ROOT"],
+                "path_length": min(n - 1, 1),
+                "total_nodes": n,
+                "parallel_opportunities": n - min(n - 1, 1) - 1
+            }
+        
+        is_dag, topo_order = self._dag_and_topo(graph)
+        if not is_dag:
             return {"error": "Cannot analyze critical path: graph contains cycles"}
         
         try:
             # Find longest path (critical path) using topological sort
-            topo_order = list(nx.topological_sort(graph))
             
-            # Calculate longest distances
+            # Calculate longest distances, remembering the predecessor each one came through
             distances = {}
+            parent = {}
             for node in topo_order:
-                if graph.in_degree(node) == 0:  # Root nodes
+                preds = graph._pred[node]
+                if not preds:  # Root nodes
                     distances[node] = 0
+                    parent[node] = None
                 else:
-                    distances[node] = max(
-                        distances[pred] + 1 
-                        for pred in graph.predecessors(node)
-                    )
+                    best = max(preds, key=distances.__getitem__)
+                    distances[node] = distances[best] + 1
+                    parent[node] = best
             
             # Find critical path
             max_distance = max(distances.values())
-            critical_nodes = [node for node, dist in distances.items() if dist == max_distance]
+            current = next(node for node, dist in distances.items() if dist == max_distance)  # One of the furthest nodes
             
-            # Build actual critical path
+            # Build actual critical path by following the stored parents
             critical_path = []
-            current = critical_nodes[0]  # Start with one of the furthest nodes
-            
-            while current:
-                critical_path.insert(0, current)
-                predecessors = [p for p in graph.predecessors(current) 
-                              if distances[p] == distances[current] - 1]
-                current = predecessors[0] if predecessors else None
+            while current is not None:
+                critical_path.append(current)
+                current = parent[current]
+            critical_path.reverse()
             
             return {
                 "critical_path": critical_path,
@@ -232,26 +428,275 @@ class GraphValidator:
         except Exception as e:
             return {"error": f"Critical path analysis failed: {e}"}
 
-    def find_blocked_nodes(self, graph: nx.DiGraph) -> Dict[str, List[str]]:
-        """Find nodes that cannot execute due to failed dependencies"""
+    @staticmethod
+    def build_predecessor_index(graph: nx.DiGraph) -> Dict[str, Tuple[str, ...]]:
+        """Flat {node: (predecessor, ...)} view of the graph, reusable across find_blocked_nodes calls"""
+        return {node: tuple(preds) for node, preds in graph.pred.items()}
+
+    def _ancestors_cache(self, graph: nx.DiGraph, pred: Optional[Dict[str, Tuple[str, ...]]] = None) -> Dict[str, frozenset]:
+        """Ancestor set of every node from one topological sweep, memoized for the latest topology"""
+        key = self._topology_key(graph)
+        if self._ancestors is not None and self._ancestors[0] == key:
+            return self._ancestors[1]
+        
+        if pred is None:
+            pred = self.build_predecessor_index(graph)
+        ancestors: Dict[str, frozenset] = {}
+        
+        is_dag, topo_order = self._dag_and_topo(graph, key)
+        if is_dag:
+            # Each node's ancestors are its predecessors plus their ancestors
+            empty = frozenset()
+            for node_id in topo_order:
+                preds = pred[node_id]
+                ancestors[node_id] = frozenset(preds).union(*(ancestors[p] for p in preds)) if preds else empty
+        else:
+            # Cyclic graph: walk the flat predecessor index per node
+            for node_id in pred:
+                seen = set()
+                stack = list(pred[node_id])
+                while stack:
+                    ancestor = stack.pop()
+                    if ancestor not in seen:
+                        seen.add(ancestor)
+                        stack.extend(pred[ancestor])
+                seen.discard(node_id)  # a node on a cycle is not its own ancestor
+                ancestors[node_id] = frozenset(seen)
+        
+        self._ancestors = (key, ancestors)
+        return ancestors
+    
+    def _ancestor_masks(self, graph: nx.DiGraph, pred: Optional[Dict[str, Tuple[str, ...]]] = None) -> Tuple[List[str], Dict[str, int]]:
+        """Ancestor sets as int bitmasks (bit i = i-th node of the returned order), memoized like _ancestors_cache"""
+        key = self._topology_key(graph)
+        if self._ancestor_bits is not None and self._ancestor_bits[0] == key:
+            return self._ancestor_bits[1]
+        
+        if pred is None:
+            pred = self.build_predecessor_index(graph)
+        nodes = list(graph)
+        bit = {node_id: 1 << i for i, node_id in enumerate(nodes)}
+        masks: Dict[str, int] = {}
+        
+        is_dag, topo_order = self._dag_and_topo(graph, key)
+        if is_dag:
+            # One OR per edge: a predecessor's ancestors plus the predecessor itself
+            for node_id in topo_order:
+                mask = 0
+                for p in pred[node_id]:
+                    mask |= masks[p] | bit[p]
+                masks[node_id] = mask
+        else:
+            for node_id, ancestors in self._ancestors_cache(graph, pred).items():
+                mask = 0
+                for ancestor in ancestors:
+                    mask |= bit[ancestor]
+                masks[node_id] = mask
+        
+        self._ancestor_bits = (key, (nodes, masks))
+        return nodes, masks
+    
+    def find_blocked_nodes(self, graph: nx.DiGraph, pred: Optional[Dict[str, Tuple[str, ...]]] = None) -> Dict[str, List[str]]:
+        """Find nodes that cannot execute due to failed dependencies
+        
+        Args:
+            pred: Optional index from build_predecessor_index(); built here if omitted
+        """
+        status = {node_id: data.get('status', 'pending') for node_id, data in graph.nodes(data=True)}
         blocked_nodes = {}
         
-        for node_id in graph.nodes():
+        if len(status) <= BITMASK_MAX_NODES:
+            nodes, masks = self._ancestor_masks(graph, pred)
+            failed_mask = 0
+            for i, node_id in enumerate(nodes):
+                if status[node_id] == 'failed':
+                    failed_mask |= 1 << i
+            if not failed_mask:
+                return blocked_nodes
+            
+            for node_id in nodes:
+                if node_id == "ROOT" or status[node_id] in ('completed', 'running'):
+                    continue
+                hit = masks[node_id] & failed_mask
+                if hit:
+                    # Expand only the set bits of blocked nodes
+                    failed_ancestors = []
+                    while hit:
+                        low = hit & -hit
+                        failed_ancestors.append(nodes[low.bit_length() - 1])
+                        hit ^= low
+                    blocked_nodes[node_id] = failed_ancestors
+            return blocked_nodes
+        
+        ancestors_of = self._ancestors_cache(graph, pred)
+        for node_id in status:
             if node_id == "ROOT":
                 continue
                 
-            node_status = graph.nodes[node_id].get('status', 'pending')
-            if node_status in ['completed', 'running']:
+            if status[node_id] in ('completed', 'running'):
                 continue
             
-            # Check if any ancestor has failed
-            ancestors = nx.ancestors(graph, node_id)
             failed_ancestors = [
-                ancestor for ancestor in ancestors 
-                if graph.nodes[ancestor].get('status') == 'failed'
+                ancestor for ancestor in ancestors_of[node_id] 
+                if status[ancestor] == 'failed'
             ]
             
             if failed_ancestors:
                 blocked_nodes[node_id] = failed_ancestors
         
-        return blocked_nodes
\ No newline at end of file
+        return blocked_nodes
+    
+    def invalidate(self, graph: nx.DiGraph):
+        """Forget everything cached for `graph`.
+        
+        The topology caches compare full node/edge tuples and never return stale results; this just frees
+        them along with the state validate_incremental keeps for `graph`.
+        """
+        self._dag_cache = self._ancestors = self._ancestor_bits = None
+        self._incremental.pop(id(graph), None)
+    
+    def validate_incremental(self, graph: nx.DiGraph, changed_nodes: Set[str], verbose: bool = False) -> Dict[str, any]:
+        """Re-validate after edits to `changed_nodes`, reusing what the previous call learned about this graph.
+        
+        Attribute edits (agent, description, status, reads, writes) only re-index the changed nodes and
+        re-run cycle detection on the dependency components they reach. A first call, or any node/edge
+        change, falls back to a full validation (dropping the graph's cached topology). Blocked-node analysis needs nothing extra here: its
+        ancestor masks are keyed by topology and survive attribute edits.
+        
+        Returns the same dict as validate_execution_graph (dependency-cycle warnings may come in a different order).
+        """
+        state = self._incremental.get(id(graph))
+        if (state is None or state["graph_ref"]() is not graph or state["dep_error"] is not None
+                or not self._same_structure(graph, state, changed_nodes)):
+            state = self._track(graph)
+        else:
+            for node_id in changed_nodes:
+                if node_id != "ROOT":
+                    state["attr_warnings"][node_id] = self._missing_attrs_warning(node_id, graph._node[node_id])
+            try:
+                for node_id in changed_nodes:
+                    if node_id != "ROOT":
+                        self._index_dependencies(state, node_id, graph._node[node_id])
+                self._refresh_dependency_sccs(state, changed_nodes)
+            except TypeError:
+                state = self._track(graph)  # malformed reads/writes: let the full pass record it
+        
+        results = self._assemble_results(graph, state)
+        if verbose:
+            self._display_validation_results(results)
+        return results
+    
+    @staticmethod
+    def _same_structure(graph: nx.DiGraph, state: Dict[str, any], changed_nodes: Set[str]) -> bool:
+        """True if the node/edge counts and the changed nodes' neighbours match the tracked snapshot"""
+        if state["shape"] != (graph.number_of_nodes(), graph.number_of_edges()):
+            return False
+        adjacency = state["adjacency"]
+        for node_id in changed_nodes:
+            if node_id not in graph:
+                return False
+            if adjacency.get(node_id) != (tuple(graph._pred[node_id]), tuple(graph._succ[node_id])):
+                return False
+        return True
+    
+    def _track(self, graph: nx.DiGraph) -> Dict[str, any]:
+        """Full validation that also records the indexes validate_incremental updates"""
+        if not isinstance(graph, nx.DiGraph):
+            raise TypeError(f"Expected a networkx DiGraph, got {type(graph).__name__}")
+        
+        self.invalidate(graph)  # we only get here on a first call or after a structural edit
+        state = {
+            "graph_ref": weakref.ref(graph),
+            "shape": (graph.number_of_nodes(), graph.number_of_edges()),
+            "adjacency": {node_id: (tuple(preds), tuple(graph._succ[node_id])) for node_id, preds in graph._pred.items()},
+            "structure": self._validate_structure(graph),
+            "attr_warnings": {},           # node -> missing-attributes warning or None, in graph order
+            "reads": {},                   # node -> frozenset of keys
+            "writes": {},
+            "readers": defaultdict(set),   # key -> nodes reading it
+            "writers": defaultdict(set),   # key -> nodes writing it
+            "dep_sccs": {},                # frozenset(component) -> its dependency-cycle warnings
+            "dep_error": None,
+        }
+        
+        non_root = [(node_id, data) for node_id, data in graph.nodes(data=True) if node_id != "ROOT"]
+        for node_id, data in non_root:
+            state["attr_warnings"][node_id] = self._missing_attrs_warning(node_id, data)
+        try:
+            for node_id, data in non_root:
+                self._index_dependencies(state, node_id, data)
+            self._refresh_dependency_sccs(state, state["reads"].keys())
+        except (nx.NetworkXError, TypeError) as e:
+            state["dep_error"] = str(e)
+        
+        self._incremental[id(graph)] = state
+        return state
+    
+    @staticmethod
+    def _index_dependencies(state: Dict[str, any], node_id: str, node_data: Dict):
+        """(Re)index one node's reads/writes in the tracked reader/writer maps"""
+        reads = frozenset(node_data.get("reads", []))
+        writes = frozenset(node_data.get("writes", []))
+        
+        for key in state["reads"].get(node_id, ()):
+            state["readers"][key].discard(node_id)
+        for key in state["writes"].get(node_id, ()):
+            state["writers"][key].discard(node_id)
+        for key in reads:
+            state["readers"][key].add(node_id)
+        for key in writes:
+            state["writers"][key].add(node_id)
+        state["reads"][node_id] = reads
+        state["writes"][node_id] = writes
+    
+    def _refresh_dependency_sccs(self, state: Dict[str, any], changed_nodes):
+        """Recompute the dependency-cycle components that edits to `changed_nodes` can affect.
+        
+        A new cycle must use an edge touching a changed node, and a broken one was in a component holding
+        one, so only those components and whatever the changed nodes reach need another Tarjan pass.
+        """
+        sccs = state["dep_sccs"]
+        stale = [scc for scc in sccs if not scc.isdisjoint(changed_nodes)]
+        roots = set(changed_nodes).union(*stale)
+        for scc in stale:
+            del sccs[scc]
+        
+        # Writer -> reader adjacency, built only for what the roots reach
+        writes, readers = state["writes"], state["readers"]
+        adj: Dict[str, Set[str]] = {}
+        frontier = [node_id for node_id in roots if node_id in writes]
+        while frontier:
+            node_id = frontier.pop()
+            if node_id in adj:
+                continue
+            successors = set()
+            for key in writes[node_id]:
+                successors |= readers.get(key, set())
+            successors.discard(node_id)
+            adj[node_id] = successors
+            frontier.extend(successors)
+        
+        for scc in self._nontrivial_sccs(adj):
+            scc = frozenset(scc)
+            if scc in sccs:
+                continue  # untouched component reached from a changed node
+            for merged in [other for other in sccs if not other.isdisjoint(scc)]:
+                del sccs[merged]
+            sccs[scc] = self._scc_cycle_issues(scc, adj)
+    
+    @staticmethod
+    def _assemble_results(graph: nx.DiGraph, state: Dict[str, any]) -> Dict[str, any]:
+        results = {key: list(value) if isinstance(value, list) else value
+                   for key, value in state["structure"].items()}
+        
+        if "ROOT" not in graph:
+            results["errors"].append("Missing ROOT node")
+            results["is_valid"] = False
+        
+        results["warnings"].extend(warning for warning in state["attr_warnings"].values() if warning)
+        if state["dep_error"] is not None:
+            results["warnings"].append(f"Dependency analysis failed: {state['dep_error']}")
+        else:
+            for issues in state["dep_sccs"].values():
+                results["warnings"].extend(issues)
+        return results
@@ -9,10 +9,15 @@ from datetime import datetime
 import sys
 import os
 from html import unescape
+from urllib.parse import urljoin, urlsplit
 import asyncio
-import aiohttp
-from typing import List, Dict, Optional, Any
+import httpx
+from collections import OrderedDict, defaultdict
+from typing import List, Dict, Optional, Any, Tuple
 import time
+import atexit
+import mmap
+import threading
 
 # Fix imports for standalone usage
 if __name__ == "__main__":
@@ -24,9 +29,186 @@ try:
 except ImportError:
     # If we're running standalone and still can't import, define a minimal stub
     ExecutionContextManager = None
+from agentLoop.session_serializer import SessionSerializer
+from utils.utils import install_uvloop
+
+# Same libuv-backed event loop as agentLoop.flow (this module also runs standalone)
+install_uvloop()
+
+# One background thread owns the event loop used by ImageValidator.validate_images_sync, so the
+# validator's HTTP client (and its keep-alive connections) survives between sync calls
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_THREAD: Optional[threading.Thread] = None
+_LOOP_LOCK = threading.Lock()
+# Process-wide validator (see _shared_image_validator); its client is closed on that loop at exit
+_IMAGE_VALIDATOR: Optional["ImageValidator"] = None
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    """Start the shared validation loop thread on first use"""
+    global _LOOP, _LOOP_THREAD
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()  # uvloop under the policy above
+            _LOOP_THREAD = threading.Thread(target=_LOOP.run_forever, name="image-validator-loop", daemon=True)
+            _LOOP_THREAD.start()
+        return _LOOP
+
+@atexit.register
+def _stop_loop():
+    if _LOOP is not None and _LOOP.is_running():
+        if _IMAGE_VALIDATOR is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(_IMAGE_VALIDATOR.aclose(), _LOOP).result(timeout=1)
+            except Exception:
+                pass
+        _LOOP.call_soon_threadsafe(_LOOP.stop)
+        _LOOP_THREAD.join(timeout=1)
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+# Image URLs anywhere in serialized session data
+_IMAGE_URL_RE = re.compile(r'https?://[^\s\'"<>\\]+\.(?:jpg|jpeg|png|webp|gif)(?:\?[^\s\'"<>\\]*)?', re.IGNORECASE)
+
+# Metadata near an image URL; each tuple is tried in order and the first pattern that matches wins
+_CONFIDENCE_RES = (
+    re.compile(r"['\"]confidence['\"]:\s*([0-9.]+)"),
+    re.compile(r"confidence['\"]:\s*([0-9.]+)"),
+)
+_WIDTH_RES = (
+    re.compile(r"['\"]width['\"]:\s*['\"]?(\d+)['\"]?"),
+    re.compile(r"width['\"]:\s*['\"]?(\d+)['\"]?"),
+)
+_HEIGHT_RES = (
+    re.compile(r"['\"]height['\"]:\s*['\"]?(\d+)['\"]?"),
+    re.compile(r"height['\"]:\s*['\"]?(\d+)['\"]?"),
+)
+_ALT_RES = (
+    re.compile(r"['\"]alt_text['\"]:\s*['\"]([^'\"]+)['\"]"),
+    re.compile(r"['\"]alt['\"]:\s*['\"]([^'\"]+)['\"]"),
+    re.compile(r"alt_text['\"]:\s*['\"]([^'\"]+)"),
+    re.compile(r"alt['\"]:\s*['\"]([^'\"]+)"),
+)
+
+# Social-media keywords (matched against lowercased text), each list fused into one alternation
+_SOCIAL_URL_RE = re.compile('|'.join(map(re.escape, [
+    'facebook', 'twitter', 'instagram', 'linkedin', 'youtube', 
+    'whatsapp', 'telegram', 'email', 'share', 'social',
+    'icon', 'logo', 'btn', 'button', 'arrow'
+])))
+_SOCIAL_ALT_RE = re.compile('|'.join(map(re.escape, [
+    'share on', 'facebook', 'twitter', 'instagram', 'linkedin',
+    'whatsapp', 'email', 'social', 'follow us', 'like us',
+    'subscribe', 'icon', 'logo', 'button'
+])))
+
+# Low-quality image URL patterns, fused into one alternation
+_LOW_QUALITY_RE = re.compile('|'.join([
+    r'/icon[s]?/',           # Icon directories
+    r'/button[s]?/',         # Button directories
+    r'/social/',             # Social media directories
+    r'/share/',              # Share button directories
+    r'/arrow[s]?/',          # Arrow images
+    r'/bg[_-]',              # Background images
+    r'/banner[s]?/',         # Banner directories
+    r'/ad[s]?/',             # Advertisement directories
+    r'_icon\.',              # Files ending with _icon
+    r'_btn\.',               # Files ending with _btn
+    r'_arrow\.',             # Files ending with _arrow
+    r'_logo\.',              # Files ending with _logo
+    r'pixel\.', r'spacer\.', # Spacer/pixel images
+    r'blank\.', r'empty\.',  # Blank/empty images
+]), re.IGNORECASE)
+
+# Any of these tag openings within the first 100 non-blank characters marks a string as HTML (bare prefixes: '<p' also matches '<pre')
+_HTML_INDICATOR_RE = re.compile(r'<(?:html|div|section|article|header|main|body|!doctype|h1|h2|p)', re.IGNORECASE)
+_NON_SPACE_RE = re.compile(r'\S')
+
+# FormatterAgent markup stripped by _create_proper_html, in the order it is applied.
+# <style> blocks, class= and style= attributes are independent deletions, so one pass removes all three
+# (scoped flags keep the attribute patterns case-sensitive, as they were as separate passes).
+_FORMATTER_MARKUP_RE = re.compile(
+    r'(?is:<style[^>]*>.*?</style>)'
+    r'|\s+class=["\'][^"\']*["\']'
+    r'|\s+style=["\'][^"\']*["\']'
+)
+_TOC_NAV_DIV_RE = re.compile(r'<div[^>]*(?:section-toc|navigation)[^>]*>.*?</div>', re.DOTALL | re.IGNORECASE)
+_LEADING_DIV_RE = re.compile(r'<div[^>]*>')
+# Runs after the wrapper div is unwrapped, and after <style> removal, which can leave tags empty
+_EMPTY_TAG_RE = re.compile(r'<(div|span)[^>]*></\1>')
+_IMG_STYLE_WIDTH_RE = re.compile(r'<img([^>]*)\s+style=["\'][^"\']*width[^"\']*["\']([^>]*)>')
+_IMG_STYLE_HEIGHT_RE = re.compile(r'<img([^>]*)\s+style=["\'][^"\']*height[^"\']*["\']([^>]*)>')
+
+# Report layout: first H1, first H1/H2 (carousel anchor), title text, any tag, inline image sources
+_H1_RE = re.compile(r'(<h1[^>]*>.*?</h1>)', re.IGNORECASE | re.DOTALL)
+_HEADING_RE = re.compile(r'(<h[12][^>]*>.*?</h[12]>)', re.IGNORECASE)
+_TITLE_H1_RE = re.compile(r'<h1[^>]*>(.*?)</h1>')
+_TAG_RE = re.compile(r'<[^>]+>')
+_INLINE_IMG_RE = re.compile(r'<img[^>]+src=["\']([^"\']+)["\'][^>]*>', re.IGNORECASE)
+
+# Emoji code point ranges hidden by default in reports: sorted, merged, inclusive.
+# Both the Python regex and the page's toggleEmojis character class are generated from this table.
+_EMOJI_RANGES = (
+    (0x2100, 0x214F),    # letterlike symbols
+    (0x2600, 0x27BF),    # miscellaneous symbols, dingbats
+    (0x1F000, 0x1F02F),  # mahjong tiles
+    (0x1F0A0, 0x1F0FF),  # playing cards
+    (0x1F100, 0x1F9FF),  # enclosed alphanumerics through supplemental symbols and pictographs
+)
+_EMOJI_RE = re.compile('[' + ''.join(f'{chr(lo)}-{chr(hi)}' for lo, hi in _EMOJI_RANGES) + ']')
+_EMOJI_JS_CLASS = '[' + ''.join(f'\\u{{{lo:X}}}-\\u{{{hi:X}}}' for lo, hi in _EMOJI_RANGES) + ']'
+
+def _iter_str_fields(output):
+    """(label, value) for every field of an agent output, then of its nested 'output' dict as 'output.<key>'"""
+    for key, value in output.items():
+        yield key, value
+    nested = output.get('output')
+    if isinstance(nested, dict):
+        for key, value in nested.items():
+            yield f"output.{key}", value
+
+def _first_html_field(output):
+    """First (label, value) of an agent output whose value looks like HTML, else None"""
+    return next(((label, value) for label, value in _iter_str_fields(output)
+                 if _looks_like_html_content_standalone(value)), None)
+
+def _first_group(patterns, text):
+    """First capture of the first pattern in `patterns` that matches `text`, else None"""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match.group(1)
+    return None
+
+_LEADING_NUMBER_RE = re.compile(r"\s*([0-9]+(?:\.[0-9]*)?)")
+
+def _leading_number(value) -> Optional[float]:
+    """Numeric metadata value (0.9, 800, "800", "800px"), or None if it has no leading number"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = _LEADING_NUMBER_RE.match(value)
+        if match:
+            return float(match.group(1))
+    return None
+
+# Statuses ImageValidator.check_image_exists follows (once) via the Location header
+_REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
 
 class ImageValidator:
-    """Fast and safe image URL validation using async HTTP HEAD requests"""
+    """Fast and safe image URL validation using async one-byte ranged GETs (under uvloop when installed)"""
+    
+    # Per-URL result cache: answered checks (including 404s) are reused for CACHE_TTL seconds
+    CACHE_MAXSIZE = 4096
+    CACHE_TTL = 600
+    # Hosts that timed out or refused the connection are skipped for BAD_HOST_TTL seconds
+    BAD_HOST_TTL = 3600
     
     def __init__(self, timeout: int = 3, max_concurrent: int = 15):
         self.timeout = timeout
@@ -38,108 +220,660 @@ class ImageValidator:
             'Cache-Control': 'no-cache',
             'Pragma': 'no-cache'
         }
+        # Long-lived client (keep-alive, HTTP/2 multiplexing when available), created lazily on the loop that uses it
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # url -> (expiry, result), least recently used first
+        self._cache: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        # host -> expiry
+        self._bad_hosts: Dict[str, float] = {}
+    
+    def _cache_get(self, url: str) -> Optional[Dict]:
+        entry = self._cache.get(url)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._cache[url]
+            return None
+        self._cache.move_to_end(url)
+        return entry[1]
+    
+    def _cache_put(self, url: str, result: Dict):
+        # Only cache what the server actually answered; timeouts and connection errors may be transient
+        if not result.get('status'):
+            return
+        self._cache[url] = (time.monotonic() + self.CACHE_TTL, result)
+        self._cache.move_to_end(url)
+        if len(self._cache) > self.CACHE_MAXSIZE:
+            self._cache.popitem(last=False)
     
-    async def check_image_exists(self, session: aiohttp.ClientSession, url: str) -> Dict:
-        """Check if a single image URL exists and is accessible"""
+    def _mark_bad_host(self, url: str):
+        host = urlsplit(url).netloc
+        if host:
+            self._bad_hosts[host] = time.monotonic() + self.BAD_HOST_TTL
+    
+    def _bad_host_result(self, url: str) -> Optional[Dict]:
+        """Short-circuit result for a URL on a host that recently failed, else None"""
+        host = urlsplit(url).netloc
+        expiry = self._bad_hosts.get(host)
+        if expiry is None:
+            return None
+        if expiry < time.monotonic():
+            del self._bad_hosts[host]
+            return None
+        return {'url': url, 'exists': False, 'error': 'cached_bad_host', 'status': 0}
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared client, created on first use (or again if the last one was closed or belongs to another loop)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=HAS_HTTP2,
+                limits=httpx.Limits(max_connections=self.max_concurrent, max_keepalive_connections=20),
+                timeout=httpx.Timeout(self.timeout, connect=1),
+                headers=self.headers,
+                follow_redirects=False  # check_image_exists follows at most one hop itself
+            )
+            self._client_loop = loop
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared client (a later batch opens a new one)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+    
+    async def check_image_exists(self, url: str) -> Dict:
+        """Check if a single image URL exists and is accessible.
+        
+        Uses a one-byte ranged GET rather than HEAD: many CDNs reject HEAD (403/405) but serve GET,
+        and the body is never downloaded. A redirect is followed once; a second one counts as a failure,
+        which bounds a check at two round-trips.
+        """
+        target = url
         try:
-            async with session.head(
-                url, 
-                timeout=aiohttp.ClientTimeout(total=self.timeout),
-                allow_redirects=True
-            ) as response:
-                content_type = response.headers.get('content-type', '').lower()
-                is_image = any(img_type in content_type for img_type in ['image/', 'jpeg', 'png', 'gif', 'webp'])
-                
-                return {
-                    'url': url,
-                    'exists': response.status == 200,
-                    'status': response.status,
-                    'content_type': content_type,
-                    'is_image': is_image,
-                    'size': response.headers.get('content-length', 0),
-                    'error': None
-                }
-        except asyncio.TimeoutError:
+            for _ in range(2):
+                async with self._get_client().stream("GET", target, headers={'Range': 'bytes=0-0'}) as response:
+                    location = response.headers.get('location')
+                    if response.status_code in _REDIRECT_STATUSES and location:
+                        target = urljoin(target, location)
+                        continue
+                    return await self._check_result(url, response)
+            return {'url': url, 'exists': False, 'error': 'too_many_redirects', 'status': response.status_code}
+        except httpx.TimeoutException:
+            self._mark_bad_host(target)
             return {'url': url, 'exists': False, 'error': 'timeout', 'status': 0}
-        except aiohttp.ClientError as e:
+        except httpx.ConnectError as e:
+            self._mark_bad_host(target)
+            return {'url': url, 'exists': False, 'error': f'client_error: {str(e)}', 'status': 0}
+        except httpx.HTTPError as e:
+            # Protocol errors, malformed URLs etc. say nothing about the rest of the host
             return {'url': url, 'exists': False, 'error': f'client_error: {str(e)}', 'status': 0}
         except Exception as e:
             return {'url': url, 'exists': False, 'error': f'unknown: {str(e)}', 'status': 0}
     
+    @staticmethod
+    async def _check_result(url: str, response: httpx.Response) -> Dict:
+        """Result dict for the final (non-redirect) response to a ranged GET of `url`"""
+        content_type = response.headers.get('content-type', '').lower()
+        is_image = content_type.startswith('image/') or (
+            'jpeg' in content_type or 'png' in content_type or 'gif' in content_type or 'webp' in content_type
+        )
+        # 206 carries the full size after the slash: "bytes 0-0/12345"
+        content_range = response.headers.get('content-range', '')
+        size = content_range.rpartition('/')[2] if '/' in content_range else response.headers.get('content-length', 0)
+        if response.status_code == 206:
+            await response.aread()  # the single byte, so the connection can be reused
+        # Anything else (e.g. a server ignoring Range) is closed unread
+        
+        return {
+            'url': url,
+            'exists': response.status_code in (200, 206),
+            'status': response.status_code,
+            'content_type': content_type,
+            'is_image': is_image,
+            'size': size,
+            'error': None
+        }
+    
+    @staticmethod
+    def is_valid(result: Dict) -> bool:
+        """Whether a check result counts as a usable image"""
+        return bool(result.get('exists', False) and result.get('is_image', True))
+    
+    async def _check_cached(self, url: str) -> Dict:
+        result = self._cache_get(url) or self._bad_host_result(url)
+        if result is None:
+            result = await self.check_image_exists(url)
+            self._cache_put(url, result)
+        return result
+    
+    async def _pipeline(self, queue: asyncio.Queue, fed: asyncio.Event, want: int) -> Tuple[Optional[int], Dict[int, Dict]]:
+        """Validate (index, url) items from `queue` with max_concurrent workers.
+        
+        Stops as soon as the leading run of finished items holds `want` valid images, and returns
+        (length of that run, results by index); the length is None if the queue ran dry first.
+        """
+        results: Dict[int, Dict] = {}
+        prefix = valid = 0
+        enough = asyncio.Event()
+        
+        async def worker():
+            nonlocal prefix, valid
+            while not enough.is_set():
+                item = await queue.get()
+                if item is None:
+                    return
+                index, url = item
+                results[index] = await self._check_cached(url)
+                while prefix in results:
+                    valid += self.is_valid(results[prefix])
+                    prefix += 1
+                if valid >= want:
+                    enough.set()
+        
+        workers = asyncio.gather(*(worker() for _ in range(self.max_concurrent)))
+        enough_wait = asyncio.ensure_future(enough.wait())
+        fed_wait = asyncio.ensure_future(fed.wait())
+        try:
+            await asyncio.wait({workers, enough_wait, fed_wait}, return_when=asyncio.FIRST_COMPLETED)
+            if not enough.is_set() and not workers.done():
+                # Everything is queued: give the stragglers the usual batch allowance
+                await asyncio.wait({workers, enough_wait}, timeout=self.timeout * 2,
+                                   return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (workers, enough_wait, fed_wait):
+                task.cancel()
+            await asyncio.gather(workers, enough_wait, fed_wait, return_exceptions=True)
+        return (prefix if enough.is_set() else None), results
+    
+    def validate_stream(self, items, key, want: int) -> List[Tuple[Any, Dict]]:
+        """Validate items as the (possibly lazy) iterable produces them, on the shared validation loop.
+        
+        Returns (item, result) pairs in input order, stopping after the shortest leading run that
+        contains `want` valid images (or covering every item if there are not that many).
+        """
+        loop = _ensure_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        fed = asyncio.Event()
+        future = asyncio.run_coroutine_threadsafe(self._pipeline(queue, fed, want), loop)
+        
+        fed_items = []
+        try:
+            for item in items:
+                if future.done():
+                    break  # enough valid images already
+                loop.call_soon_threadsafe(queue.put_nowait, (len(fed_items), key(item)))
+                fed_items.append(item)
+            for _ in range(self.max_concurrent):
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+            loop.call_soon_threadsafe(fed.set)
+            prefix, results = future.result(timeout=self.timeout * 3)
+        except Exception:
+            future.cancel()
+            raise
+        
+        if prefix is not None:
+            fed_items = fed_items[:prefix]
+        timed_out = {'exists': False, 'error': 'batch_timeout', 'status': 0}
+        return [(item, results.get(i) or {'url': key(item), **timed_out}) for i, item in enumerate(fed_items)]
+    
     async def validate_images_batch(self, urls: List[str]) -> List[Dict]:
         """Validate multiple image URLs concurrently"""
         if not urls:
             return []
         
-        connector = aiohttp.TCPConnector(
-            limit=self.max_concurrent, 
-            limit_per_host=5,
-            ttl_dns_cache=300,
-            use_dns_cache=True
-        )
-        
-        timeout = aiohttp.ClientTimeout(total=self.timeout, connect=1)
-        
-        try:
-            async with aiohttp.ClientSession(
-                connector=connector, 
-                timeout=timeout,
-                headers=self.headers
-            ) as session:
-                # Create tasks for all URLs
-                tasks = [self.check_image_exists(session, url) for url in urls]
-                
+        # Serve recently checked URLs and known-bad hosts from memory; fetch each remaining URL once
+        known = {}
+        for url in urls:
+            if url not in known:
+                cached = self._cache_get(url) or self._bad_host_result(url)
+                if cached is not None:
+                    known[url] = cached
+        to_fetch = [url for url in dict.fromkeys(urls) if url not in known]
+        
+        if to_fetch:
+            # Only max_concurrent checks are in flight at once; the rest wait on the semaphore
+            # instead of all queueing inside the connection pool
+            sem = asyncio.Semaphore(self.max_concurrent)
+            
+            async def _bounded(url: str) -> Dict:
+                async with sem:
+                    return await self.check_image_exists(url)
+            
+            try:
                 # Execute with timeout for the entire batch
                 results = await asyncio.wait_for(
-                    asyncio.gather(*tasks, return_exceptions=True),
+                    asyncio.gather(*(_bounded(url) for url in to_fetch), return_exceptions=True),
                     timeout=self.timeout * 2  # Give extra time for batch
                 )
-                
-                # Process results and handle exceptions
-                processed_results = []
-                for i, result in enumerate(results):
-                    if isinstance(result, Exception):
-                        processed_results.append({
-                            'url': urls[i] if i < len(urls) else 'unknown',
-                            'exists': False, 
-                            'error': f'exception: {str(result)}',
-                            'status': 0
-                        })
-                    else:
-                        processed_results.append(result)
-                
-                return processed_results
-                
-        except asyncio.TimeoutError:
-            return [{'url': url, 'exists': False, 'error': 'batch_timeout', 'status': 0} for url in urls]
-        except Exception as e:
-            return [{'url': url, 'exists': False, 'error': f'batch_error: {str(e)}', 'status': 0} for url in urls]
+                    
+            except asyncio.TimeoutError:
+                results = [{'url': url, 'exists': False, 'error': 'batch_timeout', 'status': 0} for url in to_fetch]
+            except Exception as e:
+                results = [{'url': url, 'exists': False, 'error': f'batch_error: {str(e)}', 'status': 0} for url in to_fetch]
+            
+            # Process results and handle exceptions
+            for url, result in zip(to_fetch, results):
+                if isinstance(result, Exception):
+                    result = {
+                        'url': url,
+                        'exists': False, 
+                        'error': f'exception: {str(result)}',
+                        'status': 0
+                    }
+                else:
+                    self._cache_put(url, result)
+                known[url] = result
+        
+        # Input order (and duplicates) preserved
+        return [known[url] for url in urls]
     
     def validate_images_sync(self, urls: List[str]) -> List[Dict]:
-        """Synchronous wrapper for async validation"""
+        """Synchronous wrapper for async validation (runs on the shared validation loop thread)"""
         if not urls:
             return []
         
         try:
-            # Handle event loop issues
+            future = asyncio.run_coroutine_threadsafe(self.validate_images_batch(urls), _ensure_loop())
             try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # If there's already a running loop, we need to use a different approach
-                    import concurrent.futures
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(asyncio.run, self.validate_images_batch(urls))
-                        return future.result(timeout=self.timeout * 3)
-                else:
-                    return loop.run_until_complete(self.validate_images_batch(urls))
-            except RuntimeError:
-                # No event loop, create new one
-                return asyncio.run(self.validate_images_batch(urls))
+                return future.result(timeout=self.timeout * 3)
+            except Exception:
+                future.cancel()
+                raise
                 
         except Exception as e:
             print(f"⚠️  Image validation failed: {e}")
             return [{'url': url, 'exists': False, 'error': f'sync_wrapper: {str(e)}', 'status': 0} for url in urls]
 
+def _shared_image_validator() -> ImageValidator:
+    """The ImageValidator every OutputAnalyzer uses, so one HTTP client and one set of caches serve all reports"""
+    global _IMAGE_VALIDATOR
+    with _LOOP_LOCK:
+        if _IMAGE_VALIDATOR is None:
+            _IMAGE_VALIDATOR = ImageValidator()
+        return _IMAGE_VALIDATOR
+
+# Rich markup for the status column of the results table; other statuses are shown as-is
+_STATUS_FMT = {
+    'completed': "[green]✅ completed[/green]",
+    'failed': "[red]❌ failed[/red]",
+}
+
+# Static stylesheet for the image carousel, embedded in every generated report
+_CAROUSEL_CSS = """
+        /* Image Carousel Styles */
+        .image-carousel {
+            margin: 2rem 0;
+        }
+        
+        .carousel-container {
+            position: relative;
+            max-width: 100%;
+            margin: auto;
+        }
+        
+        .carousel-slides {
+            display: flex;
+            overflow: hidden;
+            width: 100%;
+        }
+        
+        .carousel-slide {
+            min-width: 100%;
+            display: none;
+            flex-direction: column;
+            align-items: center;
+        }
+        
+        .carousel-slide.active {
+            display: flex;
+        }
+        
+        .carousel-slide img {
+            width: 100%;
+            max-height: 500px;
+            object-fit: contain;
+            border-radius: 4px;
+        }
+        
+        .carousel-caption {
+            text-align: center;
+            margin-top: 1rem;
+            max-width: 600px;
+        }
+        
+        .carousel-caption p {
+            margin: 0.5rem 0;
+            font-weight: 500;
+        }
+        
+        .carousel-caption small {
+            color: #666;
+            font-size: 0.8rem;
+        }
+        html.dark .carousel-caption small, body.dark .carousel-caption small {
+            color: #aaa;
+        }
+        
+        .carousel-btn {
+            position: absolute;
+            top: 45%;
+            transform: translateY(-50%);
+            background: rgba(0,0,0,0.6);
+            color: white;
+            border: none;
+            padding: 0.8rem 1rem;
+            cursor: pointer;
+            font-size: 0.5rem;
+            border-radius: 4px;
+            transition: all 0.3s ease;
+            z-index: 10;
+            opacity: 0.7;
+        }
+        
+        .carousel-btn:hover {
+            background: rgba(0,0,0,0.9);
+            opacity: 1;
+            transform: translateY(-50%) scale(1.1);
+        }
+        
+        .carousel-btn.prev {
+            left: 0;
+        }
+        
+        .carousel-btn.next {
+            right: 0;
+        }
+        
+        .carousel-dots {
+            text-align: center;
+            padding: 1rem 0;
+        }
+        
+        .carousel-dot {
+            height: 8px;
+            width: 8px;
+            margin: 0 4px;
+            background-color: #ccc;
+            border-radius: 50%;
+            display: inline-block;
+            cursor: pointer;
+            border: none;
+            transition: all 0.3s ease;
+        }
+        
+        .carousel-dot.active, .carousel-dot:hover {
+            background-color: #333;
+            transform: scale(1.2);
+        }
+        html.dark .carousel-dot {
+            background-color: #666;
+        }
+        html.dark .carousel-dot.active, body.dark .carousel-dot.active,
+        html.dark .carousel-dot:hover, body.dark .carousel-dot:hover {
+            background-color: #ccc;
+        }
+        """
+
+# Carousel script, included in reports that have a carousel
+_CAROUSEL_JS = """
+        // Image Carousel JavaScript
+        let currentSlideIndex = 0;
+        let slides = [];
+        let dots = [];
+        
+        function initializeCarousel() {
+            slides = document.querySelectorAll('.carousel-slide');
+            dots = document.querySelectorAll('.carousel-dot');
+            currentSlideIndex = 0;
+            
+            if (slides.length > 0) {
+                showSlide(0);
+            }
+        }
+        
+        function showSlide(index) {
+            // Hide all slides
+            slides.forEach(slide => slide.classList.remove('active'));
+            dots.forEach(dot => dot.classList.remove('active'));
+            
+            // Show selected slide
+            if (slides[index]) {
+                slides[index].classList.add('active');
+                if (dots[index]) {
+                    dots[index].classList.add('active');
+                }
+            }
+        }
+        
+        function changeSlide(direction) {
+            if (slides.length === 0) return;
+            
+            currentSlideIndex += direction;
+            if (currentSlideIndex >= slides.length) currentSlideIndex = 0;
+            if (currentSlideIndex < 0) currentSlideIndex = slides.length - 1;
+            showSlide(currentSlideIndex);
+        }
+        
+        function currentSlide(index) {
+            if (slides.length === 0) return;
+            
+            currentSlideIndex = index - 1;
+            showSlide(currentSlideIndex);
+        }
+        
+        // Initialize carousel when page loads
+        document.addEventListener('DOMContentLoaded', function() {
+            initializeCarousel();
+        });
+        
+        // Re-initialize if content changes (for emoji toggle)
+        window.addEventListener('load', function() {
+            setTimeout(initializeCarousel, 100);
+        });
+        """
+
+# Styling for images inside the report body, included in every report
+_CONTENT_IMAGE_CSS = """
+        /* Content Images Styling */
+        .container img:not(.carousel-slide img) {
+            max-width: 100%;
+            height: auto;
+            display: block;
+            margin: 1.5rem auto;
+            border-radius: 4px;
+            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
+        }
+        html.dark .container img:not(.carousel-slide img), 
+        body.dark .container img:not(.carousel-slide img) {
+            box-shadow: 0 2px 8px rgba(255,255,255,0.1);
+        }
+        
+        /* Remove any remaining inline width/height styles */
+        .container img[style*="width"] {
+            width: auto !important;
+            max-width: 100% !important;
+        }
+        .container img[style*="height"] {
+            height: auto !important;
+        }
+        """
+
+# Report page around the per-report values, which _create_proper_html joins in between:
+# title, CSS, emoji-stripped container, original container JSON, carousel script
+_REPORT_PARTS = (
+    """<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+  <title>""",
+    """</title>
+  <style>
+    /* Base styles */
+    :root {
+      --bg-light: #ffffff;
+      --bg-dark: #0a0a0a;
+      --text-light: #111111;
+      --text-dark: #f1f1f1;
+      --border-light: #000000;
+      --border-dark: #ffffff;
+      --font-sans: 'Inter', 'San Francisco', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+      --font-serif: 'EB Garamond', 'New York', 'Georgia', serif;
+    }
+
+    html, body {
+      margin: 0;
+      padding: 0;
+      font-family: var(--font-sans);
+      font-size: 18px;
+      background-color: var(--bg-light);
+      color: var(--text-light);
+      line-height: 1.75;
+      transition: background 0.3s, color 0.3s, font-family 0.3s;
+    }
+    
+    html.dark, body.dark {
+      background-color: var(--bg-dark);
+      color: var(--text-dark);
+    }
+
+    .container {
+      max-width: 900px;
+      margin: 60px auto;
+      padding: 0 20px;
+      background-color: var(--bg-light);
+      transition: background-color 0.3s;
+    }
+    html.dark .container, body.dark .container {
+      background-color: var(--bg-dark);
+    }
+
+    h1, h2, h3, h4, h5, h6 {
+      font-weight: 600;
+      margin-top: 2.5em;
+      margin-bottom: 0.8em;
+      line-height: 1.3;
+    }
+
+    h1 {
+      font-size: 2.2rem;
+      border-bottom: 0.5px solid var(--border-light);
+      padding-bottom: 0.2em;
+    }
+    html.dark h1, body.dark h1 {
+      border-color: var(--border-dark);
+    }
+
+    h2 {
+      font-size: 1.5rem;
+    }
+
+    ul, ol {
+      padding-left: 1.5rem;
+      margin: 1rem 0;
+    }
+
+    p {
+      margin-bottom: 1rem;
+    }
+
+    .controls {
+      position: fixed;
+      top: 12px;
+      right: 16px;
+      display: flex;
+      gap: 14px;
+      font-size: 0.9rem;
+      z-index: 999;
+    }
+
+    .controls button {
+      all: unset;
+      cursor: pointer;
+      padding: 2px 6px;
+      background: rgba(255, 255, 255, 0.05);
+      border-radius: 4px;
+      font-weight: 500;
+      color: inherit;
+      opacity: 0.6;
+      transition: opacity 0.3s, background-color 0.3s;
+    }
+    .controls button:hover {
+      opacity: 1;
+    }
+    html.dark .controls button, body.dark .controls button {
+      background: rgba(255, 255, 255, 0.1);
+    }
+
+    .footer {
+      font-size: 0.55rem;
+      text-align: center;
+      margin-top: 2rem;
+      color: #aaa;
+    }
+
+    @media print {
+      .controls { display: none; }
+    }
+
+    """,
+    """
+  </style>
+</head>
+<body>
+  <div class="controls">
+    <button onclick="toggleDark()">Th</button>
+    <button onclick="toggleFont()">Aa</button>
+    <button onclick="toggleEmojis()">Em</button>
+  </div>
+  <div class="container" id="main-container">""",
+    """</div>
+  <script type="application/json" id="original-content">""",
+    """</script>
+  <script>
+    let emojisHidden = true; /* Emojis are stripped when the report is generated */
+    let originalContent = null;
+    const emojiRegex = /""" + _EMOJI_JS_CLASS + """/gu;
+
+    function toggleDark() {
+      /* Toggle dark class on BOTH html and body elements */
+      document.documentElement.classList.toggle('dark');
+      document.body.classList.toggle('dark');
+    }
+
+    function toggleFont() {
+      const current = getComputedStyle(document.body).fontFamily;
+      const isSerif = current.includes("Georgia");
+      document.body.style.fontFamily = isSerif ? 'var(--font-sans)' : 'var(--font-serif)';
+    }
+
+    function toggleEmojis() {
+      const container = document.getElementById('main-container');
+      
+      if (emojisHidden) {
+        /* Restore original content (show emojis), kept as JSON by the generator */
+        if (originalContent === null) {
+          originalContent = JSON.parse(document.getElementById('original-content').textContent);
+        }
+        container.innerHTML = originalContent;
+        emojisHidden = false;
+      } else {
+        /* Remove emojis from the current content */
+        container.innerHTML = container.innerHTML.replace(emojiRegex, '');
+        emojisHidden = true;
+      }
+    }
+
+    """,
+    """
+  </script>
+</body>
+</html>""",
+)
+
 class OutputAnalyzer:
     def __init__(self, context: Any = None, validate_images: bool = True):
         """Work directly with NetworkX graph - no intermediate processing"""
@@ -147,7 +881,20 @@ class OutputAnalyzer:
         self.graph = getattr(context, 'plan_graph', None) if context else None
         self.console = Console()
         self.validate_images = validate_images
-        self.image_validator = ImageValidator() if validate_images else None
+        self.image_validator = _shared_image_validator() if validate_images else None
+        # Built on first lookup: agent name -> node ids, in graph order
+        self._nodes_by_agent: Optional[Dict[str, List[str]]] = None
+        self._cached_html: Optional[str] = None
+    
+    def _nodes_for_agent(self, agent: str) -> List[str]:
+        """Node ids run by `agent`, from a one-pass index of the graph"""
+        if self._nodes_by_agent is None:
+            index = defaultdict(list)
+            for node_id, node_data in self.graph.nodes(data=True):
+                if node_id != "ROOT":
+                    index[node_data.get('agent')].append(node_id)
+            self._nodes_by_agent = dict(index)
+        return self._nodes_by_agent.get(agent, [])
     
     def show_results(self):
         """Display comprehensive results analysis directly from NetworkX graph"""
@@ -177,10 +924,10 @@ class OutputAnalyzer:
         table.add_column("Raw Output Keys")
         
         if self.graph:
-            for node_id in self.graph.nodes:
+            rows = []
+            for node_id, node_data in self.graph.nodes(data=True):
                 if node_id == "ROOT":
                     continue
-                node_data = self.graph.nodes[node_id]
                 keys: List[str] = []
                 output = node_data.get('output')
                 if isinstance(output, dict):
@@ -192,18 +939,14 @@ class OutputAnalyzer:
                 elif output is not None:
                     keys = ['raw_text']
                 status_val = node_data.get('status', 'unknown')
-                if status_val == 'completed':
-                    status_fmt = f"[green]✅ {status_val}[/green]"
-                elif status_val == 'failed':
-                    status_fmt = f"[red]❌ {status_val}[/red]"
-                else:
-                    status_fmt = status_val
-                table.add_row(
+                rows.append((
                     node_id,
                     node_data.get('agent', 'Unknown'),
-                    status_fmt,
+                    _STATUS_FMT.get(status_val, status_val),
                     str(keys)
-                )
+                ))
+            for row in rows:
+                table.add_row(*row)
         
         self.console.print(table)
         
@@ -234,38 +977,87 @@ class OutputAnalyzer:
     def extract_and_save_html_report(self):
         """Extract HTML report from session and save as proper HTML file"""
         try:
-            if not self.graph:
-                self.console.print("\n⚠️  No graph data available")
+            found = self._report_source()
+            if found is None:
                 return None
-                
-            session_id = self.graph.graph['session_id']
             
-            # Find the HTML report in the graph
-            html_content = self._find_html_report()
+            # Save to file
+            output_path, full_html = self._render_html_report(*found, self.context.get_session_data())
+            output_path.write_text(full_html, encoding='utf-8')
             
-            if html_content:
-                # Create proper HTML structure
-                full_html = self._create_proper_html(html_content, session_id, self.context.get_session_data())
-                
-                # Save to file
-                output_path = Path(f"memory/session_{session_id}_report.html")
-                output_path.write_text(full_html, encoding='utf-8')
+            self.console.print(f"\n📄 **Seraphine Report Generated:** {output_path}")
+            return str(output_path)
                 
-                self.console.print(f"\n📄 **Seraphine Report Generated:** {output_path}")
-                return str(output_path)
-            else:
-                self.console.print("\n⚠️  No HTML report found in session data")
+        except Exception as e:
+            self.console.print(f"\n❌ Error generating HTML report: {e}")
+            return None
+    
+    async def extract_and_save_html_report_async(self):
+        """Async twin of extract_and_save_html_report for callers on an event loop.
+        
+        The graph is read (and the session data snapshotted) on the caller's loop; rendering (which
+        waits on image validation) and the file write run in worker threads via asyncio.to_thread,
+        so the loop keeps serving other tasks, including ones that update the graph, meanwhile.
+        """
+        try:
+            found = self._report_source()
+            if found is None:
                 return None
+            session_data = self._session_snapshot()
+            
+            output_path, full_html = await asyncio.to_thread(self._render_html_report, *found, session_data)
+            
+            # Save to file
+            await asyncio.to_thread(output_path.write_text, full_html, encoding='utf-8')
+            
+            self.console.print(f"\n📄 **Seraphine Report Generated:** {output_path}")
+            return str(output_path)
                 
         except Exception as e:
             self.console.print(f"\n❌ Error generating HTML report: {e}")
             return None
+    
+    def _report_source(self) -> Optional[Tuple[str, str]]:
+        """(session_id, report HTML) from the graph, or None if there is nothing to save"""
+        if not self.graph:
+            self.console.print("\n⚠️  No graph data available")
+            return None
+            
+        session_id = self.graph.graph['session_id']
+        
+        # Find the HTML report in the graph
+        html_content = self._find_html_report()
+        
+        if not html_content:
+            self.console.print("\n⚠️  No HTML report found in session data")
+            return None
+        return session_id, html_content
+    
+    def _session_snapshot(self) -> Dict[str, Any]:
+        """get_session_data() with the output chain and node attribute dicts copied.
+        
+        Steps replace their outputs rather than editing them, so this is enough for a worker thread
+        to read while the loop keeps marking nodes done.
+        """
+        session_data = self.context.get_session_data()
+        session_data['output_chain'] = dict(session_data['output_chain'])
+        session_data['nodes'] = {node_id: dict(attrs) for node_id, attrs in session_data['nodes'].items()}
+        return session_data
+    
+    def _render_html_report(self, session_id: str, html_content: str, session_data: Dict) -> Tuple[Path, str]:
+        """(output path, full HTML) for this session's report"""
+        full_html = self._create_proper_html(html_content, session_id, session_data)
+        return Path(f"memory/session_{session_id}_report.html"), full_html
 
     def _find_html_report(self):
-        """SIMPLIFIED: Find HTML report directly from output_chain"""
+        """SIMPLIFIED: Find HTML report directly from output_chain (remembered once found)"""
         if not self.graph:
             return None
-        
+        if self._cached_html is None:
+            self._cached_html = self._locate_html_report()
+        return self._cached_html
+    
+    def _locate_html_report(self):
         session_id = self.graph.graph['session_id']
         
         # ✅ STRATEGY 1: Check for auto-saved HTML file (keep this)
@@ -292,42 +1084,23 @@ class OutputAnalyzer:
         # Look for FormatterAgent outputs with HTML content
         for step_id, output_data in output_chain.items():
             if isinstance(output_data, dict):
-                # Check top-level fields for HTML
-                for key, value in output_data.items():
-                    if isinstance(value, str) and _looks_like_html_content_standalone(value):
-                        self.console.print(f"📄 Found HTML in output_chain: {step_id}.{key}")
-                        return value
-                
-                # Check nested fields
-                if 'output' in output_data and isinstance(output_data['output'], dict):
-                    for key, value in output_data['output'].items():
-                        if isinstance(value, str) and _looks_like_html_content_standalone(value):
-                            self.console.print(f"📄 Found HTML in output_chain: {step_id}.output.{key}")
-                            return value
+                # Top-level fields, then nested ones
+                found = _first_html_field(output_data)
+                if found:
+                    self.console.print(f"📄 Found HTML in output_chain: {step_id}.{found[0]}")
+                    return found[1]
 
         # ✅ STRATEGY 3: Fallback to node scanning (keep as final fallback)
         self.console.print("🔍 Scanning FormatterAgent outputs in graph...")
-        for node_id in self.graph.nodes:
-            if node_id == "ROOT":
-                continue
-            
+        for node_id in self._nodes_for_agent('FormatterAgent'):
             node_data = self.graph.nodes[node_id]
             
-            if node_data.get('agent') == 'FormatterAgent' and node_data.get('output'):
-                output = node_data['output']
-                
-                # Check all string fields for HTML content
-                for key, value in output.items():
-                    if isinstance(value, str) and _looks_like_html_content_standalone(value):
-                        self.console.print(f"📄 Found HTML in graph field: {key}")
-                        return value
-                
-                # Check nested output structure
-                if 'output' in output and isinstance(output['output'], dict):
-                    for key, value in output['output'].items():
-                        if isinstance(value, str) and _looks_like_html_content_standalone(value):
-                            self.console.print(f"📄 Found HTML in nested field: {key}")
-                            return value
+            if node_data.get('output'):
+                # All string fields, then the nested output structure
+                found = _first_html_field(node_data['output'])
+                if found:
+                    self.console.print(f"📄 Found HTML in graph field: {found[0]}")
+                    return found[1]
 
         return None
 
@@ -336,171 +1109,139 @@ class OutputAnalyzer:
         if not isinstance(content, str) or len(content) < 10:
             return False
         
-        content_start = content.strip()[:100].lower()
-        html_indicators = [
-            '<html', '<div', '<section', '<article', '<header', 
-            '<main', '<body', '<!doctype', '<h1', '<h2', '<p'
-        ]
-        
-        return any(indicator in content_start for indicator in html_indicators)
+        start = _NON_SPACE_RE.search(content)
+        return start is not None and _HTML_INDICATOR_RE.search(content, start.start(), start.start() + 100) is not None
 
     def _extract_images_from_session_data(self, session_data):
         """Extract all images by brute force URL search with detailed logging AND validation"""
-        images = []
         all_urls = set()
-        processed_count = 0
-        
-        try:
-            print(f"🔍 Brute force search for image URLs...")
-            
-            # Convert entire session to searchable text
-            session_text = json.dumps(session_data)
-            print(f"📝 Searching {len(session_text):,} characters of session data...")
-            
-            # Find ALL image URLs using regex
-            image_urls = re.findall(
-                r'https?://[^\s\'"<>\\]+\.(?:jpg|jpeg|png|webp|gif)(?:\?[^\s\'"<>\\]*)?', 
-                session_text, 
-                re.IGNORECASE
-            )
-            
-            print(f"🎯 Raw URL matches found: {len(image_urls)}")
-            
-            for i, url in enumerate(image_urls):
-                processed_count += 1
-                
-                # Check for duplicates
-                if url in all_urls:
-                    continue
-                
-                all_urls.add(url)
-                clean_url = url.rstrip('",\'\\')
-                
-                # ✅ FILTER 1: Social media URL check (FIXED - removed the else continue bug)
-                if self._is_social_media_image(clean_url):
-                    continue
-                
-                # Extract metadata from context
-                alt_text = f"Image {len(images) + 1}"
-                confidence_score = 0.85  # Default confidence
-                width = height = None
-                
-                # Look for metadata patterns near this URL in the full text
-                url_index = session_text.find(url)
-                if url_index != -1:
-                    context = session_text[max(0, url_index-500):url_index+len(url)+500]
+        raw_count = 0
+        passed = 0
+        
+        def candidate_images():
+            """Walk the session tree lazily and yield each image that passes the filters, in document order"""
+            nonlocal raw_count, passed
+            for text, parent in self._walk_strings(session_data):
+                for match in _IMAGE_URL_RE.finditer(text):
+                    raw_count += 1
+                    url = match.group()
+                        
+                    # Check for duplicates
+                    if url in all_urls:
+                        continue
                     
-                    # Extract confidence score
-                    confidence_patterns = [
-                        r"['\"]confidence['\"]:\s*([0-9.]+)",
-                        r"confidence['\"]:\s*([0-9.]+)"
-                    ]
+                    all_urls.add(url)
+                    clean_url = url.rstrip('",\'\\')
+                    
+                    # ✅ FILTER 1: Social media URL check (FIXED - removed the else continue bug)
+                    if self._is_social_media_image(clean_url):
+                        continue
                     
-                    for pattern in confidence_patterns:
-                        conf_matches = re.findall(pattern, context)
-                        if conf_matches:
+                    # ✅ FILTER 2: Low quality URL patterns (URL-only, so before any metadata lookup)
+                    if self._is_low_quality_url(clean_url):
+                        continue
+                    
+                    # Extract metadata: typed fields of the containing dict, else patterns near the URL in its own string.
+                    # Each field is read just before its filter, so rejected candidates skip the remaining scans.
+                    fields = parent or {}
+                    context = text[max(0, match.start()-500):match.end()+500]
+                    
+                    # Extract confidence score
+                    confidence_score = 0.85  # Default confidence
+                    conf_value = _leading_number(fields.get('confidence'))
+                    if conf_value is not None:
+                        confidence_score = conf_value
+                    else:
+                        conf_match = _first_group(_CONFIDENCE_RES, context)
+                        if conf_match is not None:
                             try:
-                                confidence_score = float(conf_matches[0])
-                            except:
+                                confidence_score = float(conf_match)
+                            except ValueError:
                                 pass
-                            break
+                    
+                    # ✅ FILTER 3: Confidence score check
+                    if confidence_score < 0.69:
+                        continue
                     
                     # Extract dimensions
-                    width_patterns = [
-                        r"['\"]width['\"]:\s*['\"]?(\d+)['\"]?",
-                        r"width['\"]:\s*['\"]?(\d+)['\"]?"
-                    ]
-                    height_patterns = [
-                        r"['\"]height['\"]:\s*['\"]?(\d+)['\"]?",
-                        r"height['\"]:\s*['\"]?(\d+)['\"]?"
-                    ]
+                    width = height = None
+                    width_value = _leading_number(fields.get('width'))
+                    if width_value is not None:
+                        width = int(width_value)
+                    else:
+                        width_match = _first_group(_WIDTH_RES, context)
+                        if width_match is not None:
+                            width = int(width_match)
                     
-                    for pattern in width_patterns:
-                        width_matches = re.findall(pattern, context)
-                        if width_matches:
-                            try:
-                                width = int(width_matches[0])
-                            except:
-                                pass
-                            break
+                    height_value = _leading_number(fields.get('height'))
+                    if height_value is not None:
+                        height = int(height_value)
+                    else:
+                        height_match = _first_group(_HEIGHT_RES, context)
+                        if height_match is not None:
+                            height = int(height_match)
                     
-                    for pattern in height_patterns:
-                        height_matches = re.findall(pattern, context)
-                        if height_matches:
-                            try:
-                                height = int(height_matches[0])
-                            except:
-                                pass
-                            break
+                    # ✅ FILTER 4: Size checks
+                    if width and height:
+                        if width < 500 or height < 500:
+                            continue
+                        
+                        # Aspect ratio check
+                        aspect_ratio = max(width, height) / min(width, height)
+                        if aspect_ratio > 4:
+                            continue
+                    
+                    elif width and not height:
+                        if width < 500:
+                            continue
+                    
+                    elif height and not width:
+                        print(f"📐 Checking height only: {height}px")
+                        if height < 500:
+                            continue
                     
                     # Extract alt text
-                    alt_patterns = [
-                        r"['\"]alt_text['\"]:\s*['\"]([^'\"]+)['\"]",
-                        r"['\"]alt['\"]:\s*['\"]([^'\"]+)['\"]",
-                        r"alt_text['\"]:\s*['\"]([^'\"]+)",
-                        r"alt['\"]:\s*['\"]([^'\"]+)"
-                    ]
+                    alt_text = f"Image {passed + 1}"
+                    alt_value = fields.get('alt_text') or fields.get('alt')
+                    if isinstance(alt_value, str) and alt_value:
+                        alt_text = alt_value
+                    else:
+                        alt_match = _first_group(_ALT_RES, context)
+                        if alt_match is not None:
+                            alt_text = alt_match
                     
-                    for pattern in alt_patterns:
-                        alt_matches = re.findall(pattern, context)
-                        if alt_matches:
-                            alt_text = alt_matches[0]
-                            break
-                
-                # ✅ FILTER 2: Confidence score check
-                if confidence_score < 0.69:
-                    continue
-                
-                # ✅ FILTER 3: Size checks
-                if width and height:
-                    if width < 500 or height < 500:
+                    # ✅ FILTER 5: Alt text check
+                    if self._is_social_media_alt_text(alt_text):
                         continue
                     
-                    # Aspect ratio check
-                    aspect_ratio = max(width, height) / min(width, height)
-                    if aspect_ratio > 4:
-                        continue
-                
-                elif width and not height:
-                    if width < 500:
-                        continue
-                
-                elif height and not width:
-                    print(f"📐 Checking height only: {height}px")
-                    if height < 500:
-                        continue
-                
-                # ✅ FILTER 4: Alt text check
-                if self._is_social_media_alt_text(alt_text):
-                    continue
-                
-                # ✅ FILTER 5: Low quality URL patterns
-                if self._is_low_quality_url(clean_url):
-                    continue
-                
-                # ✅ ALL FILTERS PASSED - Add to results
-                images.append({
-                    'url': clean_url,
-                    'alt_text': alt_text,
-                    'source': 'session_data',
-                    'confidence': confidence_score,
-                    'width': width,
-                    'height': height
-                })
+                    # ✅ ALL FILTERS PASSED - Add to results
+                    passed += 1
+                    yield {
+                        'url': clean_url,
+                        'alt_text': alt_text,
+                        'source': 'session_data',
+                        'confidence': confidence_score,
+                        'width': width,
+                        'height': height
+                    }
+        
+        try:
+            print(f"🔍 Brute force search for image URLs...")
             
-            # ✅ NEW: VALIDATE URLs if enabled
-            if self.validate_images and self.image_validator and images:
-                print(f"🌐 Validating {len(images)} candidate images...")
+            # ✅ NEW: VALIDATE URLs if enabled - streamed, so requests start while the walk is still going
+            if self.validate_images and self.image_validator:
+                print(f"🌐 Validating candidate images as they are found...")
                 start_time = time.time()
                 
-                urls_to_check = [img['url'] for img in images]
-                validation_results = self.image_validator.validate_images_sync(urls_to_check)
+                checked = self.image_validator.validate_stream(
+                    candidate_images(), key=lambda img: img['url'], want=12
+                )
                 
                 # Filter out broken images
-                valid_images = []
-                for img, validation in zip(images, validation_results):
-                    if validation.get('exists', False) and validation.get('is_image', True):
-                        valid_images.append(img)
+                images = []
+                for img, validation in checked:
+                    if ImageValidator.is_valid(validation):
+                        images.append(img)
                         print(f"✅ Valid: {img['url'][:60]}...")
                     else:
                         error = validation.get('error', 'unknown')
@@ -509,12 +1250,12 @@ class OutputAnalyzer:
                 
                 validation_time = time.time() - start_time
                 print(f"⏱️  Validation completed in {validation_time:.2f}s")
-                print(f"📊 Valid images: {len(valid_images)}/{len(images)}")
-                
-                images = valid_images
+                print(f"📊 Valid images: {len(images)}/{len(checked)}")
+            else:
+                images = list(candidate_images())
             
             print(f"\n🎯 FINAL SUMMARY:")
-            print(f"   Total URLs found: {len(image_urls)}")
+            print(f"   Total URLs found: {raw_count}")
             print(f"   Unique URLs processed: {len(all_urls)}")
             print(f"   Images passing filters: {len(images)}")
             print(f"   Image validation: {'✅ Enabled' if self.validate_images else '❌ Disabled'}")
@@ -525,331 +1266,141 @@ class OutputAnalyzer:
             print(f"❌ Error in image extraction: {e}")
             import traceback
             traceback.print_exc()
-            return []
-
-    def _is_social_media_image(self, url):
-        """Check if URL suggests a social media image"""
-        social_media_keywords = [
-            'facebook', 'twitter', 'instagram', 'linkedin', 'youtube', 
-            'whatsapp', 'telegram', 'email', 'share', 'social',
-            'icon', 'logo', 'btn', 'button', 'arrow'
-        ]
-        
-        url_lower = url.lower()
-        return any(keyword in url_lower for keyword in social_media_keywords)
-
-    def _is_social_media_alt_text(self, alt_text):
-        """Check if alt text suggests social media content"""
-        if not alt_text:
-            return False
-        
-        social_media_keywords = [
-            'share on', 'facebook', 'twitter', 'instagram', 'linkedin',
-            'whatsapp', 'email', 'social', 'follow us', 'like us',
-            'subscribe', 'icon', 'logo', 'button'
-        ]
-        
-        alt_lower = alt_text.lower()
-        return any(keyword in alt_lower for keyword in social_media_keywords)
-
-    def _is_low_quality_url(self, url):
-        """Check for low-quality URL patterns"""
-        low_quality_patterns = [
-            r'/icon[s]?/',           # Icon directories
-            r'/button[s]?/',         # Button directories
-            r'/social/',             # Social media directories
-            r'/share/',              # Share button directories
-            r'/arrow[s]?/',          # Arrow images
-            r'/bg[_-]',              # Background images
-            r'/banner[s]?/',         # Banner directories
-            r'/ad[s]?/',             # Advertisement directories
-            r'_icon\.',              # Files ending with _icon
-            r'_btn\.',               # Files ending with _btn
-            r'_arrow\.',             # Files ending with _arrow
-            r'_logo\.',              # Files ending with _logo
-            r'pixel\.', r'spacer\.', # Spacer/pixel images
-            r'blank\.', r'empty\.',  # Blank/empty images
-        ]
-        
-        return any(re.search(pattern, url, re.IGNORECASE) for pattern in low_quality_patterns)
-
-    def _create_image_carousel(self, images):
-        """Create HTML carousel for images"""
-        if not images:
-            return ""
-        
-        carousel_html = """
-        <div class="image-carousel">
-            <div class="carousel-container">
-                <div class="carousel-slides">
-        """
-        
-        for i, img in enumerate(images):
-            active_class = "active" if i == 0 else ""
-            confidence_display = f"{img.get('confidence', 0.0):.2f}" if isinstance(img.get('confidence'), (int, float)) else img.get('confidence', 'N/A')
-            
-            # Extract domain from URL for source link
-            source_link = self._extract_source_link(img['url'])
-            
-            carousel_html += f"""
-                    <div class="carousel-slide {active_class}">
-                        <img src="{img['url']}" alt="{img['alt_text']}" />
-                        <div class="carousel-caption">
-                            <p><strong>{img['alt_text']}</strong></p>
-                            <small>{source_link} | Confidence: {confidence_display}</small>
-                        </div>
-                    </div>
-            """
-        
-        # Only show navigation if there are multiple images
-        nav_buttons = ""
-        if len(images) > 1:
-            nav_buttons = """
-                <button class="carousel-btn prev" onclick="changeSlide(-1)">&lt;</button>
-                <button class="carousel-btn next" onclick="changeSlide(1)">&gt;</button>
-            """
-        
-        carousel_html += f"""
-                </div>
-                {nav_buttons}
-            </div>
-        """
-        
-        # Only show dots if there are multiple images
-        if len(images) > 1:
-            carousel_html += '<div class="carousel-dots">'
-            for i in range(len(images)):
-                active_class = "active" if i == 0 else ""
-                carousel_html += f'<button class="carousel-dot {active_class}" onclick="currentSlide({i + 1})"></button>'
-            carousel_html += '</div>'
-        
-        carousel_html += """
-        </div>
-        """
-        
-        return carousel_html
-
-    def _extract_source_link(self, url):
-        """Extract domain from URL and create a clickable link"""
-        try:
-            import re
-            # Extract domain from URL
-            domain_match = re.match(r'https?://([^/]+)', url)
-            if domain_match:
-                domain = domain_match.group(1)
-                # Remove www. if present for cleaner display
-                display_domain = domain.replace('www.', '')
-                return f'<a href="//{domain}" target="_blank" rel="noopener noreferrer">Source: {display_domain}</a>'
-            else:
-                return 'Source: session_data'
-        except:
-            return 'Source: session_data'
-
-    def _get_carousel_css(self):
-        """Get CSS for the image carousel"""
-        return """
-        /* Image Carousel Styles */
-        .image-carousel {
-            margin: 2rem 0;
-        }
-        
-        .carousel-container {
-            position: relative;
-            max-width: 100%;
-            margin: auto;
-        }
-        
-        .carousel-slides {
-            display: flex;
-            overflow: hidden;
-            width: 100%;
-        }
-        
-        .carousel-slide {
-            min-width: 100%;
-            display: none;
-            flex-direction: column;
-            align-items: center;
-        }
-        
-        .carousel-slide.active {
-            display: flex;
-        }
-        
-        .carousel-slide img {
-            width: 100%;
-            max-height: 500px;
-            object-fit: contain;
-            border-radius: 4px;
-        }
-        
-        .carousel-caption {
-            text-align: center;
-            margin-top: 1rem;
-            max-width: 600px;
-        }
-        
-        .carousel-caption p {
-            margin: 0.5rem 0;
-            font-weight: 500;
-        }
-        
-        .carousel-caption small {
-            color: #666;
-            font-size: 0.8rem;
-        }
-        html.dark .carousel-caption small, body.dark .carousel-caption small {
-            color: #aaa;
-        }
-        
-        .carousel-btn {
-            position: absolute;
-            top: 45%;
-            transform: translateY(-50%);
-            background: rgba(0,0,0,0.6);
-            color: white;
-            border: none;
-            padding: 0.8rem 1rem;
-            cursor: pointer;
-            font-size: 0.5rem;
-            border-radius: 4px;
-            transition: all 0.3s ease;
-            z-index: 10;
-            opacity: 0.7;
-        }
-        
-        .carousel-btn:hover {
-            background: rgba(0,0,0,0.9);
-            opacity: 1;
-            transform: translateY(-50%) scale(1.1);
-        }
-        
-        .carousel-btn.prev {
-            left: 0;
-        }
-        
-        .carousel-btn.next {
-            right: 0;
-        }
-        
-        .carousel-dots {
-            text-align: center;
-            padding: 1rem 0;
-        }
-        
-        .carousel-dot {
-            height: 8px;
-            width: 8px;
-            margin: 0 4px;
-            background-color: #ccc;
-            border-radius: 50%;
-            display: inline-block;
-            cursor: pointer;
-            border: none;
-            transition: all 0.3s ease;
-        }
-        
-        .carousel-dot.active, .carousel-dot:hover {
-            background-color: #333;
-            transform: scale(1.2);
-        }
-        html.dark .carousel-dot {
-            background-color: #666;
-        }
-        html.dark .carousel-dot.active, body.dark .carousel-dot.active,
-        html.dark .carousel-dot:hover, body.dark .carousel-dot:hover {
-            background-color: #ccc;
-        }
-        """
+            return []
 
-    def _get_carousel_javascript(self):
-        """Get JavaScript for the image carousel"""
-        return """
-        // Image Carousel JavaScript
-        let currentSlideIndex = 0;
-        let slides = [];
-        let dots = [];
+    @staticmethod
+    def _walk_strings(node):
+        """Yield (string, containing dict or None) for every string value in a JSON-like tree, in document order"""
+        stack = [(node, None)]
+        while stack:
+            value, parent = stack.pop()
+            if isinstance(value, str):
+                yield value, parent
+            elif isinstance(value, dict):
+                stack.extend((child, value) for child in reversed(list(value.values())))
+            elif isinstance(value, (list, tuple)):
+                stack.extend((child, parent) for child in reversed(value))
+
+    def _is_social_media_image(self, url):
+        """Check if URL suggests a social media image"""
+        return _SOCIAL_URL_RE.search(url.lower()) is not None
+
+    def _is_social_media_alt_text(self, alt_text):
+        """Check if alt text suggests social media content"""
+        if not alt_text:
+            return False
+        return _SOCIAL_ALT_RE.search(alt_text.lower()) is not None
+
+    def _is_low_quality_url(self, url):
+        """Check for low-quality URL patterns"""
+        return _LOW_QUALITY_RE.search(url) is not None
+
+    def _create_image_carousel(self, images):
+        """Create HTML carousel for images"""
+        if not images:
+            return ""
         
-        function initializeCarousel() {
-            slides = document.querySelectorAll('.carousel-slide');
-            dots = document.querySelectorAll('.carousel-dot');
-            currentSlideIndex = 0;
-            
-            if (slides.length > 0) {
-                showSlide(0);
-            }
-        }
+        parts = ["""
+        <div class="image-carousel">
+            <div class="carousel-container">
+                <div class="carousel-slides">
+        """]
         
-        function showSlide(index) {
-            // Hide all slides
-            slides.forEach(slide => slide.classList.remove('active'));
-            dots.forEach(dot => dot.classList.remove('active'));
+        for i, img in enumerate(images):
+            active_class = "active" if i == 0 else ""
+            confidence_display = f"{img.get('confidence', 0.0):.2f}" if isinstance(img.get('confidence'), (int, float)) else img.get('confidence', 'N/A')
             
-            // Show selected slide
-            if (slides[index]) {
-                slides[index].classList.add('active');
-                if (dots[index]) {
-                    dots[index].classList.add('active');
-                }
-            }
-        }
-        
-        function changeSlide(direction) {
-            if (slides.length === 0) return;
+            # Extract domain from URL for source link
+            source_link = self._extract_source_link(img['url'])
             
-            currentSlideIndex += direction;
-            if (currentSlideIndex >= slides.length) currentSlideIndex = 0;
-            if (currentSlideIndex < 0) currentSlideIndex = slides.length - 1;
-            showSlide(currentSlideIndex);
-        }
+            parts.append(f"""
+                    <div class="carousel-slide {active_class}">
+                        <img src="{img['url']}" alt="{img['alt_text']}" />
+                        <div class="carousel-caption">
+                            <p><strong>{img['alt_text']}</strong></p>
+                            <small>{source_link} | Confidence: {confidence_display}</small>
+                        </div>
+                    </div>
+            """)
         
-        function currentSlide(index) {
-            if (slides.length === 0) return;
-            
-            currentSlideIndex = index - 1;
-            showSlide(currentSlideIndex);
-        }
+        # Only show navigation if there are multiple images
+        nav_buttons = ""
+        if len(images) > 1:
+            nav_buttons = """
+                <button class="carousel-btn prev" onclick="changeSlide(-1)">&lt;</button>
+                <button class="carousel-btn next" onclick="changeSlide(1)">&gt;</button>
+            """
         
-        // Initialize carousel when page loads
-        document.addEventListener('DOMContentLoaded', function() {
-            initializeCarousel();
-        });
+        parts.append(f"""
+                </div>
+                {nav_buttons}
+            </div>
+        """)
         
-        // Re-initialize if content changes (for emoji toggle)
-        window.addEventListener('load', function() {
-            setTimeout(initializeCarousel, 100);
-        });
-        """
+        # Only show dots if there are multiple images
+        if len(images) > 1:
+            parts.append('<div class="carousel-dots">')
+            for i in range(len(images)):
+                active_class = "active" if i == 0 else ""
+                parts.append(f'<button class="carousel-dot {active_class}" onclick="currentSlide({i + 1})"></button>')
+            parts.append('</div>')
+        
+        parts.append("""
+        </div>
+        """)
+        
+        return "".join(parts)
+
+    def _extract_source_link(self, url):
+        """Extract domain from URL and create a clickable link"""
+        try:
+            parts = urlsplit(url)
+        except ValueError:
+            return 'Source: session_data'
+        # Extract domain from URL
+        domain = parts.netloc
+        if parts.scheme in ('http', 'https') and domain:
+            # Remove www. if present for cleaner display
+            display_domain = domain.replace('www.', '')
+            return f'<a href="//{domain}" target="_blank" rel="noopener noreferrer">Source: {display_domain}</a>'
+        return 'Source: session_data'
+
+    def _get_carousel_css(self):
+        """Get CSS for the image carousel"""
+        return _CAROUSEL_CSS
+
+    def _get_carousel_javascript(self):
+        """Get JavaScript for the image carousel"""
+        return _CAROUSEL_JS
 
     def _create_proper_html(self, html_content, session_id, session_data=None):
         """Create proper HTML with validated image carousel from session data"""
         from datetime import datetime
-        import re
         from html import unescape
 
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # ✅ Strip FormatterAgent styling
-        clean_html = html_content
-        clean_html = re.sub(r'<style[^>]*>.*?</style>', '', clean_html, flags=re.DOTALL | re.IGNORECASE)
-        clean_html = re.sub(r'\s+class=["\'][^"\']*["\']', '', clean_html)
-        clean_html = re.sub(r'<div[^>]*section-toc[^>]*>.*?</div>', '', clean_html, flags=re.DOTALL | re.IGNORECASE)
-        clean_html = re.sub(r'<div[^>]*navigation[^>]*>.*?</div>', '', clean_html, flags=re.DOTALL | re.IGNORECASE)
-        clean_html = re.sub(r'^<div[^>]*>', '', clean_html.strip())
-        clean_html = re.sub(r'</div>$', '', clean_html.strip())
-        clean_html = re.sub(r'<(div|span)[^>]*></\1>', '', clean_html)
-        clean_html = re.sub(r'\s+style=["\'][^"\']*["\']', '', clean_html)
+        clean_html = _FORMATTER_MARKUP_RE.sub('', html_content)
+        clean_html = _TOC_NAV_DIV_RE.sub('', clean_html)
+        # Unwrap the outer div
+        clean_html = clean_html.strip()
+        leading_div = _LEADING_DIV_RE.match(clean_html)
+        if leading_div:
+            clean_html = clean_html[leading_div.end():].strip()
+        if clean_html.endswith('</div>'):
+            clean_html = clean_html[:-len('</div>')]
+        clean_html = _EMPTY_TAG_RE.sub('', clean_html)
         
         # ✅ NEW: Clean up problematic inline image styles
-        clean_html = re.sub(r'<img([^>]*)\s+style=["\'][^"\']*width[^"\']*["\']([^>]*)>', 
-                          r'<img\1\2>', clean_html)
-        clean_html = re.sub(r'<img([^>]*)\s+style=["\'][^"\']*height[^"\']*["\']([^>]*)>', 
-                          r'<img\1\2>', clean_html)
+        # (style= attributes are normally gone by now, so both literals are rarely present)
+        if '<img' in clean_html and 'style=' in clean_html:
+            clean_html = _IMG_STYLE_WIDTH_RE.sub(r'<img\1\2>', clean_html)
+            clean_html = _IMG_STYLE_HEIGHT_RE.sub(r'<img\1\2>', clean_html)
         
         # ✅ GENERIC: Move ANY content above first H1 to after H1
         content_before_h1 = ""
-        h1_pattern = r'(<h1[^>]*>.*?</h1>)'
-        h1_match = re.search(h1_pattern, clean_html, re.IGNORECASE | re.DOTALL)
+        h1_match = _H1_RE.search(clean_html)
         
         if h1_match:
             h1_start_pos = h1_match.start()
@@ -858,17 +1409,12 @@ class OutputAnalyzer:
             # Extract content before H1
             if h1_start_pos > 0:
                 content_before_h1 = clean_html[:h1_start_pos].strip()
-                # Remove the content before H1 from the original
-                clean_html = clean_html[h1_start_pos:]
-                
-                # Find the H1 again in the cleaned content
-                h1_match_new = re.search(h1_pattern, clean_html, re.IGNORECASE | re.DOTALL)
-                if h1_match_new:
-                    h1_end_pos_new = h1_match_new.end()
-                    # Insert the extracted content after H1
-                    clean_html = (clean_html[:h1_end_pos_new] + 
-                                content_before_h1 + 
-                                clean_html[h1_end_pos_new:])
+                # Drop it from the front and insert it after the H1 (the match already gives the H1's extent)
+                clean_html = ''.join((
+                    clean_html[h1_start_pos:h1_end_pos],
+                    content_before_h1,
+                    clean_html[h1_end_pos:]
+                ))
         
         # ✅ EXTRACT AND CREATE CAROUSEL
         carousel_html = ""
@@ -884,8 +1430,7 @@ class OutputAnalyzer:
         
         # ✅ INSERT CAROUSEL AFTER FIRST HEADING (now that content is properly ordered)
         if carousel_html:
-            heading_pattern = r'(<h[12][^>]*>.*?</h[12]>)'
-            match = re.search(heading_pattern, clean_html, re.IGNORECASE)
+            match = _HEADING_RE.search(clean_html)
             if match:
                 heading_end_pos = match.end()
                 clean_html = (clean_html[:heading_end_pos] + 
@@ -894,261 +1439,65 @@ class OutputAnalyzer:
             else:
                 clean_html = carousel_html + clean_html
         
-        title_match = re.search(r'<h1[^>]*>(.*?)</h1>', clean_html)
+        title_match = _TITLE_H1_RE.search(clean_html)
         title = title_match.group(1) if title_match else f"Session {session_id} Report"
-        title_clean = re.sub(r'<[^>]+>', '', title)
+        title_clean = _TAG_RE.sub('', title)
 
-        # ✅ UPDATED: Get carousel CSS and add content image CSS
-        content_image_css = """
-        /* Content Images Styling */
-        .container img:not(.carousel-slide img) {
-            max-width: 100%;
-            height: auto;
-            display: block;
-            margin: 1.5rem auto;
-            border-radius: 4px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }
-        html.dark .container img:not(.carousel-slide img), 
-        body.dark .container img:not(.carousel-slide img) {
-            box-shadow: 0 2px 8px rgba(255,255,255,0.1);
-        }
-        
-        /* Remove any remaining inline width/height styles */
-        .container img[style*="width"] {
-            width: auto !important;
-            max-width: 100% !important;
-        }
-        .container img[style*="height"] {
-            height: auto !important;
-        }
-        """
-        
-        # Combine all CSS
-        all_css = carousel_css + content_image_css
-        
         # ✅ VALIDATE inline images in HTML content
         if self.validate_images:
             clean_html = self._validate_inline_images_in_html(clean_html)
         
-        return rf"""<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="UTF-8" />
-  <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-  <title>{title_clean}</title>
-  <style>
-    /* Base styles */
-    :root {{
-      --bg-light: #ffffff;
-      --bg-dark: #0a0a0a;
-      --text-light: #111111;
-      --text-dark: #f1f1f1;
-      --border-light: #000000;
-      --border-dark: #ffffff;
-      --font-sans: 'Inter', 'San Francisco', -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-      --font-serif: 'EB Garamond', 'New York', 'Georgia', serif;
-    }}
-
-    html, body {{
-      margin: 0;
-      padding: 0;
-      font-family: var(--font-sans);
-      font-size: 18px;
-      background-color: var(--bg-light);
-      color: var(--text-light);
-      line-height: 1.75;
-      transition: background 0.3s, color 0.3s, font-family 0.3s;
-    }}
-    
-    html.dark, body.dark {{
-      background-color: var(--bg-dark);
-      color: var(--text-dark);
-    }}
-
-    .container {{
-      max-width: 900px;
-      margin: 60px auto;
-      padding: 0 20px;
-      background-color: var(--bg-light);
-      transition: background-color 0.3s;
-    }}
-    html.dark .container, body.dark .container {{
-      background-color: var(--bg-dark);
-    }}
-
-    h1, h2, h3, h4, h5, h6 {{
-      font-weight: 600;
-      margin-top: 2.5em;
-      margin-bottom: 0.8em;
-      line-height: 1.3;
-    }}
-
-    h1 {{
-      font-size: 2.2rem;
-      border-bottom: 0.5px solid var(--border-light);
-      padding-bottom: 0.2em;
-    }}
-    html.dark h1, body.dark h1 {{
-      border-color: var(--border-dark);
-    }}
-
-    h2 {{
-      font-size: 1.5rem;
-    }}
-
-    ul, ol {{
-      padding-left: 1.5rem;
-      margin: 1rem 0;
-    }}
-
-    p {{
-      margin-bottom: 1rem;
-    }}
-
-    .controls {{
-      position: fixed;
-      top: 12px;
-      right: 16px;
-      display: flex;
-      gap: 14px;
-      font-size: 0.9rem;
-      z-index: 999;
-    }}
-
-    .controls button {{
-      all: unset;
-      cursor: pointer;
-      padding: 2px 6px;
-      background: rgba(255, 255, 255, 0.05);
-      border-radius: 4px;
-      font-weight: 500;
-      color: inherit;
-      opacity: 0.6;
-      transition: opacity 0.3s, background-color 0.3s;
-    }}
-    .controls button:hover {{
-      opacity: 1;
-    }}
-    html.dark .controls button, body.dark .controls button {{
-      background: rgba(255, 255, 255, 0.1);
-    }}
-
-    .footer {{
-      font-size: 0.55rem;
-      text-align: center;
-      margin-top: 2rem;
-      color: #aaa;
-    }}
-
-    @media print {{
-      .controls {{ display: none; }}
-    }}
-
-    {all_css}
-  </style>
-</head>
-<body>
-  <div class="controls">
-    <button onclick="toggleDark()">Th</button>
-    <button onclick="toggleFont()">Aa</button>
-    <button onclick="toggleEmojis()">Em</button>
-  </div>
-  <div class="container" id="main-container">
+        # Emojis start hidden: strip them here rather than in the browser on every load, and ship the
+        # original markup as JSON for the toggle to restore ('<' escaped so it cannot close the script)
+        container_html = f"""
     {clean_html}
     <div class="footer">
       <p>Generated by Seraphine on {timestamp} · Session ID: {session_id}</p>
     </div>
-  </div>
-  <script>
-    let emojisHidden = true; /* Start with emojis hidden */
-    let originalContent = '';
-
-    function toggleDark() {{
-      /* Toggle dark class on BOTH html and body elements */
-      document.documentElement.classList.toggle('dark');
-      document.body.classList.toggle('dark');
-    }}
-
-    function toggleFont() {{
-      const current = getComputedStyle(document.body).fontFamily;
-      const isSerif = current.includes("Georgia");
-      document.body.style.fontFamily = isSerif ? 'var(--font-sans)' : 'var(--font-serif)';
-    }}
-
-    function toggleEmojis() {{
-      const container = document.getElementById('main-container');
-      
-      if (emojisHidden) {{
-        /* Restore original content (show emojis) */
-        if (originalContent) {{
-          container.innerHTML = originalContent;
-        }}
-        emojisHidden = false;
-      }} else {{
-        /* Store original content and remove emojis */
-        if (!originalContent) {{
-          originalContent = container.innerHTML;
-        }}
-        /* ✅ FIXED: Comprehensive emoji regex that includes ALL emoji ranges */
-        const emojiRegex = /[\u{{1F300}}-\u{{1F9FF}}]|[\u{{2600}}-\u{{26FF}}]|[\u{{2700}}-\u{{27BF}}]|[\u{{2100}}-\u{{214F}}]|[\u{{1F000}}-\u{{1F02F}}]|[\u{{1F0A0}}-\u{{1F0FF}}]|[\u{{1F100}}-\u{{1F64F}}]|[\u{{1F680}}-\u{{1F6FF}}]|[\u{{1F910}}-\u{{1F96B}}]|[\u{{1F980}}-\u{{1F9E0}}]/gu;
-        container.innerHTML = container.innerHTML.replace(emojiRegex, '');
-        emojisHidden = true;
-      }}
-    }}
-
-    /* Initialize with emojis hidden on page load */
-    window.addEventListener('load', function() {{
-      const container = document.getElementById('main-container');
-      /* Store original content first */
-      originalContent = container.innerHTML;
-      /* Then remove emojis by default */
-      /* ✅ FIXED: Same comprehensive emoji regex */
-      const emojiRegex = /[\u{{1F300}}-\u{{1F9FF}}]|[\u{{2600}}-\u{{26FF}}]|[\u{{2700}}-\u{{27BF}}]|[\u{{2100}}-\u{{214F}}]|[\u{{1F000}}-\u{{1F02F}}]|[\u{{1F0A0}}-\u{{1F0FF}}]|[\u{{1F100}}-\u{{1F64F}}]|[\u{{1F680}}-\u{{1F6FF}}]|[\u{{1F910}}-\u{{1F96B}}]|[\u{{1F980}}-\u{{1F9E0}}]/gu;
-      container.innerHTML = container.innerHTML.replace(emojiRegex, '');
-    }});
-
-    {carousel_js}
-  </script>
-</body>
-</html>"""
+  """
+        original_json = json.dumps(container_html, ensure_ascii=False).replace('<', '\\u003c')
+        
+        return ''.join((
+            _REPORT_PARTS[0], title_clean,
+            _REPORT_PARTS[1], carousel_css, _CONTENT_IMAGE_CSS,
+            _REPORT_PARTS[2], _EMOJI_RE.sub('', container_html),
+            _REPORT_PARTS[3], original_json,
+            _REPORT_PARTS[4], carousel_js,
+            _REPORT_PARTS[5],
+        ))
 
     def _validate_inline_images_in_html(self, html_content: str) -> str:
         """Validate and clean up inline images in HTML content"""
         if not self.validate_images or not self.image_validator:
             return html_content
         
-        # Extract image URLs from HTML
-        img_pattern = r'<img[^>]+src=["\']([^"\']+)["\'][^>]*>'
-        img_matches = re.findall(img_pattern, html_content, re.IGNORECASE)
+        # Extract image URLs from HTML, each distinct URL once (first-seen order)
+        urls = list(dict.fromkeys(_INLINE_IMG_RE.findall(html_content)))
         
-        if not img_matches:
+        if not urls:
             return html_content
         
-        print(f"🖼️  Validating {len(img_matches)} inline images in HTML...")
+        print(f"🖼️  Validating {len(urls)} inline images in HTML...")
         
         # Validate all found images
-        validation_results = self.image_validator.validate_images_sync(img_matches)
+        validation_results = self.image_validator.validate_images_sync(urls)
         
-        # Create a mapping of URL -> validation result
-        url_validation = {result['url']: result for result in validation_results}
+        # URLs confirmed to exist; anything else (including a missing result) counts as broken
+        valid = {result['url'] for result in validation_results if result.get('exists', False)}
+        if len(valid) == len(urls):
+            return html_content
         
         # Replace broken images with placeholder or remove them
         def replace_broken_image(match):
-            img_tag = match.group(0)
             img_url = match.group(1)
-            
-            validation = url_validation.get(img_url, {'exists': False})
-            
-            if validation.get('exists', False):
-                return img_tag  # Keep valid images
-            else:
-                # Replace with placeholder or remove
-                print(f"🚫 Removing broken inline image: {img_url[:60]}...")
-                return f'<!-- Broken image removed: {img_url} -->'
+            if img_url in valid:
+                return match.group(0)  # Keep valid images
+            # Replace with placeholder or remove
+            print(f"🚫 Removing broken inline image: {img_url[:60]}...")
+            return f'<!-- Broken image removed: {img_url} -->'
         
         # Apply replacements
-        cleaned_html = re.sub(img_pattern, replace_broken_image, html_content, flags=re.IGNORECASE)
+        cleaned_html = _INLINE_IMG_RE.sub(replace_broken_image, html_content)
         
         return cleaned_html
 
@@ -1179,9 +1528,10 @@ def extract_html_report_from_session_file(session_file_path):
             
         console.print(f"📖 Loading session file: {session_path}")
         
-        # Load session data
-        with open(session_path, 'r', encoding='utf-8') as f:
-            session_data = json.load(f)
+        # Load session data, parsed straight from the page cache instead of a copy of the whole file
+        with open(session_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:  # released before the map closes
+                session_data = SessionSerializer.parse_session_bytes(view)
         
         # Extract session ID
         session_id = session_data.get('graph', {}).get('session_id', 'unknown')
@@ -1214,25 +1564,11 @@ def extract_html_report_from_session_file(session_file_path):
             # Look for FormatterAgent outputs with HTML content
             for step_id, output_data in output_chain.items():
                 if isinstance(output_data, dict):
-                    # Check top-level fields for HTML
-                    for key, value in output_data.items():
-                        if isinstance(value, str) and _looks_like_html_content_standalone(value):
-                            html_content = value
-                            console.print(f"📄 Found HTML in output_chain: {step_id}.{key}")
-                            break
-                    
-                    if html_content:
-                        break
-                    
-                    # Check nested fields
-                    if 'output' in output_data and isinstance(output_data['output'], dict):
-                        for key, value in output_data['output'].items():
-                            if isinstance(value, str) and _looks_like_html_content_standalone(value):
-                                html_content = value
-                                console.print(f"📄 Found HTML in output_chain: {step_id}.output.{key}")
-                                break
-                    
-                    if html_content:
+                    # Top-level fields, then nested ones
+                    found = _first_html_field(output_data)
+                    if found:
+                        html_content = found[1]
+                        console.print(f"📄 Found HTML in output_chain: {step_id}.{found[0]}")
                         break
         
         # ✅ STRATEGY 3: Check nodes as fallback (ORIGINAL LOGIC)
@@ -1243,27 +1579,12 @@ def extract_html_report_from_session_file(session_file_path):
             for node in nodes:
                 if node.get('agent') == 'FormatterAgent' and node.get('output'):
                     console.print(f"   • Found FormatterAgent: {node.get('id')}")
-                    output = node['output']
-                    
-                    # Check all string fields for HTML content
-                    for key, value in output.items():
-                        if isinstance(value, str) and _looks_like_html_content_standalone(value):
-                            html_content = value
-                            console.print(f"   ✅ Found HTML report in field: {key}")
-                            break
                     
-                    if html_content:
-                        break
-                    
-                    # Check nested output structure
-                    if 'output' in output and isinstance(output['output'], dict):
-                        for key, value in output['output'].items():
-                            if isinstance(value, str) and _looks_like_html_content_standalone(value):
-                                html_content = value
-                                console.print(f"   ✅ Found HTML in nested field: {key}")
-                                break
-                    
-                    if html_content:
+                    # All string fields, then the nested output structure
+                    found = _first_html_field(node['output'])
+                    if found:
+                        html_content = found[1]
+                        console.print(f"   ✅ Found HTML report in field: {found[0]}")
                         break
         
         if html_content:
@@ -1305,13 +1626,8 @@ def _looks_like_html_content_standalone(content):
     if not isinstance(content, str) or len(content) < 10:
         return False
     
-    content_start = content.strip()[:100].lower()
-    html_indicators = [
-        '<html', '<div', '<section', '<article', '<header', 
-        '<main', '<body', '<!doctype', '<h1', '<h2', '<p'
-    ]
-    
-    return any(indicator in content_start for indicator in html_indicators)
+    start = _NON_SPACE_RE.search(content)
+    return start is not None and _HTML_INDICATOR_RE.search(content, start.start(), start.start() + 100) is not None
 
 # CLI usage
 if __name__ == "__main__":
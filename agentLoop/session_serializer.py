@@ -3,11 +3,22 @@ Centralized session serialization for NetworkX graphs
 """
 
 import json
+import re
+import orjson
 import networkx as nx
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
+# Output parses to the same values as the stdlib encoder's (not byte-identical: floats are spelled 1e16/1e-7, not
+# 1e+16/1e-07, and NaN/Infinity become null); datetimes and dataclasses go through default=str like json.dumps
+_ORJSON_SESSION_OPTIONS = (
+    orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+# orjson reads integers outside the 64-bit range as floats; any 19+ digit run sends the file to the stdlib parser
+_LONG_DIGITS_RE = re.compile(rb'\d{19}')
+
 class SessionSerializer:
     """Centralized session serialization and loading"""
     
@@ -49,9 +60,14 @@ class SessionSerializer:
         # Serialize graph
         graph_data = nx.node_link_data(graph, edges="links")
         
+        try:
+            payload = orjson.dumps(graph_data, option=_ORJSON_SESSION_OPTIONS, default=str)
+        except TypeError:
+            # orjson rejects e.g. >64-bit ints; fall back to the stdlib encoder
+            payload = json.dumps(graph_data, indent=2, default=str, ensure_ascii=False).encode('utf-8')
+        
         # Write to file
-        with open(session_file, 'w', encoding='utf-8') as f:
-            json.dump(graph_data, f, indent=2, default=str, ensure_ascii=False)
+        session_file.write_bytes(payload)
         
         return session_file
     
@@ -66,11 +82,29 @@ class SessionSerializer:
         Returns:
             nx.DiGraph: Loaded NetworkX graph
         """
-        with open(session_file, 'r', encoding='utf-8') as f:
-            graph_data = json.load(f)
+        graph_data = SessionSerializer.parse_session_bytes(Path(session_file).read_bytes())
         
         return nx.node_link_graph(graph_data, edges="links")
     
+    @staticmethod
+    def parse_session_bytes(raw) -> dict:
+        """
+        Decode session JSON (bytes or any buffer) with orjson, falling back to json where it would differ
+        
+        Args:
+            raw: Session file contents
+            
+        Returns:
+            dict: Decoded session data
+        """
+        if _LONG_DIGITS_RE.search(raw) is None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # Older files may hold NaN/Infinity from the stdlib encoder, which orjson rejects
+                pass
+        return json.loads(bytes(raw))
+    
     @staticmethod
     def get_session_info(graph: nx.DiGraph) -> dict:
         """Get session metadata for display"""
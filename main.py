@@ -3,6 +3,10 @@
 from utils.utils import log_step, log_error
 import asyncio
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader
 from dotenv import load_dotenv
 from mcp_servers.multiMCP import MultiMCP
 from agentLoop.flow import AgentLoop4
@@ -25,7 +29,7 @@ def load_server_configs():
         return []
     
     with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
     
     return config.get("mcp_servers", [])
 
@@ -0,0 +1,108 @@
+import asyncio
+import random
+
+from agentLoop.contextManager import ExecutionContextManager
+from agentLoop.session_serializer import SessionSerializer
+
+
+def _context(edges, node_ids):
+    plan = {
+        "nodes": [{"id": n, "agent": "ThinkerAgent", "description": n} for n in node_ids],
+        "edges": [{"source": u, "target": v} for u, v in edges],
+    }
+    return ExecutionContextManager(plan, session_id="s1", original_query="q", debug_mode=True)
+
+
+def _expected_ready(context):
+    graph = context.plan_graph
+    return {
+        n for n, data in graph.nodes(data=True)
+        if n != "ROOT" and data["status"] == "pending"
+        and all(graph.nodes[p]["status"] == "completed" for p in graph.predecessors(n))
+    }
+
+
+def _expected_by_status(context):
+    by_status = {}
+    for n, data in context.plan_graph.nodes(data=True):
+        if n != "ROOT":
+            by_status.setdefault(data["status"], set()).add(n)
+    return by_status
+
+
+def _check_indexes(context):
+    ready = context.get_ready_steps()
+    assert len(ready) == len(set(ready))
+    assert set(ready) == _expected_ready(context)
+    assert {s: set(ids) for s, ids in context.nodes_by_status().items()} == _expected_by_status(context)
+
+
+def test_ready_set_follows_status_changes():
+    context = _context([("ROOT", "A"), ("ROOT", "B"), ("A", "C"), ("B", "C"), ("C", "D")], "ABCD")
+    assert context.get_ready_steps() == ["A", "B"]
+
+    context.mark_running("A")
+    assert context.get_ready_steps() == ["B"]
+    asyncio.run(context.mark_done("A", {"answer": 1}))
+    assert context.get_ready_steps() == ["B"]
+    asyncio.run(context.mark_done("B", {"answer": 2}))
+    assert context.get_ready_steps() == ["C"]
+    context.mark_failed("C", "boom")
+    assert context.get_ready_steps() == []
+    assert context.nodes_by_status() == {"completed": ["A", "B"], "failed": ["C"], "pending": ["D"]}
+    assert context.step_completed.is_set()
+
+
+def test_indexes_match_a_full_scan_on_random_runs():
+    rng = random.Random(7)
+    for _ in range(30):
+        size = rng.randint(2, 25)
+        node_ids = [f"n{i}" for i in range(size)]
+        edges = [("ROOT", n) for n in node_ids[:rng.randint(1, 3)]]
+        edges += [(node_ids[i], node_ids[j]) for j in range(1, size) for i in range(j) if rng.random() < 0.2]
+        context = _context(edges, node_ids)
+        _check_indexes(context)
+
+        running = []
+        while True:
+            ready = context.get_ready_steps()
+            if not ready and not running:
+                break
+            if ready and (not running or rng.random() < 0.6):
+                step = rng.choice(ready)
+                context.mark_running(step)
+                running.append(step)
+            else:
+                step = running.pop(rng.randrange(len(running)))
+                if rng.random() < 0.2:
+                    context.mark_failed(step, "boom")
+                else:
+                    asyncio.run(context.mark_done(step, {"answer": step}))
+            _check_indexes(context)
+
+
+def test_reset_rebuilds_indexes_after_direct_edits():
+    context = _context([("ROOT", "A"), ("A", "B")], "AB")
+    _check_indexes(context)
+    context.plan_graph.add_node("C", agent="ThinkerAgent", description="C", status="pending")
+    context.plan_graph.add_edge("ROOT", "C")
+    context.plan_graph.nodes["A"]["status"] = "completed"
+    context.reset_ready_steps()
+    context.reset_status_index()
+    _check_indexes(context)
+
+
+def test_loaded_context_has_runtime_state(tmp_path):
+    context = _context([("ROOT", "A"), ("A", "B")], "AB")
+    asyncio.run(context.mark_done("A", {"answer": 1}))
+    path = SessionSerializer.save_session(context.plan_graph, output_path=str(tmp_path / "session.json"))
+
+    loaded = ExecutionContextManager.load_session(path, debug_mode=True)
+
+    assert loaded.output_chain_version == 0
+    assert not loaded.step_completed.is_set()
+    _check_indexes(loaded)
+    asyncio.run(loaded.mark_done("B", {"answer": 2}))
+    assert loaded.output_chain_version == 1
+    assert loaded.get_ready_steps() == []
+    assert loaded.nodes_by_status() == {"completed": ["A", "B"]}
@@ -0,0 +1,87 @@
+import asyncio
+
+from action import executor
+
+
+def _fake_runner(outcomes, delays, started, cancelled):
+    """Build an execute_python_code_variant stand-in keyed by the variant's code."""
+    async def fake(code, multi_mcp, session_id, inputs):
+        started.append(code)
+        try:
+            await asyncio.sleep(delays[code])
+        except asyncio.CancelledError:
+            cancelled.append(code)
+            raise
+        if outcomes[code]:
+            return {"status": "success", "result": {"value": code}, "created_files": []}
+        return {"status": "failed", "error": f"{code} broke"}
+    return fake
+
+
+def test_race_returns_first_success(monkeypatch):
+    started, cancelled = [], []
+    outcomes = {"a": True, "b": True}
+    delays = {"a": 0.2, "b": 0.01}
+    monkeypatch.setattr(executor, "execute_python_code_variant",
+                        _fake_runner(outcomes, delays, started, cancelled))
+
+    result = asyncio.run(executor.execute_code_variants(
+        {"CODE_1": "a", "CODE_2": "b"}, None, "s", race=True))
+
+    assert result["status"] == "success"
+    assert result["successful_variant"] == "CODE_2"
+    assert result["result"] == {"value": "b"}
+    assert cancelled == ["a"]
+
+
+def test_race_all_fail_matches_sequential(monkeypatch):
+    started, cancelled = [], []
+    outcomes = {"a": False, "b": False, "c": False}
+    delays = {"a": 0.02, "b": 0.01, "c": 0.0}
+    monkeypatch.setattr(executor, "execute_python_code_variant",
+                        _fake_runner(outcomes, delays, started, cancelled))
+
+    variants = {"CODE_1": "a", "CODE_2": "b", "CODE_3": "c"}
+    raced = asyncio.run(executor.execute_code_variants(variants, None, "s", race=True))
+    sequential = asyncio.run(executor.execute_code_variants(variants, None, "s"))
+
+    assert raced["status"] == sequential["status"] == "failed"
+    assert raced["failed_variants"] == sequential["failed_variants"] == 3
+    assert sorted(raced["all_errors"]) == sorted(sequential["all_errors"])
+    assert cancelled == []
+
+
+def test_race_cancels_waiting_variants(monkeypatch):
+    started, cancelled = [], []
+    outcomes = {"a": True, "b": False, "c": True, "d": True}
+    delays = {"a": 0.01, "b": 0.5, "c": 0.5, "d": 0.5}
+    monkeypatch.setattr(executor, "execute_python_code_variant",
+                        _fake_runner(outcomes, delays, started, cancelled))
+
+    async def run():
+        result = await executor.execute_code_variants(
+            {"CODE_1": "a", "CODE_2": "b", "CODE_3": "c", "CODE_4": "d"}, None, "s", race=True)
+        # Nothing from the race may still be running once the call returns
+        pending = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        return result, pending
+
+    result, pending = asyncio.run(run())
+
+    assert result["successful_variant"] == "CODE_1"
+    assert pending == []
+    # The last variant never leaves the semaphore; the ones running are cancelled
+    assert "d" not in started
+    assert sorted(cancelled) == sorted(set(started) - {"a"})
+
+
+def test_sequential_is_default(monkeypatch):
+    started, cancelled = [], []
+    outcomes = {"a": True, "b": True}
+    delays = {"a": 0.05, "b": 0.0}
+    monkeypatch.setattr(executor, "execute_python_code_variant",
+                        _fake_runner(outcomes, delays, started, cancelled))
+
+    result = asyncio.run(executor.execute_code_variants({"CODE_1": "a", "CODE_2": "b"}, None, "s"))
+
+    assert result["successful_variant"] == "CODE_1"
+    assert started == ["a"]
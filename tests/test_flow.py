@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from pathlib import Path
+
+from agentLoop.flow import _agent_cache_key, _lru_get, _lru_put, _merge_code_output
+
+
+def _agent_input(step_id="T1", session_id="s1", query="q", prompt="do it"):
+    return {
+        "step_id": step_id,
+        "agent_prompt": prompt,
+        "reads": ["T0"],
+        "writes": ["answer"],
+        "inputs": {"T0": {"answer": 42}},
+        "original_query": query,
+        "session_context": {"session_id": session_id, "file_manifest": []},
+    }
+
+
+def test_agent_cache_key_ignores_step_id_only():
+    key = _agent_cache_key("ThinkerAgent", _agent_input())
+    assert _agent_cache_key("ThinkerAgent", _agent_input(step_id="T9")) == key
+    assert _agent_cache_key("QAAgent", _agent_input()) != key
+    assert _agent_cache_key("ThinkerAgent", _agent_input(session_id="s2")) != key
+    assert _agent_cache_key("ThinkerAgent", _agent_input(query="other")) != key
+    assert _agent_cache_key("ThinkerAgent", _agent_input(prompt="other")) != key
+
+
+def test_lru_evicts_least_recently_used():
+    cache = OrderedDict()
+    for key in "abc":
+        _lru_put(cache, key, key.upper(), maxsize=3)
+    assert _lru_get(cache, "a") == "A"  # a is now the most recent
+    _lru_put(cache, "d", "D", maxsize=3)
+    assert list(cache) == ["c", "a", "d"]
+    assert _lru_get(cache, "b") is None
+
+
+def test_merge_code_output_leaves_inputs_untouched():
+    agent_output = {"output": {"summary": "s", "path": Path("a.txt")}, "code": {"CODE_1": "x = 1"}}
+    code_output = {"summary": "from code", "rows": (1, 2)}
+    merged = _merge_code_output(agent_output, code_output)
+
+    assert merged == {"summary": "from code", "path": "a.txt", "rows": [1, 2]}
+    assert agent_output["output"] == {"summary": "s", "path": Path("a.txt")}
+    assert code_output == {"summary": "from code", "rows": (1, 2)}
+    assert _merge_code_output({}, None) == {}
+
+
+def test_cancelled_step_is_marked_failed(tmp_path, monkeypatch):
+    import asyncio
+
+    from agentLoop.contextManager import ExecutionContextManager
+    from agentLoop.flow import AgentLoop4
+
+    monkeypatch.chdir(tmp_path)
+    plan = {
+        "nodes": [
+            {"id": "T1", "agent": "RetrieverAgent", "description": "search", "reads": [], "writes": ["T1"]},
+            {"id": "T2", "agent": "ThinkerAgent", "description": "think", "reads": ["T1"], "writes": ["T2"]},
+        ],
+        "edges": [{"source": "ROOT", "target": "T1"}, {"source": "T1", "target": "T2"}],
+    }
+    context = ExecutionContextManager(plan, session_id="s1", original_query="q")
+    loop = AgentLoop4.__new__(AgentLoop4)
+    loop._conversation_turn = 0
+    loop.on_step_start = loop.on_step_end = None
+
+    async def _cancelled_step(step_id, context):
+        raise asyncio.CancelledError()
+
+    loop._execute_step = _cancelled_step
+    asyncio.run(loop._execute_dag(context))
+
+    assert context.plan_graph.nodes["T1"]["status"] == "failed"
+    assert context.plan_graph.nodes["T2"]["status"] == "pending"
@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+import pytest
+
+from agentLoop.contextManager import ExecutionContextManager
+from agentLoop.graph_debugger import GraphDebugger
+from agentLoop.graph_validator import GraphValidator
+
+
+PLAN = {
+    "nodes": [
+        {"id": "T1", "agent": "RetrieverAgent", "description": "search", "reads": [], "writes": ["T1"]},
+        {"id": "T2", "agent": "RetrieverAgent", "description": "search more", "reads": [], "writes": ["T2"]},
+        {"id": "T3", "agent": "ThinkerAgent", "description": "think", "reads": ["T1"], "writes": ["T3"]},
+        {"id": "T4", "agent": "ThinkerAgent", "description": "think more", "reads": ["T3"], "writes": ["T4"]},
+        {"id": "T5", "agent": "FormatterAgent", "description": "format", "reads": ["T2"], "writes": ["T5"]},
+    ],
+    "edges": [
+        {"source": "ROOT", "target": "T1"},
+        {"source": "ROOT", "target": "T2"},
+        {"source": "T1", "target": "T3"},
+        {"source": "T3", "target": "T4"},
+        {"source": "T2", "target": "T5"},
+    ],
+}
+
+
+class FakeRunner:
+    def __init__(self):
+        self.calls = []
+
+    async def run_agent(self, agent, agent_input):
+        self.calls.append(agent_input["step_id"])
+        await asyncio.sleep(0)
+        return {"success": True, "output": {"answer": agent_input["step_id"]}}
+
+
+@pytest.fixture
+def debugger(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    context = ExecutionContextManager(PLAN, session_id="s1", original_query="q", debug_mode=True)
+    debugger = GraphDebugger()
+    debugger.context = context
+    debugger._pred = GraphValidator.build_predecessor_index(context.plan_graph)
+    debugger._session_context = {"session_id": "s1"}
+    debugger.read_only = False
+    debugger.agent_runner = FakeRunner()
+    return debugger
+
+
+@pytest.mark.parametrize("node_ids", [["T1", "T3"], ["T4", "T1"], ["T2", "T5"], ["T1", "T1"], ["T1", "T5"]])
+def test_dependent_replays_are_rejected(debugger, node_ids):
+    assert asyncio.run(debugger.replay_nodes(node_ids)) == {}
+    assert debugger.agent_runner.calls == []
+
+
+def test_independent_replays_write_separate_debug_files(debugger, tmp_path):
+    replayed = asyncio.run(debugger.replay_nodes(["T2", "T3"]))
+
+    assert replayed == {"T2": {"answer": "T2"}, "T3": {"answer": "T3"}}
+    assert sorted(debugger.agent_runner.calls) == ["T2", "T3"]
+    for node_id in ("T2", "T3"):
+        saved = json.loads((tmp_path / "memory" / f"temp_{node_id}.json").read_text(encoding="utf-8"))
+        assert saved["node_id"] == node_id
+    assert not (tmp_path / "memory" / "temp.json").exists()
+
+
+def test_formatter_replay_gets_the_live_output_chain(debugger):
+    seen = {}
+
+    async def run_agent(agent, agent_input):
+        seen["all_outputs"] = agent_input["all_outputs"]
+        return {"success": True, "output": {"answer": "formatted"}}
+
+    debugger.agent_runner.run_agent = run_agent
+    asyncio.run(debugger.replay_node("T5", show_comparison=False))
+
+    assert seen["all_outputs"] is debugger.context.plan_graph.graph["output_chain"]
@@ -0,0 +1,222 @@
+import random
+
+import networkx as nx
+import pytest
+from rich.console import Console
+
+from agentLoop.graph_validator import BITMASK_MAX_NODES, GraphValidator, MAX_REPORTED_CYCLES
+
+
+def _validator():
+    return GraphValidator(console=Console(quiet=True))
+
+
+def _plan(edges, **attrs):
+    graph = nx.DiGraph()
+    graph.add_node("ROOT")
+    graph.add_edges_from(edges)
+    for node_id in graph:
+        if node_id != "ROOT":
+            graph.nodes[node_id].update(agent="ThinkerAgent", description=node_id, status="pending")
+            graph.nodes[node_id].update(attrs.get(node_id, {}))
+    return graph
+
+
+def _ring(prefix, length):
+    nodes = [f"{prefix}{i}" for i in range(length)]
+    return [(nodes[i], nodes[(i + 1) % length]) for i in range(length)]
+
+
+def test_self_loop_is_reported():
+    graph = _plan([("ROOT", "A"), ("A", "A")])
+    results = _validator().validate_execution_graph(graph, verbose=False, enumerate_all_cycles=True)
+    assert not results["is_dag"]
+    assert results["cycles"] == [["A"]]
+
+
+def test_cycle_longer_than_bound_is_reported():
+    graph = _plan([("ROOT", "n0")] + _ring("n", 12))
+    results = _validator().validate_execution_graph(graph, verbose=False, enumerate_all_cycles=True)
+    assert len(results["cycles"]) == 1
+    assert sorted(results["cycles"][0]) == sorted(f"n{i}" for i in range(12))
+
+
+def test_every_cyclic_component_is_reported():
+    edges = [("ROOT", "a0"), ("ROOT", "b0"), ("ROOT", "s")] + _ring("a", 3) + _ring("b", 20) + [("s", "s")]
+    results = _validator().validate_execution_graph(_plan(edges), verbose=False, enumerate_all_cycles=True)
+    reported = {frozenset(cycle) for cycle in results["cycles"]}
+    assert reported == {frozenset(f"a{i}" for i in range(3)), frozenset(f"b{i}" for i in range(20)), frozenset({"s"})}
+
+
+def test_cycle_count_is_capped():
+    graph = nx.complete_graph(7, create_using=nx.DiGraph)
+    cycles = GraphValidator._find_cycles(graph)
+    assert len(cycles) == MAX_REPORTED_CYCLES
+
+
+def test_long_dependency_cycle_is_reported():
+    names = [f"t{i}" for i in range(10)]
+    attrs = {name: {"reads": [f"k{i}"], "writes": [f"k{(i + 1) % 10}"]} for i, name in enumerate(names)}
+    graph = _plan([("ROOT", name) for name in names], **attrs)
+    results = _validator().validate_execution_graph(graph, verbose=False)
+    cycles = [w for w in results["warnings"] if w.startswith("Dependency cycle detected")]
+    assert len(cycles) == 1
+    assert set(cycles[0].split(": ", 1)[1].split(" → ")) == set(names)
+
+
+def test_acyclic_plan_has_no_cycles():
+    graph = _plan([("ROOT", "A"), ("A", "B")], A={"writes": ["x"]}, B={"reads": ["x"]})
+    results = _validator().validate_execution_graph(graph, verbose=False, enumerate_all_cycles=True)
+    assert results["is_valid"] and results["is_dag"]
+    assert results["cycles"] == []
+    assert results["warnings"] == []
+
+
+def test_topology_caches_follow_in_place_edge_swap():
+    validator = _validator()
+    graph = _plan([("ROOT", "A"), ("ROOT", "B"), ("A", "C"), ("B", "D")])
+    graph.nodes["A"]["status"] = "failed"
+    assert validator.find_blocked_nodes(graph) == {"C": ["A"]}
+
+    # Same node and edge counts, different topology
+    graph.remove_edge("A", "C")
+    graph.add_edge("A", "D")
+    assert validator.find_blocked_nodes(graph) == {"D": ["A"]}
+    assert validator._dag_and_topo(graph)[1].index("A") < validator._dag_and_topo(graph)[1].index("D")
+
+
+def test_topology_caches_keep_one_entry():
+    validator = _validator()
+    for size in range(2, 6):
+        graph = _plan([("ROOT", f"n{i}") for i in range(size)])
+        graph.add_edge("n0", "n1")
+        validator.find_blocked_nodes(graph)
+        validator.validate_execution_graph(graph, verbose=False)
+    assert validator._dag_cache[0] == GraphValidator._topology_key(graph)
+    assert validator._ancestor_bits[0] == GraphValidator._topology_key(graph)
+
+
+def test_fanout_critical_path_matches_general_path():
+    validator = _validator()
+    graph = nx.DiGraph()
+    graph.add_nodes_from(["c", "ROOT", "a", "b"])
+    graph.add_edges_from([("ROOT", "b"), ("ROOT", "c"), ("ROOT", "a")])
+    fast = validator.analyze_critical_path(graph)
+
+    # Same graph plus an isolated node: no longer a fan-out, so the general path runs
+    general_graph = graph.copy()
+    general_graph.add_node("z")
+    general = validator.analyze_critical_path(general_graph)
+
+    assert fast["critical_path"] == general["critical_path"]
+    assert fast["path_length"] == general["path_length"] == 1
+
+
+def _same_results(incremental, full):
+    # Dependency-cycle warnings may come in a different order
+    assert sorted(incremental["warnings"]) == sorted(full["warnings"])
+    assert {k: v for k, v in incremental.items() if k != "warnings"} == {k: v for k, v in full.items() if k != "warnings"}
+
+
+def _random_edit(rng, graph, keys):
+    """Apply one random edit to `graph` in place and return the nodes it touched"""
+    nodes = [n for n in graph if n != "ROOT"]
+    node = rng.choice(nodes)
+    kind = rng.choice(["reads", "writes", "reads", "writes", "attr", "drop_attr", "add_node", "add_edge",
+                       "remove_edge", "swap_edge", "malformed"])
+    if kind in ("reads", "writes"):
+        graph.nodes[node][kind] = rng.sample(keys, rng.randint(0, 3))
+        return {node}
+    if kind == "attr":
+        graph.nodes[node][rng.choice(["agent", "description", "status"])] = rng.choice(["x", "y"])
+        return {node}
+    if kind == "drop_attr":
+        graph.nodes[node].pop(rng.choice(["agent", "description", "status", "reads", "writes"]), None)
+        return {node}
+    if kind == "malformed":
+        graph.nodes[node]["reads"] = 5
+        return {node}
+    if kind == "add_node":
+        new = f"n{len(graph)}"
+        graph.add_node(new, agent="ThinkerAgent", description=new, status="pending",
+                       reads=rng.sample(keys, 1), writes=rng.sample(keys, 1))
+        graph.add_edge(rng.choice(nodes + ["ROOT"]), new)
+        return {new}
+    edges = [e for e in graph.edges if e[0] != e[1]]
+    if kind == "add_edge" or not edges:
+        target = rng.choice(nodes)
+        graph.add_edge(node, target)  # may create a cycle or a self-loop
+        return {node, target}
+    u, v = rng.choice(edges)
+    graph.remove_edge(u, v)
+    if kind == "remove_edge":
+        return {u, v}
+    target = rng.choice([n for n in nodes if not graph.has_edge(u, n)] or [v])
+    graph.add_edge(u, target)  # same node and edge counts
+    return {u, v, target}
+
+
+def test_validate_incremental_matches_full_validation():
+    rng = random.Random(20)
+    keys = [f"k{i}" for i in range(8)]
+    for _ in range(40):
+        size = rng.randint(2, 12)
+        names = [f"n{i}" for i in range(size)]
+        graph = _plan([("ROOT", names[0])] + [(rng.choice(["ROOT"] + names[:i]), names[i]) for i in range(1, size)],
+                      **{n: {"reads": rng.sample(keys, rng.randint(0, 2)), "writes": rng.sample(keys, rng.randint(0, 2))}
+                         for n in names})
+        incremental_validator, full_validator = _validator(), _validator()
+        _same_results(incremental_validator.validate_incremental(graph, set()),
+                      full_validator.validate_execution_graph(graph, verbose=False))
+        for _ in range(25):
+            changed = _random_edit(rng, graph, keys)
+            _same_results(incremental_validator.validate_incremental(graph, changed),
+                          full_validator.validate_execution_graph(graph, verbose=False))
+
+
+def test_blocked_nodes_follow_failed_ancestors():
+    graph = _plan([("ROOT", "A"), ("ROOT", "B"), ("A", "C"), ("B", "C"), ("C", "D"), ("B", "E")])
+    graph.nodes["A"]["status"] = "failed"
+    graph.nodes["E"]["status"] = "completed"
+    assert _validator().find_blocked_nodes(graph) == {"C": ["A"], "D": ["A"]}
+
+
+def _expected_blocked(graph):
+    expected = {}
+    for node_id, data in graph.nodes(data=True):
+        if node_id == "ROOT" or data.get("status") in ("completed", "running"):
+            continue
+        failed = {a for a in nx.ancestors(graph, node_id) if graph.nodes[a].get("status") == "failed"}
+        if failed:
+            expected[node_id] = failed
+    return expected
+
+
+@pytest.mark.parametrize("size", [30, BITMASK_MAX_NODES + 20])
+@pytest.mark.parametrize("cyclic", [False, True])
+def test_blocked_nodes_match_ancestor_walk(size, cyclic):
+    rng = random.Random(size + cyclic)
+    validator = _validator()
+    for _ in range(5):
+        names = [f"n{i}" for i in range(size)]
+        tree = [(rng.choice(names[:i] or ["ROOT"]), names[i]) for i in range(size)]
+        edges = tree + [(names[i], names[j]) for _ in range(size) for i, j in [sorted(rng.sample(range(size), 2))]]
+        if cyclic:
+            # Point a few nodes back at their tree parent
+            edges += [(child, parent) for parent, child in rng.sample(tree[1:], 3)]
+        graph = _plan(edges)
+        assert nx.is_directed_acyclic_graph(graph) != cyclic
+        for node_id in names:
+            graph.nodes[node_id]["status"] = rng.choice(["pending", "pending", "failed", "completed", "running"])
+
+        pred = GraphValidator.build_predecessor_index(graph)
+        for blocked in (validator.find_blocked_nodes(graph), validator.find_blocked_nodes(graph, pred)):
+            assert {n: set(failed) for n, failed in blocked.items()} == _expected_blocked(graph)
+
+
+def test_disconnected_graph_with_mixed_id_types():
+    graph = _plan([("ROOT", 1), (2, "A")])
+    results = _validator().validate_execution_graph(graph, verbose=False)
+    assert results["is_valid"]
+    assert results["disconnected_components"] == [[1, "ROOT"], [2, "A"]]
+    assert "Graph has 2 disconnected components" in results["warnings"]
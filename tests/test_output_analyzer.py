@@ -0,0 +1,91 @@
+import asyncio
+
+import httpx
+
+from agentLoop.output_analyzer import ImageValidator, OutputAnalyzer
+
+
+def test_analyzers_share_one_image_validator():
+    first, second = OutputAnalyzer(), OutputAnalyzer()
+    assert first.image_validator is second.image_validator
+    assert OutputAnalyzer(validate_images=False).image_validator is None
+
+
+def _check_all(handler, urls):
+    validator = ImageValidator()
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=False)
+        validator._get_client = lambda: client
+        try:
+            return [await validator.check_image_exists(url) for url in urls]
+        finally:
+            await client.aclose()
+
+    return validator, asyncio.run(run())
+
+
+def test_only_unreachable_hosts_are_marked_bad():
+    def handler(request):
+        host = request.url.host
+        if host == "down.example":
+            raise httpx.ConnectError("refused", request=request)
+        if host == "slow.example":
+            raise httpx.ConnectTimeout("timed out", request=request)
+        if host == "flaky.example":
+            raise httpx.RemoteProtocolError("peer closed connection", request=request)
+        return httpx.Response(206, headers={"content-type": "image/png", "content-range": "bytes 0-0/10"})
+
+    validator, results = _check_all(handler, [
+        "https://down.example/a.png", "https://slow.example/a.png", "https://flaky.example/a.png",
+    ])
+
+    assert [r["exists"] for r in results] == [False, False, False]
+    assert set(validator._bad_hosts) == {"down.example", "slow.example"}
+    assert validator._bad_host_result("https://flaky.example/b.png") is None
+    assert validator._bad_host_result("https://down.example/b.png")["error"] == "cached_bad_host"
+
+
+def test_redirect_is_followed_once():
+    def handler(request):
+        if request.url.path == "/old.png":
+            return httpx.Response(301, headers={"location": "/new.png"})
+        if request.url.path == "/loop.png":
+            return httpx.Response(302, headers={"location": "/loop.png"})
+        return httpx.Response(206, headers={"content-type": "image/png", "content-range": "bytes 0-0/10"})
+
+    _, (moved, looping) = _check_all(handler, ["https://cdn.example/old.png", "https://cdn.example/loop.png"])
+
+    assert moved["exists"] and moved["status"] == 206 and moved["size"] == "10"
+    assert looping["error"] == "too_many_redirects"
+
+
+def test_async_report_reads_session_on_the_loop_thread(tmp_path, monkeypatch):
+    import threading
+
+    from agentLoop.contextManager import ExecutionContextManager
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "memory").mkdir()
+    plan = {"nodes": [{"id": "T1", "agent": "FormatterAgent", "description": "format"}],
+            "edges": [{"source": "ROOT", "target": "T1"}]}
+    context = ExecutionContextManager(plan, session_id="s1", original_query="q", debug_mode=True)
+    context.plan_graph.graph["output_chain"]["T1"] = {"report_html": "<html><body><h1>Report</h1></body></html>"}
+
+    readers = []
+    get_session_data = context.get_session_data
+
+    def recording_get_session_data():
+        readers.append(threading.current_thread())
+        return get_session_data()
+
+    context.get_session_data = recording_get_session_data
+    analyzer = OutputAnalyzer(context, validate_images=False)
+
+    async def run():
+        return await analyzer.extract_and_save_html_report_async(), threading.current_thread()
+
+    path, loop_thread = asyncio.run(run())
+
+    assert path is not None and "<h1>" in (tmp_path / path).read_text(encoding="utf-8")
+    assert readers == [loop_thread]
@@ -0,0 +1,76 @@
+import json
+import math
+import mmap
+
+import networkx as nx
+import pytest
+
+from agentLoop.session_serializer import SessionSerializer
+
+
+def test_parse_plain_bytes_and_buffers(tmp_path):
+    raw = json.dumps({"graph": {"session_id": "s1", "query": "café ✓"}, "nodes": [], "links": []}).encode("utf-8")
+    expected = json.loads(raw)
+
+    assert SessionSerializer.parse_session_bytes(raw) == expected
+    assert SessionSerializer.parse_session_bytes(memoryview(raw)) == expected
+
+    path = tmp_path / "session.json"
+    path.write_bytes(raw)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            assert SessionSerializer.parse_session_bytes(view) == expected
+
+
+@pytest.mark.parametrize("value", [2 ** 70, -(2 ** 70), 1234567890123456789, 10 ** 19])
+def test_long_integers_stay_integers(value):
+    parsed = SessionSerializer.parse_session_bytes(json.dumps({"cost": value}).encode())
+    assert parsed["cost"] == value
+    assert isinstance(parsed["cost"], int)
+
+
+def test_nan_and_infinity_fall_back_to_json():
+    parsed = SessionSerializer.parse_session_bytes(b'{"a": NaN, "b": Infinity, "c": -Infinity}')
+    assert math.isnan(parsed["a"])
+    assert parsed["b"] == math.inf and parsed["c"] == -math.inf
+
+
+def test_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        SessionSerializer.parse_session_bytes(b'{"a": ')
+
+
+def test_save_and_load_round_trip_with_values_orjson_rejects(tmp_path):
+    graph = nx.DiGraph(session_id="s1", output_chain={"T1": {"big": 2 ** 70, "text": "ünïcode"}})
+    graph.add_node("ROOT", status="completed")
+    graph.add_node("T1", status="completed", cost=0.5)
+    graph.add_edge("ROOT", "T1")
+
+    path = SessionSerializer.save_session(graph, output_path=str(tmp_path / "session.json"))
+    loaded = SessionSerializer.load_session(path)
+
+    assert loaded.graph["output_chain"] == {"T1": {"big": 2 ** 70, "text": "ünïcode"}}
+    assert dict(loaded.nodes(data=True)) == dict(graph.nodes(data=True))
+    assert list(loaded.edges) == [("ROOT", "T1")]
+
+
+def test_saved_session_parses_like_the_stdlib_encoding(tmp_path):
+    from datetime import datetime
+
+    values = {"floats": [1e16, 1e-7, 0.1, -2.5e300], 3: "int key", "when": datetime(2024, 1, 2, 3, 4, 5)}
+    graph = nx.DiGraph(session_id="s1", output_chain={"T1": values})
+    graph.add_node("T1", status="completed")
+
+    path = SessionSerializer.save_session(graph, output_path=str(tmp_path / "session.json"))
+    expected = json.loads(json.dumps(nx.node_link_data(graph, edges="links"), default=str))
+
+    assert json.loads(path.read_text(encoding="utf-8")) == expected
+
+
+def test_saved_nan_becomes_null(tmp_path):
+    graph = nx.DiGraph(session_id="s1", output_chain={"T1": {"score": math.nan}})
+    graph.add_node("T1", status="completed")
+
+    path = SessionSerializer.save_session(graph, output_path=str(tmp_path / "session.json"))
+
+    assert SessionSerializer.load_session(path).graph["output_chain"] == {"T1": {"score": None}}
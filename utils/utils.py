@@ -1,9 +1,26 @@
+import asyncio
+import sys
 from rich import print
 from datetime import datetime
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+def install_uvloop() -> bool:
+    """Make uvloop's libuv-backed event loop the asyncio default when available (not supported on Windows).
+
+    Safe to call from every module that wants it; returns whether uvloop is in use.
+    """
+    if sys.platform == "win32":
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    if not isinstance(asyncio.get_event_loop_policy(), uvloop.EventLoopPolicy):
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
 def log_step(title: str, payload=None, symbol: str = "🟢"):
     print(f"\n[b]{symbol} {title}[/b]")
     if payload: